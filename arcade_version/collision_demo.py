@@ -1,4 +1,16 @@
 import arcade
+import argparse
+import os
+import sys
+import time
+
+# Shared engine code lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.broad_phase import CollisionStats
+from shared.collision_scene import BLOCK_LAYOUTS, random_sprites
+from shared.fixed_timestep import FixedTimestep
+from shared.frame_profiler import frame_profiler
+from shared.hud import Hud
 
 # Constants
 SCREEN_WIDTH = 640
@@ -15,15 +27,15 @@ WHITE = arcade.color.WHITE
 class MovingSprite(arcade.SpriteSolidColor):
     """A sprite that moves around the screen and changes color on collision"""
     
-    def __init__(self, width, height, color):
+    def __init__(self, width, height, color, center_x=50, center_y=50, change_x=3, change_y=2):
         # Initialize the sprite
         super().__init__(width, height, color)
         
         # Set initial position and velocity
-        self.center_x = 50
-        self.center_y = 50
-        self.change_x = 3
-        self.change_y = 2
+        self.center_x = center_x
+        self.center_y = center_y
+        self.change_x = change_x
+        self.change_y = change_y
         
         # Default appearance
         self.default_color = color
@@ -49,21 +61,37 @@ class MovingSprite(arcade.SpriteSolidColor):
 class StationaryBlock(arcade.SpriteSolidColor):
     """A stationary block sprite"""
     
-    def __init__(self, width, height, color):
+    def __init__(self, width, height, color, center_x=SCREEN_WIDTH // 2, center_y=SCREEN_HEIGHT // 2):
         # Initialize the sprite
         super().__init__(width, height, color)
         
-        # Set position in the center of the screen
-        self.center_x = SCREEN_WIDTH // 2
-        self.center_y = SCREEN_HEIGHT // 2
+        # Set position, by default in the center of the screen
+        self.center_x = center_x
+        self.center_y = center_y
 
 class CollisionDemo(arcade.Window):
     """Main application class"""
     
-    def __init__(self, width, height, title):
+    def __init__(self, width, height, title, legacy_hud=False, sprites=1, blocks=1,
+                 block_layout="grid", spatial_hash=False, seed=0):
         # Initialize the window
         super().__init__(width, height, title)
         
+        # Draw the stats with arcade.draw_text every frame instead of the HUD
+        self.legacy_hud = legacy_hud
+        self.hud = None
+        
+        # Scene size; more sprites and blocks turn the demo into a collision stress test
+        self.sprite_count = sprites
+        self.block_count = blocks
+        self.block_layout = block_layout
+        self.seed = seed
+        
+        # Let the stationary list keep a spatial hash, so each sprite is only
+        # checked against the blocks in the cells it touches
+        self.spatial_hash = spatial_hash
+        self.collision_stats = CollisionStats("arcade-hash" if spatial_hash else "arcade-simple")
+        
         # Set the background color
         arcade.set_background_color(BLACK)
         
@@ -77,20 +105,46 @@ class CollisionDemo(arcade.Window):
         
         # Collision state
         self.is_colliding = False
+        self.collision_time = 0.0
+        
+        # The sprites move once per 1/60 s step, whatever delta_time the frames have
+        self.timestep = FixedTimestep(1 / 60)
     
     def setup(self):
         """Set up the game and initialize variables"""
-        # Create sprite lists
-        self.moving_sprite_list = arcade.SpriteList()
-        self.stationary_sprite_list = arcade.SpriteList()
+        # Create sprite lists. The moving sprites change position every frame,
+        # so their list never gets a spatial hash; only the blocks' list may.
+        self.moving_sprite_list = arcade.SpriteList(use_spatial_hash=False)
+        self.stationary_sprite_list = arcade.SpriteList(use_spatial_hash=self.spatial_hash, is_static=True)
         
         # Create and add the moving sprite
         self.moving_sprite = MovingSprite(30, 30, BLUE)
         self.moving_sprite_list.append(self.moving_sprite)
         
-        # Create and add the stationary block
-        self.stationary_block = StationaryBlock(100, 100, GREEN)
-        self.stationary_sprite_list.append(self.stationary_block)
+        # Extra sprites come from the same scene description as the Pygame demo,
+        # flipped into Arcade's y-up coordinates
+        for x, y, size, speed_x, speed_y in random_sprites(self.sprite_count - 1, SCREEN_WIDTH, SCREEN_HEIGHT, self.seed):
+            self.moving_sprite_list.append(MovingSprite(
+                size, size, BLUE, x + size / 2, SCREEN_HEIGHT - (y + size / 2), speed_x, -speed_y
+            ))
+        
+        # Create and add the stationary block; more than one block replaces it with a layout
+        if self.block_count == 1:
+            self.stationary_block = StationaryBlock(100, 100, GREEN)
+            self.stationary_sprite_list.append(self.stationary_block)
+        else:
+            layout = BLOCK_LAYOUTS[self.block_layout](self.block_count, SCREEN_WIDTH, SCREEN_HEIGHT, self.seed)
+            for x, y, width, height in layout:
+                self.stationary_sprite_list.append(StationaryBlock(
+                    width, height, GREEN, x + width / 2, SCREEN_HEIGHT - (y + height / 2)
+                ))
+        
+        # Stats text is laid out once and only updated when it changes
+        self.hud = Hud(legacy=self.legacy_hud)
+        self.hud.add("fps", "FPS: 60", 10, SCREEN_HEIGHT - 30, WHITE, 24)
+        self.hud.add("collision", "Collision: No", 10, SCREEN_HEIGHT - 60, WHITE, 24)
+        self.hud.add("library", "Library: Arcade", 10, SCREEN_HEIGHT - 90, WHITE, 24)
+        self.hud.add("collision_time", f"Collisions: {self.collision_stats.name}", 10, SCREEN_HEIGHT - 120, WHITE, 24)
     
     def on_draw(self):
         """Render the screen"""
@@ -101,14 +155,15 @@ class CollisionDemo(arcade.Window):
         self.stationary_sprite_list.draw()
         self.moving_sprite_list.draw()
         
-        # Draw outlines for better visibility
-        arcade.draw_rectangle_outline(
-            self.stationary_block.center_x, 
-            self.stationary_block.center_y,
-            self.stationary_block.width,
-            self.stationary_block.height,
-            BLACK, 2
-        )
+        # Draw outlines for better visibility (only around the original pair)
+        if self.stationary_block is not None:
+            arcade.draw_rectangle_outline(
+                self.stationary_block.center_x, 
+                self.stationary_block.center_y,
+                self.stationary_block.width,
+                self.stationary_block.height,
+                BLACK, 2
+            )
         
         arcade.draw_rectangle_outline(
             self.moving_sprite.center_x, 
@@ -119,37 +174,13 @@ class CollisionDemo(arcade.Window):
         )
         
         # Display stats
-        arcade.draw_text(
-            f"FPS: {int(self.current_fps)}",
-            10, SCREEN_HEIGHT - 30,
-            WHITE, 24
-        )
-        
-        arcade.draw_text(
-            f"Collision: {'Yes' if self.is_colliding else 'No'}",
-            10, SCREEN_HEIGHT - 60,
-            WHITE, 24
-        )
-        
-        arcade.draw_text(
-            "Library: Arcade",
-            10, SCREEN_HEIGHT - 90,
-            WHITE, 24
-        )
+        self.hud.draw()
     
     def on_update(self, delta_time):
         """Movement and game logic"""
-        # Update the sprites
-        self.moving_sprite_list.update()
-        
-        # Check for collisions
-        collision_list = arcade.check_for_collision_with_list(
-            self.moving_sprite, self.stationary_sprite_list
-        )
-        
-        # Update collision state
-        self.is_colliding = len(collision_list) > 0
-        self.moving_sprite.in_collision = self.is_colliding
+        # Run the simulation steps that are due
+        for _ in range(self.timestep.advance(delta_time)):
+            self.step()
         
         # Track FPS
         if hasattr(self, '_fps_counter'):
@@ -163,10 +194,56 @@ class CollisionDemo(arcade.Window):
             self._fps_counter = 0
             self._fps_time = 0
             self.current_fps = 60  # Initial estimate
+        
+        # Update the stats text (a no-op unless the value changed)
+        self.hud.set_text("fps", f"FPS: {int(self.current_fps)}")
+        self.hud.set_text("collision", f"Collision: {'Yes' if self.is_colliding else 'No'}")
+        if self.collision_stats.frames % 60 == 1:
+            self.hud.set_text("collision_time", f"Collisions: {self.collision_stats.name}, {self.collision_time * 1000:.2f} ms")
+    
+    def step(self):
+        """Move the sprites by one step and check them against the blocks"""
+        # Update the sprites
+        self.moving_sprite_list.update()
+        
+        # Check for collisions: through the blocks' spatial hash if it has one,
+        # otherwise against every block
+        frame_profiler.phase("collision")
+        start = time.perf_counter()
+        method = 1 if self.spatial_hash else 3
+        hits = 0
+        for sprite in self.moving_sprite_list:
+            sprite.in_collision = bool(arcade.check_for_collision_with_list(
+                sprite, self.stationary_sprite_list, method
+            ))
+            hits += sprite.in_collision
+        self.collision_time = time.perf_counter() - start
+        frame_profiler.phase("update")
+        
+        # Only the simple check reveals how many sprite/block pairs it tested
+        candidates = None if self.spatial_hash else len(self.moving_sprite_list) * len(self.stationary_sprite_list)
+        self.collision_stats.record(candidates, hits, self.collision_time)
+        
+        # Update collision state
+        self.is_colliding = hits > 0
 
 def main():
     """Main function"""
-    window = CollisionDemo(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument("--legacy-hud", action="store_true",
+                        help="draw the stats with arcade.draw_text every frame (for comparison)")
+    # Same scene options as the Pygame demo, so both can be timed on the same scene
+    parser.add_argument("--sprites", type=int, default=1, help="number of moving sprites")
+    parser.add_argument("--blocks", type=int, default=1, help="number of stationary blocks")
+    parser.add_argument("--block-layout", choices=list(BLOCK_LAYOUTS), default="grid",
+                        help="how more than one block is placed")
+    parser.add_argument("--spatial-hash", action="store_true",
+                        help="keep the blocks in a spatial hash instead of checking every block")
+    parser.add_argument("--seed", type=int, default=0, help="seed for placing the extra sprites and blocks")
+    args = parser.parse_args()
+    
+    window = CollisionDemo(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, args.legacy_hud, args.sprites,
+                           args.blocks, args.block_layout, args.spatial_hash, args.seed)
     window.setup()
     arcade.run()
 
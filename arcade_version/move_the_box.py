@@ -1,4 +1,10 @@
 import arcade
+import os
+import sys
+
+# Shared engine code lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.fixed_timestep import FixedTimestep, interpolate
 
 # Constants
 SCREEN_WIDTH = 800
@@ -23,6 +29,13 @@ class MoveTheBox(arcade.Window):
         self.goal = None
         self.game_won = False
         
+        # The player moves once per 1/60 s step, whatever delta_time the frames have
+        self.timestep = FixedTimestep(1 / 60)
+        # Simulated player position, now and before the last step; the sprite
+        # itself is drawn somewhere in between
+        self.player_position = None
+        self.previous_position = None
+        
     def setup(self):
         """Set up the game and initialize variables."""
         # Create the player and goal sprites
@@ -34,6 +47,8 @@ class MoveTheBox(arcade.Window):
         self.player.center_y = SCREEN_HEIGHT // 2
         self.goal.center_x = 3 * SCREEN_WIDTH // 4
         self.goal.center_y = SCREEN_HEIGHT // 2
+        self.player_position = [self.player.center_x, self.player.center_y]
+        self.previous_position = list(self.player_position)
         
         # Movement states
         self.left_pressed = False
@@ -43,6 +58,7 @@ class MoveTheBox(arcade.Window):
         
         # Reset game state
         self.game_won = False
+        self.timestep.reset()
         
     def on_draw(self):
         """Render the screen."""
@@ -87,30 +103,50 @@ class MoveTheBox(arcade.Window):
         """Movement and game logic."""
         if self.game_won:
             return
-            
+        
+        # Run the simulation steps that are due
+        for _ in range(self.timestep.advance(delta_time)):
+            self.step()
+            if self.game_won:
+                # Nothing moves any more, so stop drawing in between
+                self.previous_position = list(self.player_position)
+                break
+        
+        # Show the player `alpha` of the way from its previous to its current position
+        alpha = self.timestep.alpha
+        self.player.center_x = interpolate(self.previous_position[0], self.player_position[0], alpha)
+        self.player.center_y = interpolate(self.previous_position[1], self.player_position[1], alpha)
+    
+    def step(self):
+        """Move the player by one step and check whether it reached the goal."""
+        x, y = self.player_position
+        self.previous_position = [x, y]
+        
         # Calculate player movement based on keys pressed
         if self.left_pressed and not self.right_pressed:
-            self.player.center_x -= PLAYER_SPEED
+            x -= PLAYER_SPEED
         elif self.right_pressed and not self.left_pressed:
-            self.player.center_x += PLAYER_SPEED
+            x += PLAYER_SPEED
         
         if self.up_pressed and not self.down_pressed:
-            self.player.center_y += PLAYER_SPEED
+            y += PLAYER_SPEED
         elif self.down_pressed and not self.up_pressed:
-            self.player.center_y -= PLAYER_SPEED
+            y -= PLAYER_SPEED
         
         # Keep player on screen
-        if self.player.center_x < PLAYER_SIZE // 2:
-            self.player.center_x = PLAYER_SIZE // 2
-        elif self.player.center_x > SCREEN_WIDTH - PLAYER_SIZE // 2:
-            self.player.center_x = SCREEN_WIDTH - PLAYER_SIZE // 2
+        if x < PLAYER_SIZE // 2:
+            x = PLAYER_SIZE // 2
+        elif x > SCREEN_WIDTH - PLAYER_SIZE // 2:
+            x = SCREEN_WIDTH - PLAYER_SIZE // 2
         
-        if self.player.center_y < PLAYER_SIZE // 2:
-            self.player.center_y = PLAYER_SIZE // 2
-        elif self.player.center_y > SCREEN_HEIGHT - PLAYER_SIZE // 2:
-            self.player.center_y = SCREEN_HEIGHT - PLAYER_SIZE // 2
+        if y < PLAYER_SIZE // 2:
+            y = PLAYER_SIZE // 2
+        elif y > SCREEN_HEIGHT - PLAYER_SIZE // 2:
+            y = SCREEN_HEIGHT - PLAYER_SIZE // 2
+        self.player_position = [x, y]
         
-        # Check for collision with goal
+        # Check for collision with goal, with the sprite at the simulated position
+        self.player.center_x, self.player.center_y = x, y
         if arcade.check_for_collision(self.player, self.goal):
             self.game_won = True
 
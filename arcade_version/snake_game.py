@@ -1,5 +1,13 @@
 import arcade
-import random
+import argparse
+import os
+import sys
+
+# The shared snake engine lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.fixed_timestep import FixedTimestep
+from shared.hud import Hud
+from shared.snake_body import SnakeBody
 
 # Constants
 SCREEN_WIDTH = 800
@@ -13,8 +21,8 @@ GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
 # We'll set the game to run at a normal frame rate
 FRAME_RATE = 60  # Normal frame rate for smooth rendering
 
-# But we'll only move the snake every X frames
-MOVE_EVERY_X_FRAMES = 5  # Move only every 30 frames (0.5 seconds at 60 FPS)
+# But we'll only move the snake every X frames' worth of time
+MOVE_EVERY_X_FRAMES = 5  # Move every 5/60 seconds, whatever the real frame rate
 
 # Colors
 SNAKE_COLOR = arcade.color.GREEN
@@ -37,10 +45,12 @@ class Snake:
         self.y = GRID_HEIGHT // 2
         
         # Initial body (just the head)
-        self.body = [(self.x, self.y)]
+        self.body = SnakeBody(GRID_WIDTH, GRID_HEIGHT, (self.x, self.y))
         
         # Initial direction
         self.direction = RIGHT
+        # Direction of the last move; turning back onto it would bite the neck
+        self.moved_direction = self.direction
         
         # Movement offsets for each direction
         self.direction_offsets = {
@@ -51,16 +61,17 @@ class Snake:
         }
     
     def move(self):
-        """Move the snake by adding a new head and removing the tail"""
+        """Move the snake by adding a new head; the tail is removed by the game"""
         # Get movement offset based on current direction
         dx, dy = self.direction_offsets[self.direction]
+        self.moved_direction = self.direction
         
-        # Calculate new head position
-        new_head_x = self.body[0][0] + dx
-        new_head_y = self.body[0][1] + dy
+        # Calculate new head position, wrapping around the screen edges
+        head_x, head_y = self.body.head
+        new_head = self.body.wrap((head_x + dx, head_y + dy))
         
         # Add new head to the beginning of the body
-        self.body.insert(0, (new_head_x, new_head_y))
+        self.body.push_head(new_head)
     
     def grow(self):
         """Grow the snake by not removing the tail on the next move"""
@@ -69,7 +80,7 @@ class Snake:
     
     def check_collision_with_self(self):
         """Check if the snake has collided with itself"""
-        return self.body[0] in self.body[1:]
+        return self.body.hits_itself()
     
     def check_collision_with_walls(self):
         """Check if the snake has collided with the walls"""
@@ -78,7 +89,7 @@ class Snake:
     
     def check_collision_with_food(self, food):
         """Check if the snake has collided with the food"""
-        return self.body[0] == food
+        return self.body.head == food
     
     def draw(self):
         """Draw the snake on the screen"""
@@ -96,18 +107,30 @@ class Snake:
 class SnakeGame(arcade.Window):
     """Main game class"""
     
-    def __init__(self, width, height, title):
+    def __init__(self, width, height, title, legacy_hud=False):
         super().__init__(width, height, title)
         arcade.set_background_color(BG_COLOR)
         
+        # Score and game over text, laid out once and updated only on change
+        self.hud = Hud(legacy=legacy_hud)
+        self.hud.add("score", "Score: 0", 10, SCREEN_HEIGHT - 30, TEXT_COLOR, 20)
+        self.hud.add("game_over", "Game Over", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50,
+                     TEXT_COLOR, 54, anchor_x="center", visible=False)
+        self.hud.add("final_score", "Score: 0", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2,
+                     TEXT_COLOR, 30, anchor_x="center", visible=False)
+        self.hud.add("restart", "Press R to Restart", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50,
+                     TEXT_COLOR, 24, anchor_x="center", visible=False)
+        self.hud.add("quit", "Press Q to Quit", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100,
+                     TEXT_COLOR, 24, anchor_x="center", visible=False)
+        
         # Initialize game states
         self.snake = None
         self.food = None
         self.score = 0
         self.game_over = False
         
-        # Frame counter for controlling snake speed
-        self.frame_count = 0
+        # Turns delta_time into snake moves, so a slow frame doesn't slow the snake
+        self.timestep = FixedTimestep(MOVE_EVERY_X_FRAMES / FRAME_RATE)
         
         # Set up the game
         self.setup()
@@ -123,91 +146,52 @@ class SnakeGame(arcade.Window):
         # Reset score and game state
         self.score = 0
         self.game_over = False
+        self.timestep.reset()
     
     def generate_food(self):
-        """Generate a new food at a random position"""
-        while True:
-            # Random position for food
-            x = random.randint(0, GRID_WIDTH - 1)
-            y = random.randint(0, GRID_HEIGHT - 1)
-            
-            # Make sure food doesn't spawn on snake
-            if (x, y) not in self.snake.body:
-                self.food = (x, y)
-                break
+        """Generate a new food at a random free position"""
+        # The snake body keeps an index of free cells, so this is a single pick.
+        # None means the snake covers the whole board.
+        self.food = self.snake.body.random_free_cell()
     
     def on_draw(self):
         """Render the screen"""
         arcade.start_render()
         
         # Draw food
-        food_x, food_y = self.food
-        arcade.draw_rectangle_filled(
-            food_x * GRID_SIZE + GRID_SIZE // 2,
-            food_y * GRID_SIZE + GRID_SIZE // 2,
-            GRID_SIZE,
-            GRID_SIZE,
-            FOOD_COLOR
-        )
+        if self.food is not None:
+            food_x, food_y = self.food
+            arcade.draw_rectangle_filled(
+                food_x * GRID_SIZE + GRID_SIZE // 2,
+                food_y * GRID_SIZE + GRID_SIZE // 2,
+                GRID_SIZE,
+                GRID_SIZE,
+                FOOD_COLOR
+            )
         
         # Draw snake
         self.snake.draw()
         
-        # Draw score
-        arcade.draw_text(
-            f"Score: {self.score}",
-            10,
-            SCREEN_HEIGHT - 30,
-            TEXT_COLOR,
-            20
-        )
-        
-        # Draw game over screen if game is over
+        # Draw score and, once the game is over, the game over screen
+        self.hud.set_text("score", f"Score: {self.score}")
         if self.game_over:
-            arcade.draw_text(
-                "Game Over",
-                SCREEN_WIDTH // 2,
-                SCREEN_HEIGHT // 2 + 50,
-                TEXT_COLOR,
-                54,
-                anchor_x="center"
-            )
-            arcade.draw_text(
-                f"Score: {self.score}",
-                SCREEN_WIDTH // 2,
-                SCREEN_HEIGHT // 2,
-                TEXT_COLOR,
-                30,
-                anchor_x="center"
-            )
-            arcade.draw_text(
-                "Press R to Restart",
-                SCREEN_WIDTH // 2,
-                SCREEN_HEIGHT // 2 - 50,
-                TEXT_COLOR,
-                24,
-                anchor_x="center"
-            )
-            arcade.draw_text(
-                "Press Q to Quit",
-                SCREEN_WIDTH // 2,
-                SCREEN_HEIGHT // 2 - 100,
-                TEXT_COLOR,
-                24,
-                anchor_x="center"
-            )
+            self.hud.set_text("game_over", "You Win!" if self.food is None else "Game Over")
+            self.hud.set_text("final_score", f"Score: {self.score}")
+        for name in ("game_over", "final_score", "restart", "quit"):
+            self.hud.set_visible(name, self.game_over)
+        self.hud.draw()
     
     def on_key_press(self, key, modifiers):
         """Handle key presses"""
         if not self.game_over:
             # Change direction based on key press
-            if key == arcade.key.UP and self.snake.direction != DOWN:
+            if key == arcade.key.UP and self.snake.moved_direction != DOWN:
                 self.snake.direction = UP
-            elif key == arcade.key.DOWN and self.snake.direction != UP:
+            elif key == arcade.key.DOWN and self.snake.moved_direction != UP:
                 self.snake.direction = DOWN
-            elif key == arcade.key.LEFT and self.snake.direction != RIGHT:
+            elif key == arcade.key.LEFT and self.snake.moved_direction != RIGHT:
                 self.snake.direction = LEFT
-            elif key == arcade.key.RIGHT and self.snake.direction != LEFT:
+            elif key == arcade.key.RIGHT and self.snake.moved_direction != LEFT:
                 self.snake.direction = RIGHT
         else:
             # Restart or quit the game
@@ -218,50 +202,48 @@ class SnakeGame(arcade.Window):
     
     def update(self, delta_time):
         """Update the game state"""
-        if not self.game_over:
-            # Increment the frame counter
-            self.frame_count += 1
+        if self.game_over:
+            return
+        
+        # Move the snake once per step that is due
+        for _ in range(self.timestep.advance(delta_time)):
+            self.step()
+            if self.game_over:
+                break
+    
+    def step(self):
+        """Move the snake one cell and handle what it runs into"""
+        # Move the snake (wrapping around screen edges)
+        self.snake.move()
+        
+        # Check for collision with self only (not walls)
+        if self.snake.check_collision_with_self():
+            self.game_over = True
+            return
+        
+        # Check for collision with food
+        if self.snake.check_collision_with_food(self.food):
+            # Increase score
+            self.score += 1
+            
+            # Generate new food
+            self.generate_food()
             
-            # Only move the snake every X frames
-            if self.frame_count >= MOVE_EVERY_X_FRAMES:
-                self.frame_count = 0  # Reset counter
-                
-                # Move the snake
-                self.snake.move()
-                
-                # Get the current head position and handle wrapping around screen edges
-                head_x, head_y = self.snake.body[0]
-                
-                # Wrap around if snake goes off screen
-                if head_x < 0:
-                    self.snake.body[0] = (GRID_WIDTH - 1, head_y)
-                elif head_x >= GRID_WIDTH:
-                    self.snake.body[0] = (0, head_y)
-                
-                if head_y < 0:
-                    self.snake.body[0] = (head_x, GRID_HEIGHT - 1)
-                elif head_y >= GRID_HEIGHT:
-                    self.snake.body[0] = (head_x, 0)
-                
-                # Check for collision with self only (not walls)
-                if self.snake.check_collision_with_self():
-                    self.game_over = True
-                    return
-                
-                # Check for collision with food
-                if self.snake.check_collision_with_food(self.food):
-                    # Increase score
-                    self.score += 1
-                    
-                    # Generate new food
-                    self.generate_food()
-                else:
-                    # Remove tail if no food was eaten
-                    self.snake.body.pop()
+            # No room left for food: the board is full and the game is won
+            if self.food is None:
+                self.game_over = True
+        else:
+            # Remove tail if no food was eaten
+            self.snake.body.pop_tail()
 
 def main():
     """Main function to start the game"""
-    window = SnakeGame(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument("--legacy-hud", action="store_true",
+                        help="draw the text with arcade.draw_text every frame (for comparison)")
+    args = parser.parse_args()
+    
+    window = SnakeGame(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, args.legacy_hud)
     # Run at normal frame rate for smooth rendering
     arcade.run()
 
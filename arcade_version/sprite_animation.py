@@ -1,4 +1,18 @@
 import arcade
+import argparse
+import os
+import random
+import sys
+
+import PIL.Image
+import PIL.ImageDraw
+
+# Shared engine code lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.animation import AnimationClip, AnimationTimeline
+from shared.fixed_timestep import FixedTimestep, interpolate
+from shared.frame_cache import frame_cache
+from shared.hud import Hud
 
 # Window settings
 SCREEN_WIDTH = 800
@@ -14,10 +28,65 @@ GRAY = arcade.color.GRAY
 SPRITE_WIDTH = 64
 SPRITE_HEIGHT = 64
 ANIMATION_FRAMES = 8
+FRAME_DURATION = 1 / 12  # Seconds each animation frame is shown, like the Pygame version
 SPRITE_SCALING = 1.0
 
+# One color per animation frame - different colored squares with faces
+PALETTE = (
+    arcade.color.RED,
+    arcade.color.ORANGE,
+    arcade.color.YELLOW,
+    arcade.color.GREEN,
+    arcade.color.BLUE,
+    arcade.color.PURPLE,
+    arcade.color.VIOLET,
+    arcade.color.PINK
+)
+
+# Facial features, in pixels
+EYE_SIZE = 8
+PUPIL_SIZE = 4
+MOUTH_WIDTH = 20
+
+def pupil_offset(frame):
+    # Pupils move based on frame: -1, 0, or 1
+    return (frame % 3) - 1
+
+def mouth_height(frame):
+    # Mouth changes size with frame
+    return 5 + (frame % 4) * 2
+
+def build_textures(palette, faces=True):
+    """One texture per palette color, with the frame's face drawn into it unless `faces` is False"""
+    textures = []
+    for i, color in enumerate(palette):
+        # Create an image filled with the specified color
+        image = PIL.Image.new("RGBA", (SPRITE_WIDTH, SPRITE_HEIGHT), (*color[:3], 255))
+        
+        if faces:
+            # Image y grows downwards: the eyes sit 12 px above the center, the mouth 12 px below
+            draw = PIL.ImageDraw.Draw(image)
+            center_x, center_y = SPRITE_WIDTH // 2, SPRITE_HEIGHT // 2
+            for eye_x in (center_x - 12, center_x + 12):
+                # Eyes (white circles) with their pupils; PIL's box includes its last pixel
+                draw.ellipse((eye_x - EYE_SIZE, center_y - 12 - EYE_SIZE,
+                              eye_x + EYE_SIZE - 1, center_y - 12 + EYE_SIZE - 1), fill=arcade.color.WHITE)
+                pupil_x = eye_x + pupil_offset(i)
+                draw.ellipse((pupil_x - PUPIL_SIZE, center_y - 12 - PUPIL_SIZE,
+                              pupil_x + PUPIL_SIZE - 1, center_y - 12 + PUPIL_SIZE - 1), fill=arcade.color.BLACK)
+            
+            # Mouth
+            top = center_y + 12 - mouth_height(i) // 2
+            draw.rectangle((center_x - MOUTH_WIDTH // 2, top,
+                            center_x + MOUTH_WIDTH // 2 - 1, top + mouth_height(i) - 1), fill=arcade.color.BLACK)
+        
+        # Add the texture to our list; the sprites never collide, so skip the hit box
+        name = f"{'face' if faces else 'plain'}_frame_{i}"
+        textures.append(arcade.Texture(name, image, hit_box_algorithm="None"))
+    return textures
+
 class AnimatedSprite(arcade.Sprite):
-    def __init__(self, center_x, center_y, speed):
+    def __init__(self, center_x, center_y, speed, textures):
         # Initialize parent class
         super().__init__()
         
@@ -26,63 +95,55 @@ class AnimatedSprite(arcade.Sprite):
         self.center_y = center_y
         self.change_x = speed
         
+        # Simulated x position, now and before the last update; center_x is
+        # placed in between by place()
+        self.world_x = center_x
+        self.previous_x = center_x
+        
         # Animation tracking
         self.current_texture = 0
         self.scale = SPRITE_SCALING
         
-        # Create textures - different colored squares with faces
-        self.textures = []
-        colors = [
-            arcade.color.RED,
-            arcade.color.ORANGE,
-            arcade.color.YELLOW,
-            arcade.color.GREEN,
-            arcade.color.BLUE,
-            arcade.color.PURPLE,
-            arcade.color.VIOLET,
-            arcade.color.PINK
-        ]
-        
-        # Generate textures for animation
-        for i, color in enumerate(colors):
-            # Create a texture filled with the specified color
-            texture = arcade.Texture.create_filled(
-                f"frame_{i}", 
-                (SPRITE_WIDTH, SPRITE_HEIGHT), 
-                color
-            )
-            
-            # Add the texture to our list
-            self.textures.append(texture)
+        # The textures are made once and shared by every sprite
+        self.textures = textures
         
         # Set the initial texture
         self.texture = self.textures[0]
-        
-        # Add facial features to show animation
-        self.eye_size = 8
-        self.pupil_size = 4
-        self.mouth_width = 20
     
     def update(self):
         # Move the sprite
-        self.center_x += self.change_x
+        self.previous_x = self.world_x
+        self.world_x += self.change_x
         
-        # Handle wrapping around the screen
-        if self.center_x > SCREEN_WIDTH + self.width/2:
-            self.center_x = -self.width/2
+        # Handle wrapping around the screen (a jump, not something to draw in between)
+        if self.world_x > SCREEN_WIDTH + self.width/2:
+            self.world_x = self.previous_x = -self.width/2
     
-    def update_animation(self, delta_time: float = 1/60):
-        # Update animation frame by advancing to the next texture
-        self.current_texture += 1
-        if self.current_texture >= len(self.textures):
-            self.current_texture = 0
-        self.texture = self.textures[self.current_texture]
+    def place(self, alpha):
+        # Show the sprite `alpha` of the way from its previous to its current position
+        self.center_x = interpolate(self.previous_x, self.world_x, alpha)
+    
+    def show_frame(self, index):
+        # Called by the timeline when the clip moves on to another texture
+        self.current_texture = index
+        self.texture = self.textures[index]
 
 class AnimationDemo(arcade.Window):
-    def __init__(self, width, height, title):
+    def __init__(self, width, height, title, legacy_hud=False, sprites=1, legacy_faces=False, seed=0):
         # Initialize parent class
         super().__init__(width, height, title)
         
+        # Draw the text with arcade.draw_text every frame instead of the HUD
+        self.legacy_hud = legacy_hud
+        self.hud = None
+        
+        # Draw the faces with immediate-mode calls every frame instead of baking them into the textures
+        self.legacy_faces = legacy_faces
+        
+        # More sprites turn the demo into a drawing stress test
+        self.sprite_count = sprites
+        self.seed = seed
+        
         # Set background color
         arcade.set_background_color(WHITE)
         
@@ -90,19 +151,65 @@ class AnimationDemo(arcade.Window):
         self.sprite_list = None
         self.animated_sprite = None
         
+        # Movement and animation advance once per 1/60 s step, whatever delta_time the frames have
+        self.timestep = FixedTimestep(1 / 60)
+        
+        # Picks every sprite's texture by game time
+        self.timeline = None
+        
     def setup(self):
         # Create sprite list
         self.sprite_list = arcade.SpriteList()
         
+        # Every sprite animates through the same textures, drawn once per palette
+        faces = not self.legacy_faces
+        textures = frame_cache.get(
+            ("arcade_animated_sprite", PALETTE, faces), lambda: build_textures(PALETTE, faces)
+        )
+        
         # Create animated sprite
         self.animated_sprite = AnimatedSprite(
             100,  # x position
             SCREEN_HEIGHT // 2,  # y position
-            2     # speed
+            2,    # speed
+            textures
         )
         
         # Add sprite to the list
         self.sprite_list.append(self.animated_sprite)
+        
+        # The textures change with game time, FRAME_DURATION seconds each
+        clip = AnimationClip.uniform(len(textures), FRAME_DURATION)
+        self.timeline = AnimationTimeline()
+        self.timeline.add(self.animated_sprite, clip)
+        
+        # Extra sprites go anywhere above the ground, at their own speed and frame
+        rng = random.Random(self.seed)
+        for _ in range(self.sprite_count - 1):
+            sprite = AnimatedSprite(
+                rng.randrange(SCREEN_WIDTH), rng.randrange(80, SCREEN_HEIGHT - 60), rng.choice((1, 2, 3)), textures
+            )
+            self.timeline.add(sprite, clip, start_frame=rng.randrange(len(textures)))
+            self.sprite_list.append(sprite)
+        
+        # Text is laid out once; only the frame counter changes afterwards
+        self.hud = Hud(legacy=self.legacy_hud)
+        self.hud.add(
+            "frame", f"Frame: 1/{ANIMATION_FRAMES}",
+            self.animated_sprite.center_x - 40, self.animated_sprite.center_y + 40,
+            BLACK, 14
+        )
+        self.hud.add(
+            "title", "Arcade Sprite Animation Demo",
+            SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30,
+            BLACK, 24, anchor_x="center"
+        )
+        self.hud.add("info1", "Arcade provides built-in animation support", 20, 140, BLACK, 14)
+        self.hud.add("info2", "Textures are automatically managed", 20, 120, BLACK, 14)
+        self.hud.add(
+            "info3", "Animation frames are picked by elapsed game time",
+            20, 100, BLACK, 14
+        )
     
     def on_draw(self):
         # Clear the screen
@@ -113,89 +220,61 @@ class AnimationDemo(arcade.Window):
             SCREEN_WIDTH // 2, 20, SCREEN_WIDTH, 40, GRAY
         )
         
-        # Draw sprites
+        # Draw sprites; with the faces in the textures this is one batched draw for all of them
         self.sprite_list.draw()
         
-        # Draw facial features on top of the sprite
+        if self.legacy_faces:
+            for sprite in self.sprite_list:
+                self.draw_face(sprite)
+        
+        # Draw frame number, title and information
+        self.hud.draw()
+    
+    def draw_face(self, sprite):
+        """Draw facial features on top of a sprite with immediate-mode calls (the old way)"""
         # Eyes (white circles)
-        arcade.draw_circle_filled(
-            self.animated_sprite.center_x - 12,
-            self.animated_sprite.center_y + 12,
-            self.animated_sprite.eye_size,
-            arcade.color.WHITE
-        )
-        arcade.draw_circle_filled(
-            self.animated_sprite.center_x + 12,
-            self.animated_sprite.center_y + 12,
-            self.animated_sprite.eye_size,
-            arcade.color.WHITE
-        )
+        arcade.draw_circle_filled(sprite.center_x - 12, sprite.center_y + 12, EYE_SIZE, arcade.color.WHITE)
+        arcade.draw_circle_filled(sprite.center_x + 12, sprite.center_y + 12, EYE_SIZE, arcade.color.WHITE)
         
         # Pupils (move based on frame)
-        pupil_offset = (self.animated_sprite.current_texture % 3) - 1  # -1, 0, or 1
-        arcade.draw_circle_filled(
-            self.animated_sprite.center_x - 12 + pupil_offset,
-            self.animated_sprite.center_y + 12,
-            self.animated_sprite.pupil_size,
-            arcade.color.BLACK
-        )
-        arcade.draw_circle_filled(
-            self.animated_sprite.center_x + 12 + pupil_offset,
-            self.animated_sprite.center_y + 12,
-            self.animated_sprite.pupil_size,
-            arcade.color.BLACK
-        )
+        offset = pupil_offset(sprite.current_texture)
+        arcade.draw_circle_filled(sprite.center_x - 12 + offset, sprite.center_y + 12, PUPIL_SIZE, arcade.color.BLACK)
+        arcade.draw_circle_filled(sprite.center_x + 12 + offset, sprite.center_y + 12, PUPIL_SIZE, arcade.color.BLACK)
         
         # Mouth (changes size with frame)
-        mouth_height = 5 + (self.animated_sprite.current_texture % 4) * 2
         arcade.draw_rectangle_filled(
-            self.animated_sprite.center_x,
-            self.animated_sprite.center_y - 12,
-            self.animated_sprite.mouth_width,
-            mouth_height,
-            arcade.color.BLACK
-        )
-        
-        # Draw frame number for demonstration
-        arcade.draw_text(
-            f"Frame: {self.animated_sprite.current_texture + 1}/{ANIMATION_FRAMES}",
-            self.animated_sprite.center_x - 40,
-            self.animated_sprite.center_y + 40,
-            BLACK, 14
-        )
-        
-        # Draw title and information
-        arcade.draw_text(
-            "Arcade Sprite Animation Demo",
-            SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30,
-            BLACK, 24, anchor_x="center"
-        )
-        
-        arcade.draw_text(
-            "Arcade provides built-in animation support",
-            20, 140, BLACK, 14
-        )
-        
-        arcade.draw_text(
-            "Textures are automatically managed",
-            20, 120, BLACK, 14
-        )
-        
-        arcade.draw_text(
-            "Animation is updated through the sprite's update_animation method",
-            20, 100, BLACK, 14
+            sprite.center_x, sprite.center_y - 12, MOUTH_WIDTH, mouth_height(sprite.current_texture), arcade.color.BLACK
         )
     
     def on_update(self, delta_time):
-        # Move sprites
-        self.sprite_list.update()
+        steps = self.timestep.advance(delta_time)
+        for _ in range(steps):
+            # Move sprites
+            self.sprite_list.update()
+        
+        # Update animations by the game time those steps took; sprites that
+        # show the same frame are switched together
+        self.timeline.advance(steps * self.timestep.step)
+        for sprite in self.sprite_list:
+            sprite.place(self.timestep.alpha)
         
-        # Update animations - Using Arcade's automatic animation system
-        self.sprite_list.update_animation()
+        # Keep the frame number next to the sprite
+        self.hud.set_text("frame", f"Frame: {self.animated_sprite.current_texture + 1}/{ANIMATION_FRAMES}")
+        self.hud.set_position("frame", self.animated_sprite.center_x - 40, self.animated_sprite.center_y + 40)
 
 def main():
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument("--legacy-hud", action="store_true",
+                        help="draw the text with arcade.draw_text every frame (for comparison)")
+    parser.add_argument("--legacy-faces", action="store_true",
+                        help="draw the faces with draw_circle_filled/draw_rectangle_filled every frame (for comparison)")
+    parser.add_argument("--sprites", type=int, default=1, help="number of animated sprites")
+    parser.add_argument("--seed", type=int, default=0, help="seed for placing the extra sprites")
+    args = parser.parse_args()
+    
     # Create the game window
-    window = AnimationDemo(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
+    window = AnimationDemo(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, args.legacy_hud, args.sprites,
+                           args.legacy_faces, args.seed)
     
     # Set up the game
     window.setup()
@@ -0,0 +1,54 @@
+"""Frame time of the Arcade sprite animation with baked and drawn faces.
+
+arcade_version/sprite_animation.py is run headless through the benchmark
+harness with more and more sprites (`--sprites N`), once with the faces
+baked into the shared animation textures (one SpriteList draw for
+everything) and once with `--legacy-faces`, which draws every sprite's
+eyes, pupils and mouth with five immediate-mode calls per frame.
+
+For each run the table shows the mean and p99 frame time in milliseconds.
+
+    python benchmarks/arcade_faces_bench.py
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perf.bench import run_benchmark
+
+SPRITE_COUNTS = (1, 100, 300, 1_000)
+# (column title, extra game arguments)
+VARIANTS = (
+    ("baked", []),
+    ("drawn", ["--legacy-faces"]),
+)
+
+
+def measure(sprites, extra_args, frames, timeout):
+    game_args = ["--sprites", str(sprites), *extra_args]
+    result = run_benchmark("arcade_version", "sprite_animation", frames, timeout, game_args=game_args)
+    if result.get("error"):
+        return None
+    return result["stats"]["mean_ms"], result["stats"]["p99_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=120, help="frames run per measurement")
+    parser.add_argument("--timeout", type=int, default=300, help="seconds before a run is abandoned")
+    args = parser.parse_args()
+
+    print(f"{args.frames} frames; mean ms / p99 ms")
+    print(f"{'Sprites':>8} " + " ".join(f"{title:>17}" for title, _ in VARIANTS))
+    for sprites in SPRITE_COUNTS:
+        cells = []
+        for _, extra_args in VARIANTS:
+            measured = measure(sprites, extra_args, args.frames, args.timeout)
+            cells.append("failed" if measured is None else f"{measured[0]:.2f} / {measured[1]:.2f}")
+        print(f"{sprites:>8} " + " ".join(f"{cell:>17}" for cell in cells), flush=True)
+
+
+if __name__ == "__main__":
+    main()
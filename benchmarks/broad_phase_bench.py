@@ -0,0 +1,121 @@
+"""Collision cost per frame of each broad phase as the sprite count grows.
+
+N small sprites move around a 640x480 scene with M static blocks, the same
+setup as `collision_demo.py --sprites N --blocks M`. For each broad phase
+we time whole frames of collision detection (broad + narrow phase), and
+separately the cost of just drawing the N sprites with pygame.draw.rect,
+so the table shows where a pygame frame stops fitting in 16.7 ms.
+
+    python benchmarks/broad_phase_bench.py
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from shared.broad_phase import BROAD_PHASES
+
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 480
+SPRITE_COUNTS = (10, 100, 1_000, 10_000, 100_000)
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def make_scene(sprites, blocks, seed):
+    rng = random.Random(seed)
+    sprite_rects = []
+    for _ in range(sprites):
+        size = rng.randint(4, 16)
+        sprite_rects.append(pygame.Rect(rng.randrange(SCREEN_WIDTH - size), rng.randrange(SCREEN_HEIGHT - size), size, size))
+    block_rects = []
+    for _ in range(blocks):
+        width, height = rng.randint(10, 60), rng.randint(10, 60)
+        block_rects.append(pygame.Rect(rng.randrange(SCREEN_WIDTH - width), rng.randrange(SCREEN_HEIGHT - height), width, height))
+    velocities = [(rng.choice((-3, 3)), rng.choice((-2, 2))) for _ in range(sprites)]
+    return sprite_rects, block_rects, velocities
+
+
+def move(sprite_rects, velocities):
+    for index, rect in enumerate(sprite_rects):
+        dx, dy = velocities[index]
+        rect.move_ip(dx, dy)
+        # Bounce off screen edges, as collision_demo's sprites do
+        if rect.left < 0 or rect.right > SCREEN_WIDTH:
+            dx = -dx
+        if rect.top < 0 or rect.bottom > SCREEN_HEIGHT:
+            dy = -dy
+        velocities[index] = (dx, dy)
+
+
+def timed_frames(step, min_time, max_frames):
+    """Run `step` until min_time has passed (at least once); return ms per frame"""
+    frames = 0
+    start = time.perf_counter()
+    while True:
+        step()
+        frames += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or frames >= max_frames:
+            return elapsed / frames * 1000
+
+
+def bench_phase(name, sprites, blocks, seed, min_time, max_frames):
+    sprite_rects, block_rects, velocities = make_scene(sprites, blocks, seed)
+    phase = BROAD_PHASES[name]()
+    # The first call builds the static structures; keep it out of the timing
+    phase.collisions(sprite_rects, block_rects)
+
+    def step():
+        move(sprite_rects, velocities)
+        phase.collisions(sprite_rects, block_rects)
+
+    ms = timed_frames(step, min_time, max_frames)
+    return ms, phase.last["candidates"]
+
+
+def bench_draw(surface, sprites, blocks, seed, min_time, max_frames):
+    sprite_rects, block_rects, _ = make_scene(sprites, blocks, seed)
+
+    def step():
+        surface.fill((0, 0, 0))
+        for rect in block_rects:
+            pygame.draw.rect(surface, (0, 255, 0), rect)
+        for rect in sprite_rects:
+            pygame.draw.rect(surface, (0, 0, 255), rect)
+            pygame.draw.rect(surface, (0, 0, 0), rect, 2)
+
+    return timed_frames(step, min_time, max_frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=100, help="number of static blocks")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds spent timing each cell")
+    parser.add_argument("--max-frames", type=int, default=200, help="frames timed per cell at most")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print(f"{args.blocks} blocks; collision ms/frame (candidate pairs), '*' = over {FRAME_BUDGET_MS:.1f} ms")
+    header = f"{'Sprites':>8} " + " ".join(f"{name:>20}" for name in BROAD_PHASES) + f" {'draw ms':>10}"
+    print(header)
+    for sprites in SPRITE_COUNTS:
+        cells = []
+        for name in BROAD_PHASES:
+            ms, candidates = bench_phase(name, sprites, args.blocks, args.seed, args.min_time, args.max_frames)
+            mark = "*" if ms > FRAME_BUDGET_MS else " "
+            cells.append(f"{ms:>9.2f}{mark} ({candidates:>7})")
+        draw_ms = bench_draw(surface, sprites, args.blocks, args.seed, args.min_time, args.max_frames)
+        mark = "*" if draw_ms > FRAME_BUDGET_MS else " "
+        print(f"{sprites:>8} " + " ".join(f"{cell:>20}" for cell in cells) + f" {draw_ms:>9.2f}{mark}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Frame time added by capturing every frame, in the background and synchronously.
+
+Each game runs headless through the benchmark harness without capture,
+with --capture (frames handed to a writer thread, dropped when it falls
+behind) and with --capture-sync (every frame written from the game loop,
+like taking a screenshot each frame), in both the raw and the PNG format.
+The table shows the median frame time, what capturing added to it, how
+long the game thread spent grabbing each frame, and how many frames were
+captured and dropped.
+
+With a software OpenGL driver (Mesa llvmpipe, as in headless containers),
+reading the Arcade framebuffer back forces the frame's rendering to finish
+on the spot, so Arcade's grab time there is mostly rendering that would
+otherwise have been deferred; on a GPU the pixel buffer reads don't wait.
+
+    python benchmarks/capture_bench.py
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perf.bench import run_benchmark
+from perf.harness import LIBRARIES
+
+GAMES = ("move_the_box", "sprite_animation", "collision_demo")
+
+# (label, format, synchronous)
+MODES = (
+    ("off", None, False),
+    ("raw", "raw", False),
+    ("raw sync", "raw", True),
+    ("png", "png", False),
+    ("png sync", "png", True),
+)
+
+
+def measure(library, game, frames, timeout, image_format, sync, game_args):
+    directory = tempfile.mkdtemp(prefix=f"capture_{game}_")
+    try:
+        return run_benchmark(library, game, frames, timeout, game_args=game_args,
+                             capture=directory if image_format else None,
+                             capture_format=image_format or "raw", capture_sync=sync)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300, help="frames run per measurement")
+    parser.add_argument("--timeout", type=int, default=300, help="seconds before a run is abandoned")
+    parser.add_argument("--game", action="append", help="only run this game (can be repeated)")
+    parser.add_argument("--sprites", type=int, default=100,
+                        help="sprites in the sprite animation and collision demo")
+    args = parser.parse_args()
+
+    print(f"{args.frames} frames per run; median frame time")
+    header = (f"{'Game':<18} {'Library':<15} {'Capture':<9} {'p50 ms':>8} {'added':>8} {'grab ms':>8} "
+              f"{'captured':>9} {'dropped':>8}")
+    print(header)
+    print("-" * len(header))
+    for game in args.game or GAMES:
+        game_args = ["--sprites", str(args.sprites)] if game != "move_the_box" else []
+        for library in LIBRARIES:
+            baseline = None
+            for label, image_format, sync in MODES:
+                result = measure(library, game, args.frames, args.timeout, image_format, sync, game_args)
+                if result.get("error"):
+                    print(f"{game:<18} {library:<15} {label:<9} failed: {result['error']}")
+                    continue
+                frame_ms = result["stats"]["p50_ms"]
+                if baseline is None:
+                    baseline = frame_ms
+                capture = result.get("capture") or {}
+                added = f"{frame_ms - baseline:+.3f}" if image_format else ""
+                print(f"{game:<18} {library:<15} {label:<9} {frame_ms:>8.3f} {added:>8} "
+                      f"{capture.get('grab_mean_ms', 0.0):>8.3f} {capture.get('captured', ''):>9} "
+                      f"{capture.get('dropped', ''):>8}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Collision time per frame of both collision demos at scale, side by side.
+
+Both demos are run headless through the benchmark harness on the same
+scene (`--sprites N --blocks M`, blocks on a grid), once checking every
+block and once with a spatial hash:
+
+    pygame  --broad-phase brute / --broad-phase hash
+    arcade  plain SpriteList   / --spatial-hash on the blocks' SpriteList
+
+For each run the table shows the mean time spent in collision checks and
+the mean time of the whole frame, in milliseconds.
+
+    python benchmarks/collision_scale_bench.py
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perf.bench import run_benchmark
+
+SPRITE_COUNTS = (100, 1_000, 5_000)
+# (column title, library, extra game arguments)
+VARIANTS = (
+    ("pygame", "pygame_version", ["--broad-phase", "brute"]),
+    ("pygame hash", "pygame_version", ["--broad-phase", "hash"]),
+    ("arcade", "arcade_version", []),
+    ("arcade hash", "arcade_version", ["--spatial-hash"]),
+)
+
+
+def measure(library, sprites, blocks, extra_args, frames, timeout):
+    game_args = ["--sprites", str(sprites), "--blocks", str(blocks), *extra_args]
+    result = run_benchmark(library, "collision_demo", frames, timeout, game_args=game_args)
+    if result.get("error") or not result.get("broad_phase"):
+        return None
+    return result["broad_phase"][0]["collision_ms"], result["stats"]["mean_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=100, help="number of stationary blocks")
+    parser.add_argument("--frames", type=int, default=120, help="frames run per measurement")
+    parser.add_argument("--timeout", type=int, default=300, help="seconds before a run is abandoned")
+    args = parser.parse_args()
+
+    print(f"{args.blocks} blocks on a grid, {args.frames} frames; collision ms / frame ms")
+    print(f"{'Sprites':>8} " + " ".join(f"{title:>17}" for title, _, _ in VARIANTS))
+    for sprites in SPRITE_COUNTS:
+        cells = []
+        for _, library, extra_args in VARIANTS:
+            measured = measure(library, sprites, args.blocks, extra_args, args.frames, args.timeout)
+            cells.append("failed" if measured is None else f"{measured[0]:.2f} / {measured[1]:.2f}")
+        print(f"{sprites:>8} " + " ".join(f"{cell:>17}" for cell in cells), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Per-object sprite updates vs. the NumPy entity store.
+
+Both paths run the collision demo's physics on the same random scene
+(N sprites, M static blocks on a 640x480 screen): move, bounce off the
+screen edges and test every sprite against every block. After timing,
+the positions, velocities and collision flags of the two paths are
+compared and must be identical.
+
+    python benchmarks/entity_store_bench.py
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from shared.entity_store import EntityStore
+
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 480
+ENTITY_COUNTS = (1_000, 10_000, 1_000_000)
+
+
+class MovingSprite:
+    """The per-object physics of pygame_version/collision_demo.py"""
+
+    def __init__(self, x, y, width, height, speed_x, speed_y):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.speed_x = speed_x
+        self.speed_y = speed_y
+        self.in_collision = False
+
+    def update(self):
+        self.rect.x += self.speed_x
+        self.rect.y += self.speed_y
+        if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
+            self.speed_x *= -1
+        if self.rect.top < 0 or self.rect.bottom > SCREEN_HEIGHT:
+            self.speed_y *= -1
+
+
+def make_scene(count, blocks, seed):
+    rng = random.Random(seed)
+    sprites = []
+    for _ in range(count):
+        size = rng.randint(4, 16)
+        sprites.append(MovingSprite(
+            rng.randrange(SCREEN_WIDTH - size), rng.randrange(SCREEN_HEIGHT - size), size, size,
+            rng.choice((-3, -2, -1, 1, 2, 3)), rng.choice((-3, -2, -1, 1, 2, 3))
+        ))
+    block_rects = []
+    for _ in range(blocks):
+        width, height = rng.randint(10, 60), rng.randint(10, 60)
+        block_rects.append(pygame.Rect(rng.randrange(SCREEN_WIDTH - width), rng.randrange(SCREEN_HEIGHT - height), width, height))
+    return sprites, block_rects
+
+
+def step_objects(sprites, block_rects):
+    for sprite in sprites:
+        sprite.update()
+        sprite.in_collision = sprite.rect.collidelist(block_rects) != -1
+
+
+def step_store(store, block_rects):
+    store.update(SCREEN_WIDTH, SCREEN_HEIGHT)
+    store.collide(block_rects)
+
+
+def same_state(sprites, store):
+    return (
+        [sprite.rect.x for sprite in sprites] == store.x.tolist()
+        and [sprite.rect.y for sprite in sprites] == store.y.tolist()
+        and [sprite.speed_x for sprite in sprites] == store.speed_x.tolist()
+        and [sprite.speed_y for sprite in sprites] == store.speed_y.tolist()
+        and [sprite.in_collision for sprite in sprites] == store.colliding.tolist()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=10, help="frames timed per entity count")
+    parser.add_argument("--blocks", type=int, default=10, help="number of static blocks")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.blocks} blocks, {args.steps} steps")
+    print(f"{'Entities':>9} {'objects ms/step':>16} {'numpy ms/step':>14} {'speed-up':>9} {'identical':>10}")
+    for count in ENTITY_COUNTS:
+        sprites, block_rects = make_scene(count, args.blocks, args.seed)
+        store = EntityStore.from_sprites(sprites)
+
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            step_objects(sprites, block_rects)
+        objects_ms = (time.perf_counter() - start) / args.steps * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            step_store(store, block_rects)
+        numpy_ms = (time.perf_counter() - start) / args.steps * 1000
+
+        identical = same_state(sprites, store)
+        print(f"{count:>9} {objects_ms:>16.3f} {numpy_ms:>14.3f} {objects_ms / numpy_ms:>8.1f}x {str(identical):>10}")
+        if not identical:
+            sys.exit("the NumPy store diverged from the per-object path")
+
+
+if __name__ == "__main__":
+    main()
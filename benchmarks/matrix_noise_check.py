@@ -0,0 +1,62 @@
+"""Check that the benchmark matrix flags nothing when nothing has changed.
+
+The matrix is run twice on the same tree, one right after the other, and
+the second run is compared with the first exactly as
+`game_launcher.py --matrix --baseline` would. The code is the same, so
+every regression or improvement it reports is a false alarm: the exit
+code is 1 if there is any, and the table shows how close the cases came
+to their noise floor. Run it after touching perf/matrix.py, or on a new
+benchmark machine before trusting its baselines.
+
+    python benchmarks/matrix_noise_check.py --game snake_game --game collision_demo
+"""
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from game_launcher import GameLauncher
+from perf.matrix import ENTITY_COUNTS, REPEATS, build_cases, compare_to_baseline, format_matrix_report, run_matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", action="append", help="only run this game (can be repeated)")
+    parser.add_argument("--entities", type=int, action="append",
+                        help="entity count for the games that take one (can be repeated)")
+    parser.add_argument("--frames", type=int, default=300, help="frames per run")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="runs of every case in each matrix")
+    parser.add_argument("--timeout", type=int, default=120, help="seconds before a run is abandoned")
+    args = parser.parse_args()
+
+    # find_matching_games looks in the current directory
+    os.chdir(ROOT_DIR)
+    games = GameLauncher.find_matching_games()
+    if args.game:
+        games = [game for game in games if game[1] in args.game]
+    cases = build_cases(games, entity_counts=args.entities or ENTITY_COUNTS)
+
+    matrices = []
+    for attempt in ("first", "second"):
+        print(f"Running the {attempt} matrix...", flush=True)
+        matrices.append(run_matrix(cases, args.frames, args.repeats, args.timeout, progress=print))
+    first, second = matrices
+    compare_to_baseline(second, first)
+    print(format_matrix_report(second))
+
+    errors = [result for result in first["results"] + second["results"] if result.get("error")]
+    flagged = [result for result in second["results"]
+               if result.get("comparison") and result["comparison"]["verdict"] in ("regression", "improvement")]
+    if errors:
+        print(f"{len(errors)} failed case(s); the check is incomplete")
+    if flagged:
+        print(f"{len(flagged)} false alarm(s) between two runs of the same code")
+    else:
+        print("No false alarms between two runs of the same code")
+    return 1 if flagged or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Game steps per second of the batched snake environment.
+
+shared.snake_batch.SnakeBatch steps K games with random moves, once with
+the walls of the Pygame version and once wrapping around like the Arcade
+version, and the table shows the game steps per second for each K.
+
+Before timing, a few games are played move by move next to the game
+rules written out with shared.snake_body.SnakeBody (the food is put where
+the batch put it). Every score, game over and snake body must match.
+
+    python benchmarks/snake_batch_bench.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from shared.snake_batch import OFFSETS, SnakeBatch
+from shared.snake_body import SnakeBody
+
+GAME_COUNTS = (1, 64, 1_024, 16_384)
+GRID_WIDTH = 40
+GRID_HEIGHT = 30
+
+
+class ReferenceGame:
+    """One game with the move rules of snake_game.py, using SnakeBody"""
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.body = SnakeBody(batch.width, batch.height, (batch.width // 2, batch.height // 2))
+        self.direction = 1
+        self.score = 0
+        self.over = False
+
+    def step(self, action, food):
+        """One move; `food` is the food cell (y * width + x) the batch had before it"""
+        if action != (self.direction + 2) % 4:
+            self.direction = action
+        dx, dy = OFFSETS[self.direction]
+        head_x, head_y = self.body.head
+        new_head = (head_x + int(dx), head_y + int(dy))
+        if self.batch.wrap:
+            # Arcade: wrap, move, then check the head against the body
+            self.body.push_head(self.body.wrap(new_head))
+            if self.body.hits_itself():
+                self.over = True
+                return
+        else:
+            # Pygame: the walls and the body end the game before moving
+            if not self.body.in_bounds(new_head) or new_head in self.body:
+                self.over = True
+                return
+            self.body.push_head(new_head)
+
+        x, y = self.body.head
+        if y * self.batch.width + x == food:
+            self.score += 1
+            if self.body.is_full():
+                self.over = True
+        else:
+            self.body.pop_tail()
+
+
+def check_rules(wrap, games, steps, seed):
+    """Play `games` games next to ReferenceGame; returns the first mismatch or None"""
+    batch = SnakeBatch(games, GRID_WIDTH, GRID_HEIGHT, wrap=wrap, reset_on_death=False, seed=seed)
+    references = [ReferenceGame(batch) for _ in range(games)]
+    rng = np.random.default_rng(seed)
+    for step in range(steps):
+        # Mostly straight on, so the snakes live long enough to eat
+        actions = np.where(rng.random(games) < 0.2, rng.integers(0, 4, games), batch.direction)
+        food = batch.food.copy()
+        _, done = batch.step(actions)
+        for game, reference in enumerate(references):
+            if reference.over:
+                continue
+            reference.step(int(actions[game]), int(food[game]))
+            if (reference.score, reference.over) != (int(batch.score[game]), bool(done[game])):
+                return f"game {game}, step {step}: score or game over differ"
+            # The Arcade game moves the head into the body before ending, so
+            # the snake itself is only compared while the game goes on
+            if reference.over:
+                continue
+            if reference.body.head != (int(batch.head_x[game]), int(batch.head_y[game])):
+                return f"game {game}, step {step}: heads differ"
+            body = np.zeros((batch.height, batch.width), dtype=bool)
+            for x, y in reference.body:
+                body[y, x] = True
+            if not np.array_equal(body, batch.occupancy()[game]):
+                return f"game {game}, step {step}: bodies differ"
+    return None
+
+
+def steps_per_second(count, wrap, steps, seed):
+    batch = SnakeBatch(count, GRID_WIDTH, GRID_HEIGHT, wrap=wrap, seed=seed)
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 4, (steps, count), dtype=np.int32)
+    start = time.perf_counter()
+    for step in range(steps):
+        batch.step(actions[step])
+    return count * steps / (time.perf_counter() - start), batch.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=200, help="steps timed per game count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for wrap in (False, True):
+        mismatch = check_rules(wrap, games=32, steps=500, seed=args.seed)
+        if mismatch:
+            sys.exit(f"batch and game rules differ ({'wrap' if wrap else 'walls'}): {mismatch}")
+    print("Rules match snake_game.py (walls and wrap-around)")
+
+    print(f"{GRID_WIDTH}x{GRID_HEIGHT} grid, random moves, {args.steps} steps")
+    print(f"{'Games':>7} {'walls steps/s':>14} {'wrap steps/s':>14} {'episodes':>9}")
+    for count in GAME_COUNTS:
+        walls, walls_stats = steps_per_second(count, False, args.steps, args.seed)
+        wrap, _ = steps_per_second(count, True, args.steps, args.seed)
+        print(f"{count:>7} {walls:>14,.0f} {wrap:>14,.0f} {walls_stats['episodes']:>9}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Step cost of the snake body as it grows, list vs. SnakeBody.
+
+The snake follows a serpentine path over a 1000x1000 grid, so it can grow
+to cover almost the whole board without running into itself. For each
+length we time a batch of move steps (new head + tail removal + self
+collision check), done once the way the games used to (a plain list) and
+once with shared.snake_body.SnakeBody.
+
+    python benchmarks/snake_body_bench.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.snake_body import SnakeBody
+
+GRID = 1000
+LENGTHS = (10, 1_000, 100_000, 990_000)
+# The list version is O(length) per step; past this it takes minutes
+LIST_MAX_LENGTH = 100_000
+
+
+def serpentine(index):
+    """Cell number `index` on a path that sweeps the grid row by row"""
+    y, x = divmod(index, GRID)
+    return (x if y % 2 == 0 else GRID - 1 - x), y
+
+
+def bench_list(length, steps):
+    body = [serpentine(i) for i in range(length - 1, -1, -1)]
+    start = time.perf_counter()
+    for i in range(length, length + steps):
+        new_head = serpentine(i)
+        if new_head in body:
+            raise AssertionError("snake ran into itself")
+        body.insert(0, new_head)
+        body.pop()
+    return (time.perf_counter() - start) / steps
+
+
+def bench_snake_body(length, steps):
+    body = SnakeBody(GRID, GRID, serpentine(0))
+    for i in range(1, length):
+        body.push_head(serpentine(i))
+    start = time.perf_counter()
+    for i in range(length, length + steps):
+        new_head = serpentine(i)
+        if new_head in body:
+            raise AssertionError("snake ran into itself")
+        body.push_head(new_head)
+        body.pop_tail()
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=2000, help="steps timed per length")
+    args = parser.parse_args()
+
+    print(f"{'Length':>9} {'list us/step':>14} {'SnakeBody us/step':>18}")
+    for length in LENGTHS:
+        steps = min(args.steps, GRID * GRID - length)
+        list_cost = f"{bench_list(length, steps) * 1e6:>14.2f}" if length <= LIST_MAX_LENGTH else f"{'-':>14}"
+        body_cost = bench_snake_body(length, steps) * 1e6
+        print(f"{length:>9} {list_cost} {body_cost:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
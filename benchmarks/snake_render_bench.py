@@ -0,0 +1,80 @@
+"""Per-tick render cost of the Pygame snake, full redraw vs. incremental.
+
+A snake of the given length moves along a serpentine path over a 400x400
+grid (4 px cells) on an offscreen SDL display. Each tick is timed
+including presenting the frame: flip() for the full redraw,
+update(rects) for the incremental renderer.
+
+    python benchmarks/snake_render_bench.py
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "pygame_version"))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import snake_game
+from shared.snake_body import SnakeBody
+
+GRID = 400
+CELL = 4
+LENGTHS = (10, 1_000, 100_000)
+
+
+def serpentine(index):
+    y, x = divmod(index, GRID)
+    return (x if y % 2 == 0 else GRID - 1 - x), y
+
+
+def build_snake(length):
+    body = SnakeBody(GRID, GRID, serpentine(0))
+    for i in range(1, length):
+        body.push_head(serpentine(i))
+    return body
+
+
+def bench(screen, length, ticks, incremental):
+    body = build_snake(length)
+    renderer = snake_game.IncrementalRenderer(screen, CELL)
+    food = serpentine(length + ticks + 1)
+
+    # The first incremental tick is a full redraw; keep it out of the timing
+    renderer.draw(body, food, 0)
+
+    start = time.perf_counter()
+    for i in range(length, length + ticks):
+        body.push_head(serpentine(i))
+        freed_tail = body.pop_tail()
+        if incremental:
+            pygame.display.update(renderer.draw(body, food, length, freed_tail))
+        else:
+            snake_game.draw_full(screen, body, food, length, CELL)
+            pygame.display.flip()
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=50, help="ticks timed per length and mode")
+    args = parser.parse_args()
+
+    screen = pygame.display.set_mode((GRID * CELL, GRID * CELL))
+
+    print(f"{'Length':>8} {'full ms/tick':>13} {'incremental ms/tick':>20}")
+    for length in LENGTHS:
+        full = bench(screen, length, args.ticks, incremental=False)
+        incremental = bench(screen, length, args.ticks, incremental=True)
+        print(f"{length:>8} {full * 1000:>13.3f} {incremental * 1000:>20.3f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Construction time and memory of many Pygame AnimatedSprites.
+
+Creates 1, 1k and 100k sprites of pygame_version/sprite_animation.py,
+whose frames come from shared.frame_cache, and the same number of
+sprites the way they used to be built, each drawing its own eight frames.
+Pixel memory is the size of all distinct frame surfaces; Python memory
+is what tracemalloc sees of the sprite objects themselves.
+
+Per-sprite frames take 128 KiB a sprite, so past PER_SPRITE_MAX sprites
+that variant is only estimated from the largest measured run.
+
+    python benchmarks/sprite_frames_bench.py
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "pygame_version"))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import sprite_animation
+from shared.frame_cache import frame_cache
+
+SPRITE_COUNTS = (1, 1_000, 100_000)
+# 10k sprites with their own frames would already take 1.3 GB
+PER_SPRITE_MAX = 1_000
+
+
+class PerSpriteFramesSprite:
+    """AnimatedSprite as it was before the frame cache: every sprite draws its own frames"""
+
+    def __init__(self, x, y, speed):
+        self.x = x
+        self.y = y
+        self.speed = speed
+        self.previous_x = x
+        self.current_frame = 0
+        self.frame_count = 0
+        self.frames = sprite_animation.build_frames(
+            sprite_animation.SPRITE_WIDTH, sprite_animation.SPRITE_HEIGHT, sprite_animation.PALETTE
+        )
+
+
+def pixel_bytes(sprites):
+    """Bytes of pixel data in all distinct frame surfaces the sprites refer to"""
+    surfaces = {id(frame): frame for sprite in sprites for frame in sprite.frames}
+    return sum(frame.get_pitch() * frame.get_height() for frame in surfaces.values())
+
+
+def measure(sprite_class, count):
+    """(seconds to create, pixel bytes, Python bytes) for `count` sprites"""
+    # Timed without tracemalloc, which slows every allocation down
+    frame_cache.clear()
+    gc.collect()
+    start = time.perf_counter()
+    sprites = [sprite_class(index % 800, 100, 2) for index in range(count)]
+    elapsed = time.perf_counter() - start
+    del sprites
+
+    frame_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    sprites = [sprite_class(index % 800, 100, 2) for index in range(count)]
+    python_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, pixel_bytes(sprites), python_bytes
+
+
+def megabytes(value):
+    return f"{value / 1e6:.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    print(f"{'Sprites':>8} {'variant':>11} {'create ms':>10} {'pixel MB':>10} {'Python MB':>10}")
+    per_sprite_rate = None
+    for count in SPRITE_COUNTS:
+        for name, sprite_class in (("per-sprite", PerSpriteFramesSprite), ("shared", sprite_animation.AnimatedSprite)):
+            if sprite_class is PerSpriteFramesSprite and count > PER_SPRITE_MAX:
+                # Scale the largest measured run instead of allocating gigabytes
+                seconds, pixels, python = (value * count for value in per_sprite_rate)
+                print(f"{count:>8} {name:>11} {seconds * 1000:>9.0f}~ {megabytes(pixels):>9}~ {megabytes(python):>9}~")
+                continue
+            seconds, pixels, python = measure(sprite_class, count)
+            if sprite_class is PerSpriteFramesSprite:
+                per_sprite_rate = (seconds / count, pixels / count, python / count)
+            print(f"{count:>8} {name:>11} {seconds * 1000:>10.2f} {megabytes(pixels):>10} {megabytes(python):>10}",
+                  flush=True)
+    print("~ estimated from the largest measured per-sprite run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Sprite count at which each library's sprite animation drops below 60 FPS.
+
+Both sprite_animation.py versions are run headless through the benchmark
+harness with more and more animated sprites (`--sprites N`): the Pygame
+version draws them with one Surface.blits call per frame, the Arcade
+version with one SpriteList draw. The table shows the median frame time
+and the FPS it allows for each count; the median keeps a slow first frame
+(texture upload, font loading) from deciding the result.
+
+Between the last count that makes 60 FPS and the first that doesn't, the
+threshold is narrowed down by bisection. The thresholds are printed at the
+end and, with --json, written to a file together with every run.
+
+    python benchmarks/sprite_stress_bench.py
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perf.bench import run_benchmark
+from perf.harness import LIBRARIES
+
+SPRITE_COUNTS = (1, 10, 100, 1_000, 2_000, 5_000, 10_000, 20_000, 50_000)
+TARGET_FPS = 60
+
+
+def measure(library, sprites, frames, timeout):
+    """Median frame time in ms of `sprites` animated sprites, or None if the run failed"""
+    result = run_benchmark(library, "sprite_animation", frames, timeout, game_args=["--sprites", str(sprites)])
+    if result.get("error"):
+        return None
+    return result["stats"]["p50_ms"]
+
+
+def fast_enough(frame_ms):
+    return frame_ms is not None and frame_ms <= 1000 / TARGET_FPS
+
+
+def find_threshold(library, runs, frames, timeout, bisect_steps):
+    """Largest sprite count measured to make TARGET_FPS, narrowed down between the ramp's counts"""
+    passing = [sprites for sprites, frame_ms in runs.items() if fast_enough(frame_ms)]
+    failing = [sprites for sprites, frame_ms in runs.items() if not fast_enough(frame_ms)]
+    if not passing:
+        return None
+    low = max(passing)
+    high = min((sprites for sprites in failing if sprites > low), default=None)
+    if high is None:
+        # Fast enough all the way up
+        return low
+    for _ in range(bisect_steps):
+        middle = (low + high) // 2
+        if middle in (low, high):
+            break
+        runs[middle] = measure(library, middle, frames, timeout)
+        if fast_enough(runs[middle]):
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def format_run(frame_ms):
+    if frame_ms is None:
+        return "failed"
+    return f"{frame_ms:.2f} ms {1000 / frame_ms:.0f} fps" if frame_ms > 0 else "0 ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=120, help="frames run per measurement")
+    parser.add_argument("--timeout", type=int, default=300, help="seconds before a run is abandoned")
+    parser.add_argument("--bisect-steps", type=int, default=5,
+                        help="extra runs spent narrowing down each threshold")
+    parser.add_argument("--json", help="write the thresholds and every run to this file")
+    args = parser.parse_args()
+
+    print(f"{args.frames} frames per run; median frame time")
+    print(f"{'Sprites':>8} " + " ".join(f"{library:>22}" for library in LIBRARIES))
+    runs = {library: {} for library in LIBRARIES}
+    for sprites in SPRITE_COUNTS:
+        cells = []
+        for library in LIBRARIES:
+            runs[library][sprites] = measure(library, sprites, args.frames, args.timeout)
+            cells.append(format_run(runs[library][sprites]))
+        print(f"{sprites:>8} " + " ".join(f"{cell:>22}" for cell in cells), flush=True)
+
+    thresholds = {}
+    for library in LIBRARIES:
+        thresholds[library] = find_threshold(library, runs[library], args.frames, args.timeout, args.bisect_steps)
+        if thresholds[library] is None:
+            print(f"{library}: below {TARGET_FPS} FPS even with 1 sprite")
+        elif thresholds[library] == max(runs[library]):
+            print(f"{library}: {TARGET_FPS} FPS with all {thresholds[library]} sprites")
+        else:
+            print(f"{library}: {TARGET_FPS} FPS up to {thresholds[library]} sprites", flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "target_fps": TARGET_FPS,
+                "frames": args.frames,
+                "thresholds": thresholds,
+                "runs": {library: {str(sprites): frame_ms for sprites, frame_ms in sorted(library_runs.items())}
+                         for library, library_runs in runs.items()},
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
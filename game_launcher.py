@@ -1,16 +1,37 @@
+import argparse
+import json
 import os
+import queue
 import tkinter as tk
 from tkinter import messagebox
-import subprocess
 import sys
-import time
 import threading
 
+from perf.procstat import format_resource_report
+from perf.supervisor import ProcessSupervisor
+
 class GameLauncher:
-    def __init__(self, root):
+    def __init__(self, root, sample_interval=0.1, fast_start=False, zygote=None, profile_frames=300,
+                 profile_dir="profiles", max_running=4, run_timeout=None, restarts=0):
         self.root = root
+        self.sample_interval = sample_interval
+        self.fast_start = fast_start
+        self.zygote = zygote
+        self.profile_frames = profile_frames
+        self.profile_dir = profile_dir
+        self.run_timeout = run_timeout
+        self.restarts = restarts
+        self.resource_summaries = []
+        self.closing = False
+        # Reports of the profiles run in the background, shown from the Tk thread
+        self.profile_reports = queue.Queue()
+        self.profile_buttons = {}
+        
+        # Every game process is started, watched and stopped by the supervisor
+        self.supervisor = ProcessSupervisor(max_running, sample_interval, zygote)
+        
         self.root.title("Pygame vs Arcade - Game Launcher")
-        self.root.geometry("500x400")
+        self.root.geometry("500x460")
         self.root.resizable(False, False)
         
         # Configure colors and fonts
@@ -41,11 +62,13 @@ class GameLauncher:
         self.selection_frame = tk.Frame(root, bg=self.bg_color)
         self.selection_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        # Create buttons for each game
+        # Create buttons for each game, with a Profile button next to it
         for game in self.games:
             formatted_name, filename = game
+            row = tk.Frame(self.selection_frame, bg=self.bg_color)
+            row.pack(pady=5)
             button = tk.Button(
-                self.selection_frame,
+                row,
                 text=formatted_name,
                 font=self.button_font,
                 bg=self.button_color,
@@ -53,11 +76,26 @@ class GameLauncher:
                 activebackground=self.highlight_color,
                 activeforeground=self.fg_color,
                 relief=tk.FLAT,
-                width=30,
+                width=26,
                 height=2,
                 command=lambda g=game: self.launch_game(g)
             )
-            button.pack(pady=5)
+            button.pack(side=tk.LEFT)
+            profile_button = tk.Button(
+                row,
+                text="Profile",
+                font=self.button_font,
+                bg=self.button_color,
+                fg=self.fg_color,
+                activebackground=self.highlight_color,
+                activeforeground=self.fg_color,
+                relief=tk.FLAT,
+                width=8,
+                height=2,
+                command=lambda g=game: self.profile_game(g)
+            )
+            profile_button.pack(side=tk.LEFT, padx=(5, 0))
+            self.profile_buttons[filename] = profile_button
         
         # Information label
         self.info_label = tk.Label(
@@ -68,8 +106,27 @@ class GameLauncher:
             fg=self.fg_color
         )
         self.info_label.pack(pady=10)
+        
+        # Stops every running or queued game
+        self.stop_button = tk.Button(
+            root,
+            text="Stop All",
+            font=self.button_font,
+            bg=self.button_color,
+            fg=self.fg_color,
+            activebackground=self.highlight_color,
+            activeforeground=self.fg_color,
+            relief=tk.FLAT,
+            width=10,
+            command=self.supervisor.cancel_all
+        )
+        self.stop_button.pack()
+        
+        # Pick up what the supervisor reports without blocking the mainloop
+        self.root.after(100, self.poll_supervisor)
     
-    def find_matching_games(self):
+    @staticmethod
+    def find_matching_games():
         """Find all Python files that exist in both pygame_version and arcade_version folders"""
         pygame_files = []
         arcade_files = []
@@ -100,48 +157,294 @@ class GameLauncher:
         self.root.update()
         
         try:
-            # Create threads for running each version
-            pygame_thread = threading.Thread(
-                target=self.run_game,
-                args=("pygame_version", filename)
-            )
-            
-            arcade_thread = threading.Thread(
-                target=self.run_game,
-                args=("arcade_version", filename)
-            )
-            
-            # Start both threads
-            pygame_thread.start()
-            arcade_thread.start()
+            # Hand each version to the supervisor, unless it is already running
+            started = [self.run_game(directory, filename) for directory in ("pygame_version", "arcade_version")]
             
             # Update info label
-            self.info_label.config(text=f"Running {display_name} - Close game windows to return")
+            if any(started):
+                self.info_label.config(text=f"Running {display_name} - Close game windows to return")
+            else:
+                self.info_label.config(text=f"{display_name} is already running")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to launch {display_name}: {str(e)}")
             self.info_label.config(text="Select a game to launch both Pygame and Arcade versions")
     
-    def run_game(self, directory, filename):
-        """Run a specific game file in a separate process"""
-        try:
-            # Get the path to the game file
-            game_path = os.path.join(directory, f"{filename}.py")
-            
-            # Use the current Python interpreter to run the game
-            subprocess.run([sys.executable, game_path], check=True)
+    def profile_game(self, game):
+        """Profile both versions of the selected game headless and show their hottest functions"""
+        display_name, filename = game
+        # One profile per game at a time; the button comes back when the report is in
+        self.profile_buttons[filename].config(state=tk.DISABLED)
+        self.info_label.config(text=f"Profiling {display_name} ({self.profile_frames} frames)...")
+        
+        def work():
+            from perf.profiling import format_game_profiles, profile_game
             
-        except subprocess.CalledProcessError:
-            # Game was closed or crashed
-            pass
-        except Exception as e:
-            # Other error occurred
-            print(f"Error running {filename} in {directory}: {str(e)}")
+            try:
+                results = profile_game(filename, self.profile_frames, self.profile_dir, progress=print)
+                report = format_game_profiles(filename, results, self.profile_dir)
+            except Exception as e:
+                report = f"{filename}: profiling failed: {type(e).__name__}: {e}"
+            print(report)
+            # Tk may only be touched from the main thread, which picks this up in poll_supervisor()
+            self.profile_reports.put((game, report))
+        
+        threading.Thread(target=work, daemon=True).start()
+    
+    def handle_profiles(self):
+        """Show the reports of the profiles that finished"""
+        while True:
+            try:
+                game, report = self.profile_reports.get_nowait()
+            except queue.Empty:
+                return
+            display_name, filename = game
+            self.profile_buttons[filename].config(state=tk.NORMAL)
+            if not self.closing:
+                self.show_profile(display_name, report)
+    
+    def show_profile(self, display_name, report):
+        """Open a window with the side-by-side profile of a game"""
+        self.info_label.config(text="Select a game to launch both Pygame and Arcade versions")
+        window = tk.Toplevel(self.root)
+        window.title(f"Profile - {display_name}")
+        text = tk.Text(window, font=("Courier", 9), wrap=tk.NONE, width=150, height=40,
+                       bg=self.bg_color, fg=self.fg_color)
+        text.insert(tk.END, report)
+        text.config(state=tk.DISABLED)
+        text.pack(fill=tk.BOTH, expand=True)
+    
+    def run_game(self, directory, filename):
+        """Queue a specific game file with the supervisor; False if it is running already"""
+        name = f"{directory}/{filename}"
+        if self.supervisor.active(name):
+            return False
+        
+        # Get the path to the game file
+        game_path = os.path.join(directory, f"{filename}.py")
+        command = [sys.executable, game_path]
+        
+        # Fast-start skips the subsystems the games never use (audio, joystick)
+        if self.fast_start:
+            command = [sys.executable, "-m", "perf.harness", directory, filename, "--fast-start"]
+        
+        # With a zygote pool the game runs in an already warmed-up worker
+        zygote_argv = None
+        if self.zygote is not None:
+            zygote_argv = [directory, filename] + (["--fast-start"] if self.fast_start else [])
+        
+        self.supervisor.submit(name, command, self.run_timeout, self.restarts, zygote_argv=zygote_argv)
+        return True
+    
+    def poll_supervisor(self):
+        """Handle the supervisor's events and finished profiles, then check again in a moment"""
+        self.handle_events()
+        self.handle_profiles()
+        running = self.supervisor.active()
+        if running:
+            self.info_label.config(text=" | ".join(job.describe() for job in running))
+        self.root.after(100, self.poll_supervisor)
+    
+    def handle_events(self):
+        """Print the games' output and the resource summary of every game that ended"""
+        while True:
+            try:
+                event = self.supervisor.events.get_nowait()
+            except queue.Empty:
+                return
+            kind, job = event[:2]
+            if kind == "output":
+                stream, line = event[2:]
+                print(f"[{job.name}] {line}", file=sys.stderr if stream == "stderr" else sys.stdout)
+            elif kind == "restarting":
+                print(f"{job.name} crashed, restarting ({job.restarts}/{job.max_restarts})")
+            elif kind == "exit":
+                print(job.describe())
+                if job.resources is not None:
+                    directory, filename = job.name.split("/")
+                    self.resource_summaries.append((filename, directory, job.resources))
+                    print(format_resource_report([(filename, directory, job.resources)]))
+                if not self.supervisor.active() and not self.closing:
+                    self.info_label.config(text=job.describe())
+    
+    def close(self):
+        """Wait for the games still open, then collect what they reported"""
+        self.closing = True
+        self.supervisor.shutdown(wait=True)
+        self.handle_events()
+
+def run_bench(args):
+    """Benchmark every game pair headless and print a report"""
+    from perf.bench import format_report, run_benchmarks
+
+    games = GameLauncher.find_matching_games()
+    if args.game:
+        games = [game for game in games if game[1] in args.game]
+
+    # A replayed session runs to its end unless --frames says otherwise
+    frames = args.frames if args.frames is not None else (0 if args.replay else 300)
+    results = run_benchmarks(games, frames, timeout=args.timeout,
+                             sample_interval=args.sample_interval, fast_start=args.fast_start,
+                             progress=print, replay=args.replay)
+    print(format_report(results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    # Non-zero exit so CI notices a game that crashed
+    return 1 if any(result["status"] == "error" for result in results) else 0
+
+def run_profile(args):
+    """Profile both versions of every game pair and print their hottest functions side by side"""
+    from perf.profiling import format_game_profiles, profile_game
+
+    games = GameLauncher.find_matching_games()
+    if args.game:
+        games = [game for game in games if game[1] in args.game]
+
+    # A replayed session runs to its end unless --frames says otherwise
+    frames = args.frames if args.frames is not None else (0 if args.replay else 300)
+    failed = False
+    for display_name, filename in games:
+        results = profile_game(filename, frames, args.profile_dir, timeout=args.timeout, replay=args.replay,
+                               progress=print)
+        print(format_game_profiles(filename, results, args.profile_dir))
+        failed = failed or any(result["status"] == "error" for result in results.values())
+
+    return 1 if failed else 0
+
+def run_matrix(args):
+    """Benchmark every game, library and entity count, write the reports and check them against a baseline"""
+    from perf.matrix import ENTITY_COUNTS, REPEATS, build_cases, compare_to_baseline, format_matrix_report, write_reports
+    from perf.matrix import run_matrix as run_cases
+
+    games = GameLauncher.find_matching_games()
+    if args.game:
+        games = [game for game in games if game[1] in args.game]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    frames = args.frames if args.frames is not None else (0 if args.replay else 300)
+    cases = build_cases(games, entity_counts=args.entities or ENTITY_COUNTS)
+    matrix = run_cases(cases, frames, args.repeats or REPEATS, timeout=args.timeout, replay=args.replay, progress=print)
+    regressions = compare_to_baseline(matrix, baseline) if baseline else []
+    write_reports(matrix, args.report_dir, baseline)
+    print(format_matrix_report(matrix))
+    print(f"Reports written to {args.report_dir}")
+
+    # Non-zero exit so CI notices a crash or a regression
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        return 1
+    return 1 if any(result["status"] == "error" for result in matrix["results"]) else 0
+
+def run_startup(args):
+    """Print a start-up time breakdown for every game pair"""
+    from perf.startup import format_startup_report, profile_all
+
+    games = GameLauncher.find_matching_games()
+    if args.game:
+        games = [game for game in games if game[1] in args.game]
+
+    pool = None
+    if args.zygote:
+        from perf.zygote import ZygotePool
+        pool = ZygotePool(args.zygote, headless=not args.windowed, fast_start=args.fast_start)
+
+    try:
+        results = profile_all(games, args.fast_start, headless=not args.windowed, pool=pool, progress=print)
+    finally:
+        if pool is not None:
+            pool.close()
+    print(format_startup_report(results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 1 if any(result["status"] == "error" for result in results) else 0
 
 def main():
+    parser = argparse.ArgumentParser(description="Pygame vs Arcade game launcher")
+    parser.add_argument("--bench", action="store_true", help="run every game pair headless and report frame times")
+    parser.add_argument("--startup", action="store_true", help="break down the start-up time of every game pair")
+    parser.add_argument("--profile", action="store_true",
+                        help="run every game pair headless under cProfile and compare their hottest functions")
+    parser.add_argument("--matrix", action="store_true",
+                        help="benchmark every game, library and entity count and write JSON, CSV and HTML reports")
+    parser.add_argument("--report-dir", default="reports", help="where --matrix writes its reports")
+    parser.add_argument("--baseline", metavar="MATRIX_JSON",
+                        help="in --matrix mode, flag significant regressions against this earlier matrix.json")
+    parser.add_argument("--entities", type=int, action="append",
+                        help="entity count for the games that take one in --matrix mode (can be repeated)")
+    parser.add_argument("--repeats", type=int,
+                        help="fresh-process runs of every case in --matrix mode; a baseline comparison needs "
+                             "at least 4 on both sides (default 5)")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="where --profile and the Profile buttons save the .prof files")
+    parser.add_argument("--fast-start", action="store_true",
+                        help="only initialize the subsystems the games use (no audio or joystick)")
+    parser.add_argument("--max-running", type=int, default=4,
+                        help="games the launcher runs at once; more wait in a queue")
+    parser.add_argument("--run-timeout", type=float,
+                        help="seconds before a game started from the launcher is stopped")
+    parser.add_argument("--restarts", type=int, default=0,
+                        help="times a game started from the launcher is restarted after a crash")
+    parser.add_argument("--zygote", type=int, default=0, metavar="N",
+                        help="launch games from a pool of N pre-warmed workers (GUI and --startup)")
+    parser.add_argument("--windowed", action="store_true", help="open real windows in --startup mode")
+    parser.add_argument("--frames", type=int, help="frames to run per game in --bench/--profile/--matrix mode (default 300)")
+    parser.add_argument("--replay", metavar="LOG",
+                        help="in --bench/--profile/--matrix mode, play this recorded input session in every game "
+                             "(see perf/input_log.py)")
+    parser.add_argument("--game", action="append",
+                        help="only run this game in --bench/--profile/--matrix/--startup (can be repeated)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds before a benchmarked game is killed")
+    parser.add_argument("--json", help="also write the raw benchmark results to this file")
+    parser.add_argument("--sample-interval", type=float, default=0.1,
+                        help="seconds between /proc resource samples of each game")
+    args = parser.parse_args()
+
+    # Game folders are looked up relative to the launcher, input logs relative to where we were started
+    if args.replay:
+        args.replay = os.path.abspath(args.replay)
+    if args.baseline:
+        args.baseline = os.path.abspath(args.baseline)
+    args.profile_dir = os.path.abspath(args.profile_dir)
+    args.report_dir = os.path.abspath(args.report_dir)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    if args.bench:
+        sys.exit(run_bench(args))
+    if args.profile:
+        sys.exit(run_profile(args))
+    if args.matrix:
+        sys.exit(run_matrix(args))
+    if args.startup:
+        sys.exit(run_startup(args))
+
+    zygote = None
+    if args.zygote:
+        from perf.zygote import ZygotePool
+        zygote = ZygotePool(args.zygote, fast_start=args.fast_start)
+
     root = tk.Tk()
-    app = GameLauncher(root)
+    app = GameLauncher(root, args.sample_interval, args.fast_start, zygote,
+                       args.frames if args.frames is not None else 300, args.profile_dir,
+                       args.max_running, args.run_timeout, args.restarts)
     root.mainloop()
+    app.close()
+    
+    if zygote is not None:
+        zygote.close()
+    
+    # Per-game, per-library resource summary of everything launched
+    if app.resource_summaries:
+        print(format_resource_report(app.resource_summaries))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""Measurement tools used by the game launcher.
+
+Nothing in here is imported by the games themselves. The launcher starts
+each game through ``perf.harness`` in a child process and collects the
+results with the helpers in this package.
+"""
@@ -0,0 +1,110 @@
+"""Headless benchmark of every Pygame/Arcade game pair"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from perf.harness import LIBRARIES, ROOT_DIR
+from perf.procstat import format_resource_report, summarize, supervise
+from perf.stats import summarize_frame_times
+
+
+def run_benchmark(library, game, frames, timeout=120, sample_interval=0.1, fast_start=False, game_args=(),
+                  replay=None, profile=None, capture=None, capture_format="raw", capture_sync=False):
+    """Run one game headless for `frames` frames in a fresh interpreter; `game_args` go to the game
+
+    With `replay`, the game plays that recorded input session (frames=0: all of it).
+    With `profile`, it runs under cProfile and the stats are saved to that file.
+    With `capture`, every presented frame is saved to that directory (see perf/capture.py).
+    """
+    fd, output_path = tempfile.mkstemp(prefix=f"{library}_{game}_", suffix=".json")
+    os.close(fd)
+
+    command = [
+        sys.executable, "-m", "perf.harness", library, game,
+        "--frames", str(frames), "--headless", "--uncapped",
+        "--output", output_path,
+    ]
+    if fast_start:
+        command.append("--fast-start")
+    if replay:
+        command += ["--replay", os.path.abspath(replay)]
+    if profile:
+        command += ["--profile", os.path.abspath(profile)]
+    if capture:
+        command += ["--capture", os.path.abspath(capture), "--capture-format", capture_format]
+        if capture_sync:
+            command.append("--capture-sync")
+    if game_args:
+        command += ["--", *game_args]
+
+    resources = summarize([])
+    returncode = None
+    with tempfile.TemporaryFile(mode="w+") as stderr:
+        try:
+            returncode, resources = supervise(command, sample_interval, timeout,
+                                              cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=stderr)
+            with open(output_path) as f:
+                result = json.load(f)
+        except subprocess.TimeoutExpired:
+            result = failed_result(library, game, f"timed out after {timeout}s")
+        except (OSError, ValueError):
+            # The child died before it could write anything
+            stderr.seek(0)
+            lines = stderr.read().strip().splitlines()
+            result = failed_result(library, game, lines[-1] if lines else f"exit code {returncode}")
+        finally:
+            os.remove(output_path)
+
+    result["wall_time"] = resources["wall_time"]
+    result["resources"] = resources
+    result["stats"] = summarize_frame_times(result["frame_times"])
+    return result
+
+
+def failed_result(library, game, error):
+    return {
+        "library": library,
+        "game": game,
+        "status": "error",
+        "error": error,
+        "frame_times": [],
+        "loop_time": 0.0,
+    }
+
+
+def run_benchmarks(games, frames, libraries=LIBRARIES, timeout=120, sample_interval=0.1,
+                   fast_start=False, progress=None, replay=None):
+    """Benchmark each (display_name, filename) pair from find_matching_games"""
+    results = []
+    for display_name, filename in games:
+        for library in libraries:
+            if progress:
+                progress(f"Benchmarking {display_name} ({library})...")
+            results.append(run_benchmark(library, filename, frames, timeout, sample_interval, fast_start,
+                                         replay=replay))
+    return results
+
+
+def format_report(results):
+    """Render benchmark results as a plain text table"""
+    header = f"{'Game':<20} {'Library':<15} {'Frames':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'FPS':>9} {'Wall s':>7}  Status"
+    lines = [header, "-" * len(header)]
+
+    for result in results:
+        stats = result["stats"]
+        status = result["status"] if not result.get("error") else f"{result['status']}: {result['error']}"
+        lines.append(
+            f"{result['game']:<20} {result['library']:<15} {stats['frames']:>7} "
+            f"{stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f} "
+            f"{stats['fps']:>9.1f} {result['wall_time']:>7.2f}  {status}"
+        )
+
+    # Resource usage sampled from /proc while each game ran
+    lines.append("")
+    lines.append(format_resource_report(
+        [(result["game"], result["library"], result["resources"]) for result in results]
+    ))
+
+    return "\n".join(lines)
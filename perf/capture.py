@@ -0,0 +1,313 @@
+"""Frame capture that doesn't stall the game loop.
+
+Saving a screenshot of every frame from inside the loop costs as much as
+the frame itself: the pixels have to be converted, compressed and written
+before the game may go on. Here the game thread only copies the presented
+frame into a free buffer from a fixed pool and hands it to a writer
+thread, which converts, compresses and writes it while the game goes on
+with the next frames. When the writer falls behind and no buffer is free,
+the frame is dropped and counted instead of waiting for one.
+
+How the pixels are taken depends on the library:
+
+- PygameGrabber copies the display surface through a pygame.surfarray
+  view of its pixels, a single memcpy for the usual 32-bit display;
+  converting to RGB is left to the writer
+- ArcadeGrabber has glReadPixels write into one of two pixel buffer
+  objects and maps the other one, filled a frame earlier, so the game
+  never waits for the GPU to finish a frame just to read it back
+
+The harness captures with --capture DIR. The raw format is a single
+stream of RGB frames, e.g. for `ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH
+-r 60 -i frames.rgb video.mp4`; png writes one file per frame. Either way
+frames.json lists the frames that made it, so gaps show where frames were
+dropped. The output of an earlier capture into the same directory is
+removed first. zlib and numpy release the GIL while they work, so the writer
+mostly runs alongside the game.
+"""
+import glob
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from array import array
+
+import numpy as np
+
+RAW = "raw"
+PNG = "png"
+FORMATS = (RAW, PNG)
+
+# Frames that can wait for the writer before new ones are dropped
+BUFFERS = 8
+
+# zlib level of PNG frames; higher levels cost far more time than they save space
+PNG_LEVEL = 1
+
+
+def encode_png(rgb):
+    """PNG file contents of an (height, width, 3) uint8 array"""
+    height, width, _ = rgb.shape
+    # Every row starts with its filter type, 0 (none)
+    rows = np.zeros((height, width * 3 + 1), np.uint8)
+    rows[:, 1:] = rgb.reshape(height, width * 3)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows, PNG_LEVEL))
+            + chunk(b"IEND", b""))
+
+
+class FrameCapture:
+    """Hands presented frames to a writer thread through a fixed pool of buffers
+
+    A grabber calls setup() with the frame's buffer shape once, then for
+    every frame acquire() a buffer, fills it and submit()s it. `to_rgb`
+    turns a filled buffer into an (height, width, 3) uint8 array; it runs
+    on the writer thread. With `sync`, frames are written right away on
+    the game's thread instead, which is what capturing used to cost.
+    """
+
+    def __init__(self, directory, image_format=RAW, buffers=BUFFERS, sync=False):
+        self.directory = directory
+        self.image_format = image_format
+        self.buffer_count = buffers
+        self.sync = sync
+        self.free = queue.Queue()
+        self.pending = queue.Queue()
+        self.to_rgb = None
+        self.shape = None
+        self.thread = None
+        self.stream = None
+        self.size = None
+
+        self.frames = []
+        self.dropped = 0
+        # First error of the writer; frames after it are dropped
+        self.error = None
+        # Seconds the game thread spent on each captured frame
+        self.grab_times = array("d")
+        self.write_time = 0.0
+
+    def setup(self, shape, dtype, to_rgb):
+        """Allocate the buffers for frames of `shape` and start the writer"""
+        os.makedirs(self.directory, exist_ok=True)
+        # Frames of an earlier capture would mix with these ones; other files are left alone
+        for path in glob.glob(os.path.join(self.directory, "frame_*.png")):
+            os.remove(path)
+        for name in ("frames.rgb", "frames.json"):
+            if os.path.exists(os.path.join(self.directory, name)):
+                os.remove(os.path.join(self.directory, name))
+        self.shape = shape
+        self.to_rgb = to_rgb
+        for _ in range(self.buffer_count):
+            self.free.put(np.empty(shape, dtype))
+        if self.image_format == RAW:
+            self.stream = open(os.path.join(self.directory, "frames.rgb"), "wb")
+        if not self.sync:
+            self.thread = threading.Thread(target=self._work, daemon=True)
+            self.thread.start()
+
+    @property
+    def ready(self):
+        return self.shape is not None
+
+    def acquire(self):
+        """A free buffer, or None when the writer is behind and the frame has to be dropped"""
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return None
+
+    def submit(self, frame, buffer):
+        if self.sync:
+            self._write(frame, buffer)
+            self.free.put(buffer)
+        else:
+            self.pending.put((frame, buffer))
+
+    def _work(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            frame, buffer = item
+            if self.error is None:
+                try:
+                    self._write(frame, buffer)
+                except Exception as e:
+                    self.error = f"{type(e).__name__}: {e}"
+            self.free.put(buffer)
+
+    def _write(self, frame, buffer):
+        start = time.perf_counter()
+        rgb = np.ascontiguousarray(self.to_rgb(buffer))
+        self.size = rgb.shape[1], rgb.shape[0]
+        if self.stream is not None:
+            self.stream.write(rgb.data)
+        else:
+            with open(os.path.join(self.directory, f"frame_{frame:06d}.png"), "wb") as f:
+                f.write(encode_png(rgb))
+        self.frames.append(frame)
+        self.write_time += time.perf_counter() - start
+
+    def close(self):
+        """Write what is still queued, then the index; returns the capture's stats"""
+        if self.thread is not None:
+            self.pending.put(None)
+            self.thread.join()
+        if self.stream is not None:
+            self.stream.close()
+
+        stats = self.stats()
+        if self.ready:
+            with open(os.path.join(self.directory, "frames.json"), "w") as f:
+                json.dump(dict(stats, width=self.size[0] if self.size else None,
+                               height=self.size[1] if self.size else None, frames=self.frames), f)
+        return stats
+
+    def stats(self):
+        grabs = sorted(self.grab_times)
+        return {
+            "path": self.directory,
+            "format": self.image_format,
+            "sync": self.sync,
+            "captured": len(self.frames),
+            "dropped": self.dropped,
+            "error": self.error,
+            "grab_mean_ms": sum(grabs) / len(grabs) * 1000 if grabs else 0.0,
+            "grab_max_ms": grabs[-1] * 1000 if grabs else 0.0,
+            "write_mean_ms": self.write_time / len(self.frames) * 1000 if self.frames else 0.0,
+        }
+
+
+class PygameGrabber:
+    """Copies the Pygame display surface into the capture on every present"""
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.frame = 0
+
+    def grab(self):
+        import pygame
+
+        surface = pygame.display.get_surface()
+        if surface is None:
+            return
+        start = time.perf_counter()
+        width, height = surface.get_size()
+        if not self.capture.ready:
+            if surface.get_bitsize() == 32:
+                # Whole pixels as they are; the writer picks the channels out
+                shifts = surface.get_shifts()[:3]
+                self.capture.setup((height, width), np.uint32, lambda pixels: self.unpack(pixels, shifts))
+            else:
+                self.capture.setup((height, width, 3), np.uint8, lambda pixels: pixels)
+
+        frame = self.frame
+        self.frame += 1
+        buffer = self.capture.acquire()
+        if buffer is None:
+            return
+        if buffer.shape[:2] != (height, width):
+            # The window changed size; only frames of the first size are kept
+            self.capture.free.put(buffer)
+            self.capture.dropped += 1
+            return
+        if buffer.ndim == 2:
+            # pixels2d is (width, height) with rows contiguous in memory, so
+            # the transposed view copies as one block
+            view = pygame.surfarray.pixels2d(surface)
+        else:
+            view = pygame.surfarray.pixels3d(surface)
+        np.copyto(buffer, view.swapaxes(0, 1))
+        # The view locks the surface until it is gone; flip() needs it unlocked
+        del view
+        self.capture.submit(frame, buffer)
+        self.capture.grab_times.append(time.perf_counter() - start)
+
+    @staticmethod
+    def unpack(pixels, shifts):
+        rgb = np.empty(pixels.shape + (3,), np.uint8)
+        for channel, shift in enumerate(shifts):
+            # Casting to uint8 keeps the low byte
+            rgb[..., channel] = pixels >> shift
+        return rgb
+
+    def finish(self):
+        pass
+
+
+class ArcadeGrabber:
+    """Reads the Arcade framebuffer into the capture through two pixel buffer objects
+
+    Frame n is read into one buffer object while frame n - 1, read into the
+    other one a frame earlier, is copied out; so frames reach the capture one
+    frame late, and finish() collects the last one.
+    """
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.frame = 0
+        self.buffers = None
+        # Frame number waiting in each buffer object
+        self.waiting = [None, None]
+        self.width = self.height = 0
+
+    def grab(self, window):
+        from pyglet import gl
+
+        start = time.perf_counter()
+        screen = window.ctx.screen
+        if self.buffers is None:
+            self.width, self.height = screen.width, screen.height
+            size = self.width * self.height * 3
+            self.buffers = [window.ctx.buffer(reserve=size, usage="stream") for _ in range(2)]
+            # Rows come bottom up from OpenGL
+            self.capture.setup((self.height, self.width, 3), np.uint8, lambda pixels: pixels[::-1])
+
+        slot = self.frame % 2
+        # The other buffer object still holds the previous frame
+        self.collect(1 - slot)
+        with screen:
+            gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.buffers[slot].glo)
+            # With a pack buffer bound this only queues the copy; it returns at once
+            gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGB, gl.GL_UNSIGNED_BYTE, 0)
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        self.waiting[slot] = self.frame
+        self.frame += 1
+        self.capture.grab_times.append(time.perf_counter() - start)
+
+    def collect(self, slot):
+        import ctypes
+        from pyglet import gl
+
+        frame = self.waiting[slot]
+        if frame is None:
+            return
+        self.waiting[slot] = None
+        buffer = self.capture.acquire()
+        if buffer is None:
+            return
+        size = buffer.nbytes
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.buffers[slot].glo)
+        pointer = gl.glMapBufferRange(gl.GL_PIXEL_PACK_BUFFER, 0, size, gl.GL_MAP_READ_BIT)
+        ctypes.memmove(buffer.ctypes.data, pointer, size)
+        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        self.capture.submit(frame, buffer)
+
+    def finish(self):
+        """Collect the frame still waiting in a buffer object, oldest first"""
+        if self.buffers is None:
+            return
+        for slot in sorted((slot for slot in (0, 1) if self.waiting[slot] is not None),
+                           key=lambda slot: self.waiting[slot]):
+            self.collect(slot)
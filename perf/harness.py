@@ -0,0 +1,430 @@
+"""Run one game script under instrumentation.
+
+The launcher starts this module in a child process, for example::
+
+    python -m perf.harness pygame_version snake_game --frames 300 --headless --output result.json
+
+Anything after ``--`` is handed to the game as its own command line.
+
+The game script itself is not modified. Instead the harness patches the
+few library entry points every game goes through (``pygame.time.Clock`` on
+the Pygame side, ``arcade.run`` on the Arcade side) so it can count frames,
+time them and stop the game once the frame budget is used up.
+"""
+import argparse
+import cProfile
+import json
+import os
+import random
+import runpy
+import sys
+import time
+
+from perf.input_log import InputLog, InputPlayer, InputRecorder, patch_arcade_input, patch_pygame_input
+from perf.phase_report import summarize_phases, write_chrome_trace
+from shared.fixed_timestep import FRAME_TIME_ENV
+from shared.frame_profiler import frame_profiler
+
+# Taken as early as possible so the launcher can tell interpreter start-up
+# apart from everything that happens afterwards
+HARNESS_START = time.monotonic()
+
+PYGAME = "pygame_version"
+ARCADE = "arcade_version"
+LIBRARIES = (PYGAME, ARCADE)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Every game renders at 60 FPS; on uncapped, recorded and replayed runs each
+# frame counts as exactly this much game time, see shared/fixed_timestep.py
+FIXED_FRAME_TIME = 1 / 60
+
+# Subsystems each Pygame game really needs when started with --fast-start;
+# none of the games play sound or read joysticks
+FAST_START_SUBSYSTEMS = ("display", "font")
+
+
+class FramesDone(BaseException):
+    """Raised inside the game loop once the frame budget is used up.
+
+    Derives from BaseException so a game's own ``except Exception`` blocks
+    cannot swallow it.
+    """
+
+
+class FrameRecorder:
+    """Collects the time between consecutive frames"""
+
+    def __init__(self, max_frames):
+        self.max_frames = max_frames
+        self.frame_times = []
+        self.first_frame = None
+        self.last_frame = None
+        # InputRecorder or InputPlayer of a recorded or replayed run
+        self.inputs = None
+        # cProfile.Profile started at the first frame, so start-up isn't profiled
+        self.profiler = None
+
+    def frame(self):
+        """Mark the end of a frame; raises FramesDone when the budget is reached"""
+        now = time.perf_counter()
+        if self.last_frame is None:
+            self.first_frame = now
+            if self.profiler is not None:
+                self.profiler.enable()
+        else:
+            self.frame_times.append(now - self.last_frame)
+        self.last_frame = now
+
+        if self.inputs is not None and self.inputs.frame():
+            # The whole recorded session has been replayed
+            raise FramesDone()
+        if self.max_frames and len(self.frame_times) >= self.max_frames:
+            raise FramesDone()
+
+    @property
+    def loop_time(self):
+        if self.first_frame is None:
+            return 0.0
+        return self.last_frame - self.first_frame
+
+
+class StartupTimer:
+    """Monotonic timestamps of the start-up milestones of a game.
+
+    time.monotonic() is system wide on Linux, so the launcher can compare
+    these against the moment it spawned the process.
+    """
+
+    def __init__(self):
+        self.marks = {"harness_start": HARNESS_START}
+
+    def mark(self, name):
+        # Only the first occurrence counts, e.g. the first presented frame
+        self.marks.setdefault(name, time.monotonic())
+
+    def timed(self, func, name):
+        """Wrap `func` so its first call records `<name>_start` and `<name>_end`"""
+        def wrapper(*args, **kwargs):
+            self.mark(f"{name}_start")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.mark(f"{name}_end")
+        return wrapper
+
+
+def set_headless_environment(library):
+    """Select the offscreen backends; must run before pygame/arcade are imported"""
+    if library == PYGAME:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    else:
+        os.environ["ARCADE_HEADLESS"] = "1"
+
+
+def patch_pygame(recorder, uncapped, startup, fast_start=False, grabber=None):
+    """Count a frame on every Clock.tick() and optionally stop it from sleeping
+
+    A `grabber` from perf.capture gets every frame right before it is presented.
+    """
+    startup.mark("import_start")
+    import pygame
+    startup.mark("import_end")
+
+    if fast_start:
+        def init():
+            # Same return value as pygame.init(): (initialized, failed)
+            for name in FAST_START_SUBSYSTEMS:
+                getattr(pygame, name).init()
+            return len(FAST_START_SUBSYSTEMS), 0
+        pygame.init = init
+
+    pygame.init = startup.timed(pygame.init, "init")
+    pygame.display.set_mode = startup.timed(pygame.display.set_mode, "window")
+
+    real_flip = pygame.display.flip
+    real_update = pygame.display.update
+
+    def flip():
+        if grabber is not None:
+            frame_profiler.phase("capture")
+            grabber.grab()
+        frame_profiler.phase("present")
+        real_flip()
+        startup.mark("first_frame")
+
+    def update(*args):
+        if grabber is not None:
+            frame_profiler.phase("capture")
+            grabber.grab()
+        frame_profiler.phase("present")
+        real_update(*args)
+        startup.mark("first_frame")
+
+    pygame.display.flip = flip
+    pygame.display.update = update
+
+    real_clock = pygame.time.Clock
+
+    class HarnessClock:
+        def __init__(self):
+            self._clock = real_clock()
+
+        def tick(self, framerate=0):
+            frame_profiler.end_frame()
+            recorder.frame()
+            return self._clock.tick(0 if uncapped else framerate)
+
+        def tick_busy_loop(self, framerate=0):
+            frame_profiler.end_frame()
+            recorder.frame()
+            return self._clock.tick_busy_loop(0 if uncapped else framerate)
+
+        def __getattr__(self, name):
+            return getattr(self._clock, name)
+
+    pygame.time.Clock = HarnessClock
+
+    if recorder.inputs is not None:
+        patch_pygame_input(recorder.inputs)
+
+    # Polling the events starts a frame; whatever follows is update until
+    # the game marks another phase (drawing, say)
+    input_get = pygame.event.get
+
+    def get(*args, **kwargs):
+        frame_profiler.phase("events")
+        events = input_get(*args, **kwargs)
+        frame_profiler.phase("update")
+        return events
+
+    pygame.event.get = get
+
+
+def patch_arcade(recorder, uncapped, startup, fast_start=False, grabber=None):
+    """Replace arcade.run() with a loop we control frame by frame
+
+    A `grabber` from perf.capture gets every frame right before it is presented.
+    """
+    if fast_start:
+        # Skip probing the audio drivers; none of the games play sound.
+        # arcade.sound overwrites pyglet.options["audio"] on import, but
+        # leaves it alone when this is set. In a zygote worker arcade is
+        # imported already, so the pool does this itself
+        os.environ["ARCADE_SOUND_BACKENDS"] = "silent"
+
+    startup.mark("import_start")
+    import arcade
+    from pyglet.event import EventDispatcher
+    startup.mark("import_end")
+
+    arcade.Window.__init__ = startup.timed(arcade.Window.__init__, "window")
+
+    def run():
+        window = arcade.get_window()
+        replay = patch_arcade_input(window, recorder.inputs) if recorder.inputs is not None else None
+        frame_period = 1 / 60
+        delta_time = frame_period
+        last_time = time.perf_counter()
+
+        while window.context:
+            frame_profiler.phase("events")
+            window.switch_to()
+            window.dispatch_events()
+            if replay is not None:
+                replay()
+
+            # Same order as arcade's own headless loop, but dispatching both
+            # update() and on_update() since the games use either one
+            frame_profiler.phase("update")
+            window._dispatch_updates(delta_time)
+            if window.context:
+                # Window.dispatch_event() would only queue the draw until the
+                # next dispatch_events(), where it would be timed as events
+                frame_profiler.phase("draw")
+                EventDispatcher.dispatch_event(window, "on_draw")
+            if window.context and grabber is not None:
+                frame_profiler.phase("capture")
+                grabber.grab(window)
+            if window.context:
+                frame_profiler.phase("present")
+                window.flip()
+                startup.mark("first_frame")
+            frame_profiler.end_frame()
+
+            now = time.perf_counter()
+            if not uncapped and now - last_time < frame_period:
+                time.sleep(frame_period - (now - last_time))
+                now = time.perf_counter()
+            delta_time, last_time = now - last_time, now
+
+            recorder.frame()
+
+    arcade.run = run
+
+
+def run_game(library, game, frames=0, headless=False, uncapped=False, fast_start=False, game_args=(),
+             record=None, replay=None, seed=None, trace=None, profile=None, capture=None, capture_format="raw",
+             capture_sync=False):
+    """Run a game until it exits or `frames` frames have been presented
+
+    `record` saves the player's input to that file; `replay` plays a saved
+    session back instead of taking input, as fast as the game can run.
+    `trace` writes the per-phase frame timings there as a Chrome trace.
+    `profile` profiles the frames after the first with cProfile, leaving
+    start-up out, and saves the stats there.
+    `capture` saves every presented frame to that directory, see perf/capture.py.
+    """
+    if headless:
+        set_headless_environment(library)
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+    inputs = None
+    if replay:
+        inputs = InputPlayer(InputLog.load(replay))
+        uncapped = True
+    elif record:
+        inputs = InputRecorder(seed if seed is not None else random.getrandbits(32))
+    if inputs is not None:
+        # Same food and other random choices as in the recorded session
+        random.seed(inputs.log.seed)
+    if uncapped or inputs is not None:
+        # Frames come as fast as they can (or as slow as they must), but the
+        # games' simulation advances by the same amount every frame
+        os.environ[FRAME_TIME_ENV] = repr(FIXED_FRAME_TIME)
+
+    recorder = FrameRecorder(frames)
+    recorder.inputs = inputs
+    # Time the phases of every frame; the game marks the ones only it can see
+    frame_profiler.enable()
+    startup = StartupTimer()
+    frame_capture = grabber = None
+    if capture:
+        # Only imported when asked for; it brings in numpy
+        from perf.capture import ArcadeGrabber, FrameCapture, PygameGrabber
+        frame_capture = FrameCapture(capture, capture_format, sync=capture_sync)
+        grabber = PygameGrabber(frame_capture) if library == PYGAME else ArcadeGrabber(frame_capture)
+    if library == PYGAME:
+        patch_pygame(recorder, uncapped, startup, fast_start, grabber)
+    else:
+        patch_arcade(recorder, uncapped, startup, fast_start, grabber)
+
+    # Make the game believe it was started directly with `python <path>`
+    game_path = os.path.join(ROOT_DIR, library, f"{game}.py")
+    sys.argv = [game_path] + list(game_args)
+    sys.path.insert(0, os.path.dirname(game_path))
+
+    result = {
+        "library": library,
+        "game": game,
+        "status": "frames",
+        "error": None,
+    }
+    # Only the frames after the first are profiled, the same ones frame_times covers
+    profiler = cProfile.Profile() if profile else None
+    recorder.profiler = profiler
+    try:
+        runpy.run_path(game_path, run_name="__main__")
+        result["status"] = "exited"
+    except FramesDone:
+        pass
+    except SystemExit:
+        result["status"] = "exited"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if profiler is not None:
+            profiler.disable()
+
+    if profiler is not None:
+        # Standard pstats format, readable with pstats, snakeviz, gprof2dot...
+        profiler.dump_stats(profile)
+        result["profile"] = profile
+
+    if frame_capture is not None:
+        try:
+            grabber.finish()
+        except Exception:
+            # The window and its GL context may be gone already
+            pass
+        result["capture"] = frame_capture.close()
+
+    if record:
+        inputs.save(record)
+    if inputs is not None:
+        result["input_log"] = {"path": record or replay, "seed": inputs.log.seed,
+                               "frames": inputs.tick, "events": len(inputs.log.events)}
+
+    result["frame_times"] = recorder.frame_times
+    result["loop_time"] = recorder.loop_time
+    result["startup"] = startup.marks
+    result["phases"] = summarize_phases(frame_profiler)
+    if trace:
+        write_chrome_trace(frame_profiler, trace)
+
+    # Hit/miss counters of the Pygame text cache, if the game used it
+    text_cache_module = sys.modules.get("shared.text_cache")
+    if text_cache_module is not None:
+        result["text_cache"] = text_cache_module.text_cache.stats()
+    frame_cache_module = sys.modules.get("shared.frame_cache")
+    if frame_cache_module is not None:
+        result["frame_cache"] = frame_cache_module.frame_cache.stats()
+    hud_module = sys.modules.get("shared.hud")
+    if hud_module is not None:
+        result["hud"] = [hud.stats() for hud in hud_module.huds]
+    broad_phase_module = sys.modules.get("shared.broad_phase")
+    if broad_phase_module is not None:
+        result["broad_phase"] = [phase.stats() for phase in broad_phase_module.phases]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a single game under the measurement harness")
+    parser.add_argument("library", choices=LIBRARIES)
+    parser.add_argument("game", help="game module name, e.g. snake_game")
+    parser.add_argument("--frames", type=int, default=0, help="stop after this many frames (0 = run until closed)")
+    parser.add_argument("--headless", action="store_true", help="use the SDL dummy driver / offscreen arcade context")
+    parser.add_argument("--uncapped", action="store_true", help="do not sleep to hold the game's frame rate")
+    parser.add_argument("--fast-start", action="store_true",
+                        help="only initialize the subsystems the games use (no audio or joystick)")
+    parser.add_argument("--output", help="write the result as JSON to this file")
+    parser.add_argument("--record", metavar="LOG", help="save the seed and the player's input to this file")
+    parser.add_argument("--replay", metavar="LOG",
+                        help="play a recorded session back instead of taking input (implies --uncapped)")
+    parser.add_argument("--seed", type=int, help="seed of the random module for --record (random by default)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write the phases of every frame as a Chrome trace (chrome://tracing, Perfetto)")
+    parser.add_argument("--profile", metavar="FILE", help="run the game under cProfile and save the stats to this file")
+    parser.add_argument("--capture", metavar="DIR",
+                        help="save every presented frame to this directory from a background thread")
+    parser.add_argument("--capture-format", choices=("raw", "png"), default="raw",
+                        help="one raw RGB stream (default) or a PNG file per frame")
+    parser.add_argument("--capture-sync", action="store_true",
+                        help="write the frames from the game loop instead, to compare what that costs")
+
+    # Everything after "--" belongs to the game
+    argv = list(sys.argv[1:] if argv is None else argv)
+    game_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, game_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    result = run_game(args.library, args.game, args.frames, args.headless, args.uncapped, args.fast_start,
+                      game_args, args.record, args.replay, args.seed, args.trace, args.profile,
+                      args.capture, args.capture_format, args.capture_sync)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+
+    # Skip interpreter teardown; pygame/pyglet cleanup is slow and irrelevant here
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(1 if result["status"] == "error" else 0)
+
+
+if __name__ == "__main__":
+    main()
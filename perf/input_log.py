@@ -0,0 +1,246 @@
+"""Recording and replay of a game session's input.
+
+The harness can record everything a player does in a game and play it
+back later, into the Pygame or the Arcade version of that game:
+
+    python -m perf.harness pygame_version snake_game --record session.inp
+    python -m perf.harness arcade_version snake_game --replay session.inp --headless
+
+A log holds the seed of the `random` module and the key and mouse button
+events of the session, each tagged with the frame (tick) it happened in.
+Keys and buttons are stored by name ("up", "r", "left", ...) and mouse
+positions in top-left-origin window pixels, so a session recorded with
+one library replays in the other. Together with the fixed game timestep
+(every frame counts as 1/60 s while recording or replaying) the replayed
+game goes through the same states as the recorded one.
+
+File format, little-endian::
+
+    header  "GINP", version (u8), seed (u64), frames (u32)
+    events  ticks since the previous event (u16), kind (u8), code (u8), x (i16), y (i16)
+
+A gap of more than 65535 ticks is bridged with WAIT events.
+
+The library adapters only import pygame or arcade when they are used.
+"""
+import struct
+
+MAGIC = b"GINP"
+VERSION = 1
+HEADER = struct.Struct("<4sBQI")
+EVENT = struct.Struct("<HBBhh")
+
+# Event kinds
+KEY_DOWN = 0
+KEY_UP = 1
+MOUSE_DOWN = 2
+MOUSE_UP = 3
+WAIT = 4
+
+# Everything that can be recorded; the code in the log is the index in these
+KEY_NAMES = ("up", "down", "left", "right", "space", "return", "escape",
+             *"abcdefghijklmnopqrstuvwxyz", *"0123456789")
+MOUSE_BUTTON_NAMES = ("left", "middle", "right")
+
+
+class InputLog:
+    """A recorded session: the seed, the number of frames and the input events"""
+
+    def __init__(self, seed=0, frames=0, events=None):
+        self.seed = seed
+        self.frames = frames
+        # (tick, kind, code, x, y), in tick order
+        self.events = events if events is not None else []
+
+    def save(self, path):
+        chunks = [HEADER.pack(MAGIC, VERSION, self.seed, self.frames)]
+        last_tick = 0
+        for tick, kind, code, x, y in self.events:
+            gap = tick - last_tick
+            while gap > 0xFFFF:
+                chunks.append(EVENT.pack(0xFFFF, WAIT, 0, 0, 0))
+                gap -= 0xFFFF
+            chunks.append(EVENT.pack(gap, kind, code, x, y))
+            last_tick = tick
+        with open(path, "wb") as f:
+            f.write(b"".join(chunks))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, frames = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input log")
+
+        events = []
+        tick = 0
+        for gap, kind, code, x, y in EVENT.iter_unpack(data[HEADER.size:]):
+            tick += gap
+            if kind != WAIT:
+                events.append((tick, kind, code, x, y))
+        return cls(seed, frames, events)
+
+
+class InputRecorder:
+    """Collects the events of a running game, frame by frame"""
+
+    replaying = False
+
+    def __init__(self, seed):
+        self.log = InputLog(seed)
+        self.tick = 0
+
+    def record(self, kind, code, x=0, y=0):
+        self.log.events.append((self.tick, kind, code, x, y))
+
+    def frame(self):
+        """End of a frame; never ends the game"""
+        self.tick += 1
+        return False
+
+    def save(self, path):
+        self.log.frames = self.tick
+        self.log.save(path)
+
+
+class InputPlayer:
+    """Hands out the events of a log at the ticks they were recorded"""
+
+    replaying = True
+
+    def __init__(self, log):
+        self.log = log
+        self.tick = 0
+        self.next_event = 0
+        # What a game polling the input state would see
+        self.held_keys = set()
+        self.mouse_position = (0, 0)
+
+    def events(self):
+        """The events of the current tick that have not been handed out yet"""
+        events = []
+        log_events = self.log.events
+        while self.next_event < len(log_events) and log_events[self.next_event][0] <= self.tick:
+            _, kind, code, x, y = log_events[self.next_event]
+            self.next_event += 1
+            if kind == KEY_DOWN:
+                self.held_keys.add(code)
+            elif kind == KEY_UP:
+                self.held_keys.discard(code)
+            else:
+                self.mouse_position = (x, y)
+            events.append((kind, code, x, y))
+        return events
+
+    def frame(self):
+        """End of a frame; True once every recorded frame has been played"""
+        self.tick += 1
+        return self.tick >= self.log.frames
+
+
+def patch_pygame_input(inputs):
+    """Record the input events a Pygame game reads, or replace them with the log's"""
+    import pygame
+
+    key_codes = [getattr(pygame, f"K_{name.upper() if len(name) > 1 else name}") for name in KEY_NAMES]
+    key_names = {code: index for index, code in enumerate(key_codes)}
+    # Pygame numbers the mouse buttons 1 (left), 2 (middle), 3 (right)
+    button_codes = [1, 2, 3]
+    input_types = {pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION}
+    real_get = pygame.event.get
+
+    if not inputs.replaying:
+        def get(*args, **kwargs):
+            events = real_get(*args, **kwargs)
+            for event in events:
+                if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in key_names:
+                    inputs.record(KEY_DOWN if event.type == pygame.KEYDOWN else KEY_UP, key_names[event.key])
+                elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP) and event.button in button_codes:
+                    kind = MOUSE_DOWN if event.type == pygame.MOUSEBUTTONDOWN else MOUSE_UP
+                    inputs.record(kind, button_codes.index(event.button), *event.pos)
+            return events
+
+        pygame.event.get = get
+        return
+
+    def get(*args, **kwargs):
+        # Real input is dropped; window events like QUIT still come through
+        events = [event for event in real_get(*args, **kwargs) if event.type not in input_types]
+        for kind, code, x, y in inputs.events():
+            if kind in (KEY_DOWN, KEY_UP):
+                event_type = pygame.KEYDOWN if kind == KEY_DOWN else pygame.KEYUP
+                events.append(pygame.event.Event(event_type, key=key_codes[code], mod=0, unicode="", scancode=0))
+            else:
+                event_type = pygame.MOUSEBUTTONDOWN if kind == MOUSE_DOWN else pygame.MOUSEBUTTONUP
+                events.append(pygame.event.Event(event_type, pos=(x, y), button=button_codes[code]))
+        return events
+
+    class HeldKeys:
+        """Stands in for the sequence pygame.key.get_pressed() returns"""
+
+        def __getitem__(self, key):
+            index = key_names.get(key)
+            return index is not None and index in inputs.held_keys
+
+    pygame.event.get = get
+    pygame.key.get_pressed = HeldKeys
+    pygame.mouse.get_pos = lambda: inputs.mouse_position
+
+
+def patch_arcade_input(window, inputs):
+    """Record the input events of an Arcade window, or block them and return a replay function"""
+    import arcade
+    from pyglet.event import EventDispatcher
+
+    key_codes = [getattr(arcade.key, f"KEY_{name}" if name.isdigit() else name.upper()) for name in KEY_NAMES]
+    key_names = {code: index for index, code in enumerate(key_codes)}
+    button_codes = [arcade.MOUSE_BUTTON_LEFT, arcade.MOUSE_BUTTON_MIDDLE, arcade.MOUSE_BUTTON_RIGHT]
+
+    if not inputs.replaying:
+        def record_key(kind):
+            def handler(key, modifiers):
+                if key in key_names:
+                    inputs.record(kind, key_names[key])
+            return handler
+
+        def record_button(kind):
+            def handler(x, y, button, modifiers):
+                if button in button_codes:
+                    # Arcade's y axis points up; the log's points down
+                    inputs.record(kind, button_codes.index(button), int(x), window.height - int(y))
+            return handler
+
+        window.push_handlers(
+            on_key_press=record_key(KEY_DOWN), on_key_release=record_key(KEY_UP),
+            on_mouse_press=record_button(MOUSE_DOWN), on_mouse_release=record_button(MOUSE_UP),
+        )
+        return None
+
+    # Real input stops at this handler; replayed events are let through
+    injecting = False
+
+    def block(*args):
+        return not injecting
+
+    window.push_handlers(on_key_press=block, on_key_release=block, on_mouse_press=block,
+                        on_mouse_release=block, on_mouse_motion=block, on_mouse_drag=block)
+
+    def replay():
+        """Dispatch the events of the current tick to the window"""
+        nonlocal injecting
+        injecting = True
+        try:
+            # Window.dispatch_event() would only queue the event until the next dispatch_events()
+            for kind, code, x, y in inputs.events():
+                if kind == KEY_DOWN:
+                    EventDispatcher.dispatch_event(window, "on_key_press", key_codes[code], 0)
+                elif kind == KEY_UP:
+                    EventDispatcher.dispatch_event(window, "on_key_release", key_codes[code], 0)
+                else:
+                    event = "on_mouse_press" if kind == MOUSE_DOWN else "on_mouse_release"
+                    EventDispatcher.dispatch_event(window, event, x, window.height - y, button_codes[code], 0)
+        finally:
+            injecting = False
+
+    return replay
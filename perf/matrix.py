@@ -0,0 +1,330 @@
+"""Benchmark matrix of every game, library and entity count, with a baseline check.
+
+run_matrix() runs each case headless through perf.bench: every game pair
+from find_matching_games in both libraries, and the games that take a
+sprite count (ENTITY_ARGS) once per count in `entity_counts`. Every case
+is run `repeats` times, each time in a fresh process. The results are
+written as matrix.json (every frame time and the median of each run, plus
+the pygame and arcade versions that produced them), matrix.csv (one row of
+percentiles per case) and report.html, a static page with a frame-time
+histogram per case.
+
+Any earlier matrix.json can serve as the baseline:
+
+    python game_launcher.py --matrix --report-dir reports/before
+    pip install --upgrade pygame arcade
+    python game_launcher.py --matrix --report-dir reports/after --baseline reports/before/matrix.json
+
+The frames of one run aren't independent samples: a background process
+slows several frames in a row, and two runs of the same code differ by a
+few percent as a whole. A test on the pooled frame times calls such a
+difference highly significant. So the unit compared is the run: a
+Mann-Whitney U test on the per-run medians of the case and of the same
+case in the baseline, and a case is only flagged when that difference is
+significant AND the median moved by more than the noise floor. The noise
+floor is the spread of the baseline's own run medians, but at least
+MIN_CHANGE and MIN_CHANGE_MS. A significant change smaller than that is
+reported as "within noise floor". With fewer than 4 runs on either side
+the test can't reach SIGNIFICANCE, so nothing is flagged.
+
+benchmarks/matrix_noise_check.py runs the matrix twice on the same tree
+and checks that the second run flags nothing against the first.
+"""
+import csv
+import html
+import json
+import os
+import platform
+from importlib import metadata
+
+from perf.bench import run_benchmark
+from perf.harness import LIBRARIES
+from perf.stats import mann_whitney_u, percentile, summarize_frame_times
+
+# Games whose entity count can be set, and the argument that sets it
+ENTITY_ARGS = {
+    "collision_demo": "--sprites",
+    "sprite_animation": "--sprites",
+}
+ENTITY_COUNTS = (1, 100, 1000)
+# Fresh-process runs of every case
+REPEATS = 5
+
+# A change is flagged when the test's p-value on the run medians is below SIGNIFICANCE ...
+SIGNIFICANCE = 0.05
+# ... and the median frame time changed by more than the baseline's spread, this fraction and this many ms
+MIN_CHANGE = 0.10
+MIN_CHANGE_MS = 0.25
+
+HISTOGRAM_BINS = 40
+HISTOGRAM_WIDTH = 320
+HISTOGRAM_HEIGHT = 80
+
+CSV_FIELDS = ("game", "library", "entities", "status", "frames", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+              "max_ms", "fps", "runs", "baseline_p50_ms", "change", "noise_floor_ms", "p_value", "verdict")
+
+
+def build_cases(games, libraries=LIBRARIES, entity_counts=ENTITY_COUNTS):
+    """(game, library, entities) of every run; entities is None for games without an entity count"""
+    cases = []
+    for _, game in games:
+        counts = entity_counts if game in ENTITY_ARGS else (None,)
+        for entities in counts:
+            for library in libraries:
+                cases.append((game, library, entities))
+    return cases
+
+
+def case_name(game, library, entities):
+    name = f"{game} ({library})"
+    return name if entities is None else f"{name} x{entities}"
+
+
+def library_versions():
+    """Installed pygame and arcade versions, so a report says what it measured"""
+    versions = {"python": platform.python_version()}
+    for package in ("pygame", "arcade"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def run_matrix(cases, frames, repeats=REPEATS, timeout=120, replay=None, progress=None):
+    """Run every case `repeats` times; returns the matrix document written to matrix.json
+
+    The repeats go round the whole matrix rather than one case at a time, so
+    a slow spell of the machine costs several cases one run each instead of
+    costing one case all of its runs.
+    """
+    runs = {case: [] for case in cases}
+    for repeat in range(repeats):
+        for game, library, entities in cases:
+            if progress:
+                progress(f"Benchmarking {case_name(game, library, entities)}, run {repeat + 1}/{repeats}...")
+            game_args = [ENTITY_ARGS[game], str(entities)] if entities is not None else []
+            result = run_benchmark(library, game, frames, timeout, game_args=game_args, replay=replay)
+            runs[game, library, entities].append(result)
+    results = [combine_runs(case, runs[case]) for case in cases]
+    return {"frames": frames, "repeats": repeats, "versions": library_versions(), "results": results}
+
+
+def combine_runs(case, runs):
+    """One result for the runs of a case: all their frame times, and each run's median"""
+    game, library, entities = case
+    good = [run for run in runs if not run.get("error")]
+    failed = [run for run in runs if run.get("error")]
+    frame_times = [frame_time for run in good for frame_time in run["frame_times"]]
+    return {
+        "game": game,
+        "library": library,
+        "entities": entities,
+        # One failed run fails the case
+        "status": failed[0]["status"] if failed else runs[-1]["status"],
+        "error": failed[0]["error"] if failed else None,
+        "frame_times": frame_times,
+        "run_p50_ms": [run["stats"]["p50_ms"] for run in good],
+        "stats": summarize_frame_times(frame_times),
+    }
+
+
+def case_key(result):
+    return result["game"], result["library"], result["entities"]
+
+
+def median(values):
+    return percentile(sorted(values), 50)
+
+
+def compare_to_baseline(matrix, baseline):
+    """Attach a "comparison" to every result of `matrix` that has a counterpart in `baseline`
+
+    Returns the flagged regressions.
+    """
+    previous = {case_key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in matrix["results"]:
+        before = previous.get(case_key(result))
+        if before is None or result.get("error") or before.get("error"):
+            result["comparison"] = None
+            continue
+        old, new = median(before["run_p50_ms"]), median(result["run_p50_ms"])
+        change = (new - old) / old if old > 0 else 0.0
+        p_value = mann_whitney_u(before["run_p50_ms"], result["run_p50_ms"])
+        # Runs of the same code differ by about as much as the baseline's runs differ among themselves
+        noise_floor = max(max(before["run_p50_ms"]) - min(before["run_p50_ms"]), MIN_CHANGE * old, MIN_CHANGE_MS)
+        if p_value >= SIGNIFICANCE:
+            verdict = "unchanged"
+        elif abs(new - old) <= noise_floor:
+            # Real, but no bigger than what separates two runs of the same code
+            verdict = "within noise floor"
+        elif change > 0:
+            verdict = "regression"
+            regressions.append(result)
+        else:
+            verdict = "improvement"
+        result["comparison"] = {
+            "baseline_p50_ms": old,
+            "p50_ms": new,
+            "change": change,
+            "noise_floor_ms": noise_floor,
+            "p_value": p_value,
+            "verdict": verdict,
+            # Kept for the report's histogram overlay
+            "baseline_frame_times": before["frame_times"],
+        }
+    return regressions
+
+
+def write_json(matrix, path):
+    # The baseline's frame times are already in the baseline file
+    document = dict(matrix, results=[
+        dict(result, comparison={key: value for key, value in result["comparison"].items()
+                                 if key != "baseline_frame_times"})
+        if result.get("comparison") else result
+        for result in matrix["results"]
+    ])
+    with open(path, "w") as f:
+        json.dump(document, f, indent=1)
+
+
+def write_csv(matrix, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, CSV_FIELDS)
+        writer.writeheader()
+        for result in matrix["results"]:
+            comparison = result.get("comparison") or {}
+            row = {field: result["stats"].get(field) for field in CSV_FIELDS if field in result["stats"]}
+            row.update({
+                "game": result["game"],
+                "library": result["library"],
+                "entities": result["entities"] if result["entities"] is not None else "",
+                "status": result["status"] if not result.get("error") else f"{result['status']}: {result['error']}",
+                "runs": len(result["run_p50_ms"]),
+                "baseline_p50_ms": comparison.get("baseline_p50_ms", ""),
+                "change": comparison.get("change", ""),
+                "noise_floor_ms": comparison.get("noise_floor_ms", ""),
+                "p_value": comparison.get("p_value", ""),
+                "verdict": comparison.get("verdict", ""),
+            })
+            writer.writerow(row)
+
+
+def histogram_svg(frame_times, baseline_times=None):
+    """Inline SVG histogram of frame times in ms, with the baseline's outlined behind it"""
+    samples = [t * 1000 for t in frame_times]
+    baseline = [t * 1000 for t in baseline_times or []]
+    if not samples:
+        return ""
+    # One scale for both so the shapes can be compared; the slowest 1% goes into the last bin
+    everything = sorted(samples + baseline)
+    top = everything[min(len(everything) - 1, int(len(everything) * 0.99))] * 1.1 or 1.0
+    width = HISTOGRAM_WIDTH / HISTOGRAM_BINS
+
+    def counts(values):
+        bins = [0] * HISTOGRAM_BINS
+        for value in values:
+            bins[min(HISTOGRAM_BINS - 1, int(value / top * HISTOGRAM_BINS))] += 1
+        return [count / len(values) for count in bins]
+
+    current = counts(samples)
+    previous = counts(baseline) if baseline else []
+    highest = max(current + previous)
+    parts = [f'<svg width="{HISTOGRAM_WIDTH}" height="{HISTOGRAM_HEIGHT + 14}" class="histogram">']
+    for index, share in enumerate(current):
+        height = share / highest * HISTOGRAM_HEIGHT
+        parts.append(f'<rect x="{index * width:.1f}" y="{HISTOGRAM_HEIGHT - height:.1f}" '
+                     f'width="{width - 1:.1f}" height="{height:.1f}" class="current"/>')
+    if previous:
+        points = " ".join(f"{index * width:.1f},{HISTOGRAM_HEIGHT - share / highest * HISTOGRAM_HEIGHT:.1f} "
+                          f"{(index + 1) * width:.1f},{HISTOGRAM_HEIGHT - share / highest * HISTOGRAM_HEIGHT:.1f}"
+                          for index, share in enumerate(previous))
+        parts.append(f'<polyline points="{points}" class="baseline"/>')
+    parts.append(f'<text x="0" y="{HISTOGRAM_HEIGHT + 12}">0 ms</text>')
+    parts.append(f'<text x="{HISTOGRAM_WIDTH}" y="{HISTOGRAM_HEIGHT + 12}" text-anchor="end">{top:.1f} ms</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+STYLE = """
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; }
+th, td { padding: 4px 8px; border-bottom: 1px solid #ddd; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+.regression { background: #fdd; }
+.improvement { background: #dfd; }
+.histogram rect.current { fill: #4a7ebb; }
+.histogram polyline.baseline { fill: none; stroke: #d9534f; stroke-width: 1.5; }
+.histogram text { font-size: 10px; fill: #666; }
+"""
+
+
+def write_html(matrix, path, baseline=None):
+    """Static report: versions, then one table row with a histogram per case"""
+    def versions(document):
+        return ", ".join(f"{name} {version}" for name, version in document["versions"].items())
+
+    lines = ["<!DOCTYPE html>", "<html><head><meta charset=\"utf-8\"><title>Benchmark matrix</title>",
+             f"<style>{STYLE}</style></head><body>", "<h1>Benchmark matrix</h1>",
+             f"<p>{matrix['repeats']} runs of {matrix['frames']} frames per case; "
+             f"{html.escape(versions(matrix))}</p>"]
+    if baseline:
+        lines.append(f"<p>Baseline: {html.escape(versions(baseline))}. Flagged when the run medians differ with "
+                     f"p &lt; {SIGNIFICANCE} and the median of the run medians moved more than the noise floor: "
+                     f"the spread of the baseline's run medians, but at least {MIN_CHANGE:.0%} and {MIN_CHANGE_MS} ms. "
+                     f"The baseline's distribution is the red outline.</p>")
+    lines.append("<table><tr><th>Case</th><th>p50 ms</th><th>p95 ms</th><th>p99 ms</th><th>FPS</th>"
+                 "<th>Baseline p50</th><th>Change</th><th>Noise floor ms</th><th>p-value</th>"
+                 "<th>Frame times</th></tr>")
+    for result in matrix["results"]:
+        name = html.escape(case_name(result["game"], result["library"], result["entities"]))
+        if result.get("error"):
+            lines.append(f"<tr class=\"regression\"><td>{name}</td>"
+                         f"<td colspan=\"9\">{html.escape(result['error'])}</td></tr>")
+            continue
+        stats = result["stats"]
+        comparison = result.get("comparison")
+        if comparison:
+            verdict = comparison["verdict"]
+            compared = (f"<td>{comparison['baseline_p50_ms']:.3f}</td><td>{comparison['change']:+.1%}</td>"
+                        f"<td>{comparison['noise_floor_ms']:.3f}</td><td>{comparison['p_value']:.2g}</td>")
+            histogram = histogram_svg(result["frame_times"], comparison["baseline_frame_times"])
+        else:
+            verdict = ""
+            compared = "<td></td><td></td><td></td><td></td>"
+            histogram = histogram_svg(result["frame_times"])
+        lines.append(f"<tr class=\"{verdict.replace(' ', '-')}\"><td>{name}</td><td>{stats['p50_ms']:.3f}</td>"
+                     f"<td>{stats['p95_ms']:.3f}</td><td>{stats['p99_ms']:.3f}</td><td>{stats['fps']:.1f}</td>"
+                     f"{compared}<td>{histogram}</td></tr>")
+    lines += ["</table>", "</body></html>"]
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+
+
+def write_reports(matrix, directory, baseline=None):
+    """matrix.json, matrix.csv and report.html in `directory`"""
+    os.makedirs(directory, exist_ok=True)
+    write_json(matrix, os.path.join(directory, "matrix.json"))
+    write_csv(matrix, os.path.join(directory, "matrix.csv"))
+    write_html(matrix, os.path.join(directory, "report.html"), baseline)
+
+
+def format_matrix_report(matrix):
+    """Plain-text table of the cases, with the baseline comparison when there is one"""
+    header = f"{'Case':<40} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'FPS':>9}  Baseline"
+    lines = [header, "-" * len(header)]
+    for result in matrix["results"]:
+        name = case_name(result["game"], result["library"], result["entities"])
+        if result.get("error"):
+            lines.append(f"{name:<40} {result['status']}: {result['error']}")
+            continue
+        stats = result["stats"]
+        comparison = result.get("comparison")
+        compared = ""
+        if comparison:
+            compared = (f"{comparison['change']:+.1%} (p={comparison['p_value']:.2g}, "
+                        f"floor {comparison['noise_floor_ms']:.2f} ms) {comparison['verdict']}")
+        lines.append(f"{name:<40} {stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f} "
+                     f"{stats['fps']:>9.1f}  {compared}")
+    return "\n".join(lines)
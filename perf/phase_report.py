@@ -0,0 +1,97 @@
+"""Per-phase summaries and Chrome traces of a shared.frame_profiler run"""
+import json
+
+from perf.stats import percentile
+
+# Slowest frames listed in a summary
+WORST_FRAMES = 5
+
+
+def summarize_phases(profiler):
+    """Per-phase mean and percentiles in ms over the profiler's kept frames, plus the slowest frames"""
+    frames = [(frame, *profiler.frame_phases(frame)) for frame in profiler.kept_frames()]
+    phase_times = {name: sorted(phases[name] for _, _, phases in frames) for name in profiler.phases}
+    # Time no phase was charged with, e.g. the first moments of a frame before its first mark
+    phase_times["other"] = sorted(frame_time - sum(phases.values()) for _, frame_time, phases in frames)
+    phase_times["frame"] = sorted(frame_time for _, frame_time, _ in frames)
+
+    summary = {"frames": len(frames), "phases": {}}
+    for name, times in phase_times.items():
+        # Leave out phases nothing was charged to, like collision in a game without any
+        if not times or (name != "frame" and max(times) <= 0):
+            continue
+        summary["phases"][name] = {
+            "mean_ms": sum(times) / len(times) * 1000,
+            "p50_ms": percentile(times, 50) * 1000,
+            "p95_ms": percentile(times, 95) * 1000,
+            "p99_ms": percentile(times, 99) * 1000,
+            "max_ms": times[-1] * 1000,
+        }
+
+    worst = sorted(frames, key=lambda item: item[1], reverse=True)[:WORST_FRAMES]
+    summary["worst_frames"] = [
+        {
+            "frame": frame,
+            "frame_ms": frame_time * 1000,
+            # The phase that took longest in that frame
+            "phase": max(phases, key=phases.get),
+            "phases_ms": {name: seconds * 1000 for name, seconds in phases.items() if seconds},
+        }
+        for frame, frame_time, phases in worst
+    ]
+    return summary
+
+
+def chrome_trace(profiler):
+    """The kept frames and their phase segments as a Chrome trace-event document
+
+    Frames and phases go on two tracks of one process; open the file in
+    chrome://tracing or https://ui.perfetto.dev.
+    """
+    def microseconds(seconds):
+        return round(seconds * 1e6, 3)
+
+    events = [
+        {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "frames"}},
+        {"name": "thread_name", "ph": "M", "pid": 1, "tid": 2, "args": {"name": "phases"}},
+    ]
+    kept = profiler.kept_frames()
+    for frame in kept:
+        slot = frame % profiler.capacity
+        start, end = profiler.frame_start[slot], profiler.frame_end[slot]
+        events.append({
+            "name": f"frame {frame}", "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+            "ts": microseconds(start - profiler.origin), "dur": microseconds(end - start),
+        })
+
+    # Segments older than the oldest kept frame belong to frames already dropped
+    oldest = profiler.frame_start[kept[0] % profiler.capacity] if kept else 0.0
+    for segment in range(max(0, profiler.segments - profiler.segment_capacity), profiler.segments):
+        slot = segment % profiler.segment_capacity
+        start, end = profiler.segment_start[slot], profiler.segment_end[slot]
+        if start < oldest:
+            continue
+        events.append({
+            "name": profiler.phases[profiler.segment_phase[slot]], "cat": "phase", "ph": "X", "pid": 1, "tid": 2,
+            "ts": microseconds(start - profiler.origin), "dur": microseconds(end - start),
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(profiler, path):
+    with open(path, "w") as f:
+        json.dump(chrome_trace(profiler), f)
+
+
+def format_phase_report(summary):
+    """Plain-text table of a summarize_phases() result"""
+    lines = [f"{'phase':<10} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+    for name, stats in summary["phases"].items():
+        lines.append(f"{name:<10} {stats['mean_ms']:>8.3f} {stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} "
+                     f"{stats['p99_ms']:>8.3f} {stats['max_ms']:>8.3f}")
+    if summary["worst_frames"]:
+        lines.append("Slowest frames:")
+        for worst in summary["worst_frames"]:
+            lines.append(f"  frame {worst['frame']}: {worst['frame_ms']:.2f} ms, mostly {worst['phase']} "
+                         f"({worst['phases_ms'].get(worst['phase'], 0.0):.2f} ms)")
+    return "\n".join(lines)
@@ -0,0 +1,173 @@
+"""Per-process resource sampling from /proc.
+
+A game is started with ``supervise()``, which samples CPU time, RSS,
+context switches and thread count of the child at a fixed interval and
+returns a summary once it exits. On systems without /proc only the final
+``wait4`` rusage numbers are available.
+"""
+import os
+import subprocess
+import threading
+import time
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def read_proc_sample(pid):
+    """Read one resource sample for `pid`, or None if it is gone"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+        with open(f"/proc/{pid}/status") as f:
+            status = f.read()
+    except OSError:
+        return None
+
+    # The command name may contain spaces, so split after the closing paren
+    fields = stat[stat.rindex(")") + 2:].split()
+    sample = {
+        "time": time.perf_counter(),
+        "user": int(fields[11]) / CLOCK_TICKS,
+        "system": int(fields[12]) / CLOCK_TICKS,
+        "threads": int(fields[17]),
+        "rss": int(fields[21]) * PAGE_SIZE,
+        "peak_rss": 0,
+        "voluntary_switches": 0,
+        "involuntary_switches": 0,
+    }
+
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        if key == "VmHWM":
+            sample["peak_rss"] = int(value.split()[0]) * 1024
+        elif key == "voluntary_ctxt_switches":
+            sample["voluntary_switches"] = int(value)
+        elif key == "nonvoluntary_ctxt_switches":
+            sample["involuntary_switches"] = int(value)
+
+    return sample
+
+
+class ProcessSampler:
+    """Samples a running process from a background thread"""
+
+    def __init__(self, pid, interval=0.1):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            sample = read_proc_sample(self.pid)
+            if sample is None:
+                break
+            self.samples.append(sample)
+            self._stop.wait(self.interval)
+
+
+def summarize(samples, rusage=None, wall_time=0.0):
+    """Combine periodic samples and the final rusage into one summary"""
+    summary = {
+        "wall_time": wall_time,
+        "samples": len(samples),
+        "user_cpu": 0.0,
+        "system_cpu": 0.0,
+        "cpu_percent": 0.0,
+        "mean_rss": 0,
+        "peak_rss": 0,
+        "max_threads": 0,
+        "voluntary_switches": 0,
+        "involuntary_switches": 0,
+    }
+
+    if samples:
+        last = samples[-1]
+        summary["user_cpu"] = last["user"]
+        summary["system_cpu"] = last["system"]
+        summary["mean_rss"] = sum(s["rss"] for s in samples) // len(samples)
+        summary["peak_rss"] = max(max(s["peak_rss"], s["rss"]) for s in samples)
+        summary["max_threads"] = max(s["threads"] for s in samples)
+        summary["voluntary_switches"] = last["voluntary_switches"]
+        summary["involuntary_switches"] = last["involuntary_switches"]
+
+    # rusage is taken at exit, so it covers the time after the last sample
+    if rusage is not None:
+        summary["user_cpu"] = rusage.ru_utime
+        summary["system_cpu"] = rusage.ru_stime
+        summary["peak_rss"] = max(summary["peak_rss"], rusage.ru_maxrss * 1024)
+        summary["voluntary_switches"] = rusage.ru_nvcsw
+        summary["involuntary_switches"] = rusage.ru_nivcsw
+
+    if wall_time > 0:
+        summary["cpu_percent"] = (summary["user_cpu"] + summary["system_cpu"]) / wall_time * 100
+    return summary
+
+
+def supervise(command, interval=0.1, timeout=None, **popen_kwargs):
+    """Run `command`, sampling it until it exits.
+
+    Returns (returncode, summary). Raises subprocess.TimeoutExpired after
+    killing the child if it outlives `timeout`. Output should go to files
+    rather than pipes, since nothing reads from the child while it runs.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(command, **popen_kwargs)
+    sampler = ProcessSampler(process.pid, interval)
+    sampler.start()
+
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    timer = None
+    if timeout is not None:
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+
+    rusage = None
+    try:
+        if hasattr(os, "wait4"):
+            # wait4 reaps the child and hands back its final rusage
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        else:
+            process.wait()
+    finally:
+        if timer is not None:
+            timer.cancel()
+        sampler.stop()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command, timeout)
+
+    wall_time = time.perf_counter() - start
+    return process.returncode, summarize(sampler.samples, rusage, wall_time)
+
+
+def format_resource_report(rows):
+    """Render (game, library, summary) rows as a plain text table"""
+    header = (f"{'Game':<20} {'Library':<15} {'User s':>7} {'Sys s':>7} {'CPU %':>6} "
+              f"{'RSS MB':>7} {'Peak MB':>8} {'Thr':>4} {'Vol cs':>8} {'Invol cs':>8}")
+    lines = [header, "-" * len(header)]
+
+    for game, library, summary in rows:
+        lines.append(
+            f"{game:<20} {library:<15} {summary['user_cpu']:>7.2f} {summary['system_cpu']:>7.2f} "
+            f"{summary['cpu_percent']:>6.1f} {summary['mean_rss'] / 2**20:>7.1f} "
+            f"{summary['peak_rss'] / 2**20:>8.1f} {summary['max_threads']:>4} "
+            f"{summary['voluntary_switches']:>8} {summary['involuntary_switches']:>8}"
+        )
+
+    return "\n".join(lines)
@@ -0,0 +1,148 @@
+"""Profiles of the Pygame and Arcade version of a game, side by side.
+
+profile_game() runs both versions headless for a fixed number of frames
+under cProfile (through the harness's --profile) and saves one stats file
+per library, in the standard pstats format. compare_profiles() lines the
+hottest functions of any number of such files up in one table, so the
+same table also diffs two profiles of one library taken at different
+commits:
+
+    python game_launcher.py --profile --game collision_demo
+    python -m perf.profiling before/collision_demo_arcade_version.prof after/collision_demo_arcade_version.prof
+
+Functions are matched by file and name but not line number, so edits
+elsewhere in a file don't break the comparison. cProfile slows
+Python-heavy code down more than code that waits in C, so compare the
+tables with each other rather than with the frame times of a benchmark.
+"""
+import argparse
+import os
+import pstats
+
+from perf.bench import run_benchmark
+from perf.harness import LIBRARIES
+
+# Hottest functions taken from each profile
+TOP_FUNCTIONS = 20
+
+# Longest function label shown; longer ones lose their beginning
+LABEL_WIDTH = 60
+
+SORT_KEYS = {"own": 1, "cumulative": 2}
+
+
+def profile_path(directory, game, library):
+    return os.path.join(directory, f"{game}_{library}.prof")
+
+
+def profile_game(game, frames, directory, libraries=LIBRARIES, timeout=600, replay=None, progress=None):
+    """Run each library's version of `game` under cProfile; returns {library: harness result}"""
+    os.makedirs(directory, exist_ok=True)
+    results = {}
+    for library in libraries:
+        if progress:
+            progress(f"Profiling {game} ({library})...")
+        results[library] = run_benchmark(library, game, frames, timeout, replay=replay,
+                                         profile=profile_path(directory, game, library))
+    return results
+
+
+def function_label(filename, name):
+    """Short, commit-independent name of a profiled function"""
+    if filename == "~":
+        # Built-ins, e.g. <method 'blit' of 'pygame.surface.Surface' objects>
+        return name
+    parts = filename.replace(os.sep, "/").split("/")
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            # Library code by its import path, e.g. arcade/sprite_list/sprite_list.py
+            parts = parts[parts.index(marker) + 1:]
+            break
+    else:
+        parts = parts[-2:]
+    return f"{'/'.join(parts)}:{name}"
+
+
+def load_functions(path):
+    """{label: [calls, own seconds, cumulative seconds]} of a saved profile"""
+    functions = {}
+    for (filename, _, name), (_, calls, own, cumulative, _) in pstats.Stats(path).stats.items():
+        totals = functions.setdefault(function_label(filename, name), [0, 0.0, 0.0])
+        totals[0] += calls
+        totals[1] += own
+        totals[2] += cumulative
+    return functions
+
+
+def compare_profiles(paths, top=TOP_FUNCTIONS, sort="own"):
+    """Rows of (label, [[calls, own s, cumulative s] or None per profile]), hottest first
+
+    The rows are the `top` hottest functions of every profile by `sort`
+    ("own" or "cumulative" time), each with its numbers in all profiles.
+    """
+    key = SORT_KEYS[sort]
+    tables = [load_functions(path) for path in paths]
+    chosen = set()
+    for table in tables:
+        chosen.update(sorted(table, key=lambda label: table[label][key], reverse=True)[:top])
+
+    def hottest(label):
+        return max(table[label][key] for table in tables if label in table)
+
+    return [(label, [table.get(label) for table in tables]) for label in sorted(chosen, key=hottest, reverse=True)]
+
+
+def format_comparison(names, rows, frames=None):
+    """Plain-text side-by-side table of compare_profiles() rows
+
+    With `frames`, times are in ms per frame instead of total ms.
+    """
+    scale = 1000 / frames if frames else 1000
+    unit = "ms/frame" if frames else "ms"
+    names = [name if len(name) <= 26 else "..." + name[-23:] for name in names]
+    lines = [f"{'':<{LABEL_WIDTH}} " + " ".join(f"{name:>26}" for name in names),
+             f"{'function':<{LABEL_WIDTH}} " + " ".join(f"{'calls':>8} {'own':>8} {'cum':>8}" for _ in names)
+             + f"   ({unit})"]
+    for label, columns in rows:
+        if len(label) > LABEL_WIDTH:
+            label = "..." + label[-(LABEL_WIDTH - 3):]
+        cells = []
+        for column in columns:
+            if column is None:
+                cells.append(f"{'-':>8} {'-':>8} {'-':>8}")
+            else:
+                calls, own, cumulative = column
+                cells.append(f"{calls:>8} {own * scale:>8.3f} {cumulative * scale:>8.3f}")
+        lines.append(f"{label:<{LABEL_WIDTH}} " + " ".join(cells))
+    return "\n".join(lines)
+
+
+def format_game_profiles(game, results, directory, top=TOP_FUNCTIONS, sort="own"):
+    """Side-by-side table of a profile_game() run, per frame"""
+    libraries = [library for library, result in results.items() if not result.get("error")]
+    lines = [f"{game}: profiles in {directory}"]
+    for library, result in results.items():
+        if result.get("error"):
+            lines.append(f"  {library} failed: {result['error']}")
+    if libraries:
+        # Both versions ran the same number of frames, so per-frame numbers line up
+        frames = min(results[library]["stats"]["frames"] for library in libraries)
+        rows = compare_profiles([profile_path(directory, game, library) for library in libraries], top, sort)
+        lines.append(format_comparison(libraries, rows, frames or None))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the hottest functions of saved cProfile stats files")
+    parser.add_argument("profiles", nargs="+", help=".prof files, e.g. from game_launcher.py --profile")
+    parser.add_argument("--top", type=int, default=TOP_FUNCTIONS, help="hottest functions taken from each profile")
+    parser.add_argument("--sort", choices=list(SORT_KEYS), default="own", help="rank functions by own or cumulative time")
+    parser.add_argument("--frames", type=int, help="show times per frame of a run this many frames long")
+    args = parser.parse_args()
+
+    names = [os.path.splitext(os.path.basename(path))[0] for path in args.profiles]
+    print(format_comparison(names, compare_profiles(args.profiles, args.top, args.sort), args.frames))
+
+
+if __name__ == "__main__":
+    main()
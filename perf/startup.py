@@ -0,0 +1,168 @@
+"""Start-up time breakdown of the game scripts.
+
+Each game is started through ``perf.harness`` with ``-X importtime`` and
+stopped right after its first frames. The harness reports monotonic
+timestamps of its milestones, which are combined with the moment the
+process was spawned into these phases:
+
+    interpreter   spawn -> harness module running
+    import        ``import pygame`` / ``import arcade``
+    init          ``pygame.init()`` (Arcade has no separate step)
+    window        ``pygame.display.set_mode()`` / ``arcade.Window.__init__``
+    first frame   window created -> first flip of the display
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from perf.harness import LIBRARIES, ROOT_DIR
+
+PHASES = ("interpreter", "import", "init", "window", "first_frame")
+
+# Top-level packages whose import cost is worth listing module by module
+IMPORT_PACKAGES = ("pygame", "arcade", "pyglet", "PIL", "pymunk", "numpy")
+
+
+def parse_importtime(text):
+    """Parse `-X importtime` output into (module, self_us, cumulative_us, depth)"""
+    modules = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Skip the header line
+            continue
+
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return modules
+
+
+def import_breakdown(modules, top=10):
+    """Cumulative cost of each library import and its most expensive modules"""
+    packages = {}
+    for name, self_us, cumulative_us, depth in modules:
+        package = name.split(".")[0]
+        if package not in IMPORT_PACKAGES:
+            continue
+        entry = packages.setdefault(package, {"cumulative_ms": 0.0, "modules": []})
+        if name == package:
+            entry["cumulative_ms"] = max(entry["cumulative_ms"], cumulative_us / 1000)
+        entry["modules"].append((name, self_us / 1000))
+
+    for entry in packages.values():
+        entry["modules"] = sorted(entry["modules"], key=lambda item: item[1], reverse=True)[:top]
+    return packages
+
+
+def phase_times(spawn_time, marks):
+    """Turn harness milestones into per-phase durations in milliseconds"""
+    def span(start, end):
+        if start in marks and end in marks:
+            return (marks[end] - marks[start]) * 1000
+        return 0.0
+
+    phases = {
+        "interpreter": (marks["harness_start"] - spawn_time) * 1000,
+        "import": span("import_start", "import_end"),
+        "init": span("init_start", "init_end"),
+        "window": span("window_start", "window_end"),
+        "first_frame": span("window_end", "first_frame"),
+    }
+    phases["total"] = (marks["first_frame"] - spawn_time) * 1000 if "first_frame" in marks else 0.0
+    return phases
+
+
+def profile_startup(library, game, fast_start=False, headless=True, timeout=60, pool=None):
+    """Start one game and time its way to the first frame.
+
+    Without a `pool` the game gets a fresh interpreter. With a
+    perf.zygote.ZygotePool it runs in a pre-warmed worker instead, and the
+    "interpreter" phase becomes the hand-off to that worker.
+    """
+    fd, output_path = tempfile.mkstemp(prefix=f"{library}_{game}_startup_", suffix=".json")
+    os.close(fd)
+
+    harness_args = [library, game, "--frames", "1", "--uncapped", "--output", output_path]
+    if headless:
+        harness_args.append("--headless")
+    if fast_start:
+        harness_args.append("--fast-start")
+    command = [sys.executable, "-X", "importtime", "-m", "perf.harness"] + harness_args
+
+    import_log = ""
+    if pool is not None:
+        # Booting the pool itself is not part of a launch
+        pool.wait_ready()
+    try:
+        spawn_time = time.monotonic()
+        if pool is not None:
+            pool.launch(harness_args).wait(timeout)
+        else:
+            completed = subprocess.run(command, cwd=ROOT_DIR, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.PIPE, text=True, timeout=timeout)
+            import_log = completed.stderr
+        with open(output_path) as f:
+            result = json.load(f)
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        return {"library": library, "game": game, "status": "error", "error": str(e),
+                "phases": {}, "imports": {}}
+    finally:
+        os.remove(output_path)
+
+    return {
+        "library": library,
+        "game": game,
+        "fast_start": fast_start,
+        "status": result["status"],
+        "error": result["error"],
+        "phases": phase_times(spawn_time, result["startup"]),
+        "imports": import_breakdown(parse_importtime(import_log)),
+    }
+
+
+def profile_all(games, fast_start=False, headless=True, libraries=LIBRARIES, pool=None, progress=None):
+    """Profile the start-up of each (display_name, filename) pair"""
+    results = []
+    for display_name, filename in games:
+        for library in libraries:
+            if progress:
+                progress(f"Profiling start-up of {display_name} ({library})...")
+            results.append(profile_startup(library, filename, fast_start, headless, pool=pool))
+    return results
+
+
+def format_startup_report(results, top=5):
+    """Render start-up results as a plain text table plus the slowest imports"""
+    header = f"{'Game':<20} {'Library':<15}" + "".join(f" {name:>12}" for name in PHASES) + f" {'total':>9}"
+    lines = ["Start-up phases (ms)", header, "-" * len(header)]
+
+    for result in results:
+        if result["status"] == "error":
+            lines.append(f"{result['game']:<20} {result['library']:<15} error: {result['error']}")
+            continue
+        phases = result["phases"]
+        lines.append(
+            f"{result['game']:<20} {result['library']:<15}"
+            + "".join(f" {phases[name]:>12.1f}" for name in PHASES)
+            + f" {phases['total']:>9.1f}"
+        )
+
+    # Import costs are the same for every game of a library, so list them once
+    lines.append("")
+    lines.append("Slowest imports (self time, ms)")
+    seen = set()
+    for result in results:
+        if result["status"] == "error" or result["library"] in seen:
+            continue
+        seen.add(result["library"])
+        for package, entry in sorted(result["imports"].items()):
+            modules = ", ".join(f"{name} {ms:.1f}" for name, ms in entry["modules"][:top])
+            lines.append(f"  {result['library']:<15} {package:<8} {entry['cumulative_ms']:>8.1f}  {modules}")
+
+    return "\n".join(lines)
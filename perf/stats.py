@@ -0,0 +1,73 @@
+"""Small statistics helpers shared by the benchmark and report code"""
+import math
+
+
+def percentile(sorted_values, q):
+    """Return the q-th percentile (0-100) of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+
+    # Linear interpolation between the two closest ranks
+    rank = (len(sorted_values) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = rank - low
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * fraction
+
+
+def summarize_frame_times(frame_times):
+    """Summarize a list of frame times (seconds) into milliseconds and FPS"""
+    ordered = sorted(frame_times)
+    total = sum(ordered)
+    count = len(ordered)
+
+    return {
+        "frames": count,
+        "mean_ms": total / count * 1000 if count else 0.0,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": ordered[-1] * 1000 if count else 0.0,
+        "fps": count / total if total > 0 else 0.0,
+    }
+
+
+def mann_whitney_u(a, b):
+    """Two-sided p-value of a Mann-Whitney U test between samples `a` and `b`
+
+    Uses the normal approximation with tie correction. For a handful of
+    values, such as the run medians of a benchmark matrix, it errs on the
+    safe side: 5 against 5 completely separated values give 0.012 where the
+    exact test gives 0.008. Small p-values mean the two samples are unlikely
+    to come from the same distribution.
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    n = n1 + n2
+
+    # Average ranks (1-based) over runs of equal values
+    rank_sum = 0.0
+    tie_term = 0.0
+    start = 0
+    while start < n:
+        end = start
+        while end + 1 < n and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        average_rank = (start + end) / 2 + 1
+        rank_sum += average_rank * sum(1 for _, group in combined[start:end + 1] if group == 0)
+        ties = end - start + 1
+        tie_term += ties ** 3 - ties
+        start = end + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # Continuity correction
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return math.erfc(max(z, 0.0) / math.sqrt(2))
@@ -0,0 +1,285 @@
+"""Asyncio supervisor for the game processes the launcher starts.
+
+The launcher used to start a thread per game that blocked until the game
+exited. Nothing kept track of those threads, so a game couldn't be
+stopped or restarted from the launcher, and every click started more
+processes. A ProcessSupervisor owns all of them instead:
+
+- at most `max_running` games run at once; later ones wait in a queue
+- a game's stdout and stderr are read line by line while it runs
+- a game that outlives its timeout is terminated (and killed if it must)
+- a game that crashes (non-zero exit it wasn't asked for) can be
+  restarted up to `restarts` times
+- exit status, runtime and the /proc resource summary of every run are
+  reported when it ends
+
+The asyncio loop runs in a background thread, so submit(), cancel() and
+friends can be called from the Tk mainloop without blocking it. What
+happens to the jobs is posted to the `events` queue as (kind, job)
+tuples, which the UI can drain from a root.after() callback:
+
+    ("queued", job)      ("started", job)     ("output", job, stream, line)
+    ("restarting", job)  ("exit", job)
+
+With a ZygotePool, games are launched from its pre-warmed workers rather
+than as children of the launcher; their output then goes to the zygote's
+stderr and isn't streamed.
+"""
+import asyncio
+import collections
+import itertools
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+
+from perf.procstat import ProcessSampler, summarize
+
+# Job states
+QUEUED = "queued"
+STARTING = "starting"
+RUNNING = "running"
+RESTARTING = "restarting"
+EXITED = "exited"
+CRASHED = "crashed"
+TIMED_OUT = "timed out"
+CANCELLED = "cancelled"
+
+# Lines of output kept per job
+OUTPUT_LINES = 200
+
+# Seconds a game gets to exit after SIGTERM before it is killed
+KILL_GRACE = 2.0
+
+
+class Job:
+    """One supervised game and what became of it"""
+
+    def __init__(self, job_id, name, command, timeout=None, restarts=0, cwd=None, zygote_argv=None):
+        self.id = job_id
+        self.name = name
+        self.command = command
+        self.timeout = timeout
+        self.max_restarts = restarts
+        self.cwd = cwd
+        # Harness arguments for a launch from the zygote pool instead of `command`
+        self.zygote_argv = zygote_argv
+
+        self.state = QUEUED
+        self.pid = None
+        self.returncode = None
+        self.runtime = 0.0
+        self.restarts = 0
+        self.resources = None
+        self.output = collections.deque(maxlen=OUTPUT_LINES)
+        self.cancelled = False
+        self.process = None
+
+    @property
+    def done(self):
+        return self.state in (EXITED, CRASHED, TIMED_OUT, CANCELLED)
+
+    def describe(self):
+        """One line for a status bar or a log"""
+        if self.state == RUNNING:
+            return f"{self.name}: running (pid {self.pid})"
+        if not self.done:
+            return f"{self.name}: {self.state}"
+        restarts = f", {self.restarts} restart(s)" if self.restarts else ""
+        return f"{self.name}: {self.state} with code {self.returncode} after {self.runtime:.1f} s{restarts}"
+
+
+class ProcessSupervisor:
+    """Runs, watches and reports on every game process of the launcher"""
+
+    def __init__(self, max_running=4, sample_interval=0.1, zygote=None, restart_delay=0.5):
+        self.sample_interval = sample_interval
+        self.zygote = zygote
+        self.restart_delay = restart_delay
+        self.events = queue.Queue()
+        self.jobs = {}
+        self.ids = itertools.count(1)
+
+        self.loop = asyncio.new_event_loop()
+        self.slots = asyncio.Semaphore(max_running)
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def submit(self, name, command, timeout=None, restarts=0, cwd=None, zygote_argv=None):
+        """Queue a game; returns its Job right away"""
+        job = Job(next(self.ids), name, command, timeout, restarts, cwd, zygote_argv)
+        self.jobs[job.id] = job
+        self.events.put(("queued", job))
+        future = asyncio.run_coroutine_threadsafe(self._run(job), self.loop)
+        future.add_done_callback(lambda future: self._finished(job, future))
+        return job
+
+    def cancel(self, job):
+        """Stop a queued or running job"""
+        self.loop.call_soon_threadsafe(self._cancel, job)
+
+    def cancel_all(self):
+        for job in self.active():
+            self.cancel(job)
+
+    def restart(self, job):
+        """Stop `job` if it still runs and start the same game again as a new job"""
+        if not job.done:
+            self.cancel(job)
+        return self.submit(job.name, job.command, job.timeout, job.max_restarts, job.cwd, job.zygote_argv)
+
+    def active(self, name=None):
+        """Jobs that are queued or running, optionally only those called `name`"""
+        return [job for job in list(self.jobs.values()) if not job.done and (name is None or job.name == name)]
+
+    def shutdown(self, wait=True):
+        """Wait for the running and queued games to end (or stop them) and stop the loop"""
+        if not wait:
+            self.cancel_all()
+        while self.active():
+            time.sleep(0.05)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    async def _run(self, job):
+        async with self.slots:
+            while not job.cancelled:
+                await self._run_once(job)
+                if job.state != CRASHED or job.restarts >= job.max_restarts:
+                    break
+                job.restarts += 1
+                job.state = RESTARTING
+                self.events.put(("restarting", job))
+                await asyncio.sleep(self.restart_delay)
+
+    async def _run_once(self, job):
+        start = time.perf_counter()
+        job.state = STARTING
+        try:
+            if job.zygote_argv is not None:
+                process = await self.loop.run_in_executor(None, self.zygote.launch, job.zygote_argv)
+                readers = []
+            else:
+                process = await asyncio.create_subprocess_exec(
+                    *job.command, cwd=job.cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+                readers = [asyncio.ensure_future(self._read_output(job, process.stdout, "stdout")),
+                           asyncio.ensure_future(self._read_output(job, process.stderr, "stderr"))]
+        except Exception as e:
+            # A missing executable, or a zygote that has died (BrokenPipeError)
+            self._failed(job, start, f"failed to start: {type(e).__name__}: {e}")
+            return
+        job.process = process
+        job.pid = process.pid
+        job.state = RUNNING
+        self.events.put(("started", job))
+
+        sampler = ProcessSampler(process.pid, self.sample_interval)
+        sampler.start()
+        timed_out = False
+        try:
+            if job.cancelled:
+                # Cancelled while it was being started
+                await self._stop(process)
+            try:
+                await asyncio.wait_for(self._wait(process), job.timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                await self._stop(process)
+            await asyncio.gather(*readers)
+        except Exception as e:
+            try:
+                # Don't leave the game running unsupervised
+                await self._stop(process)
+            except Exception:
+                pass
+            await self.loop.run_in_executor(None, sampler.stop)
+            self._failed(job, start, f"lost the game: {type(e).__name__}: {e}")
+            return
+        # Joining the sampler thread may take up to one interval
+        await self.loop.run_in_executor(None, sampler.stop)
+
+        rusage = process.rusage if job.zygote_argv is not None else None
+        job.returncode = process.returncode
+        job.runtime = time.perf_counter() - start
+        job.resources = summarize(sampler.samples, rusage, job.runtime)
+        job.process = None
+        if job.cancelled:
+            job.state = CANCELLED
+        elif timed_out:
+            job.state = TIMED_OUT
+        elif job.returncode != 0:
+            job.state = CRASHED
+        else:
+            job.state = EXITED
+        self.events.put(("exit", job))
+
+    def _failed(self, job, start, error):
+        """End a run that went wrong in the supervisor rather than in the game"""
+        job.output.append(("stderr", error))
+        self.events.put(("output", job, "stderr", error))
+        job.runtime = time.perf_counter() - start
+        job.process = None
+        job.state = CANCELLED if job.cancelled else CRASHED
+        self.events.put(("exit", job))
+
+    def _finished(self, job, future):
+        """Report what escaped _run(), and make sure the job still ends"""
+        if future.cancelled() or future.exception() is None:
+            return
+        error = future.exception()
+        print(f"Supervisor error in {job.name}:", file=sys.stderr)
+        traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+        if not job.done:
+            job.output.append(("stderr", f"{type(error).__name__}: {error}"))
+            job.state = CRASHED
+            self.events.put(("exit", job))
+
+    async def _wait(self, process):
+        if isinstance(process, asyncio.subprocess.Process):
+            await process.wait()
+        else:
+            # A ZygoteProcess only offers a blocking wait
+            await self.loop.run_in_executor(None, process.wait)
+
+    async def _read_output(self, job, stream, name):
+        async for line in stream:
+            line = line.decode(errors="replace").rstrip("\n")
+            job.output.append((name, line))
+            self.events.put(("output", job, name, line))
+
+    async def _stop(self, process):
+        """SIGTERM, then SIGKILL if the game is still there after KILL_GRACE"""
+        if isinstance(process, asyncio.subprocess.Process):
+            if process.returncode is not None:
+                return
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), KILL_GRACE)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+            return
+
+        # Zygote games aren't our children: signal them and wait for the zygote's report
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.kill(process.pid, sig)
+            except ProcessLookupError:
+                pass
+            if await self.loop.run_in_executor(None, process.exited.wait, KILL_GRACE):
+                return
+
+    def _cancel(self, job):
+        if job.done:
+            return
+        job.cancelled = True
+        if job.state in (QUEUED, RESTARTING):
+            # Never started (again); _run() sees the flag once it gets a slot
+            job.state = CANCELLED
+            self.events.put(("exit", job))
+        elif job.process is not None:
+            asyncio.ensure_future(self._stop(job.process))
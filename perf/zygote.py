@@ -0,0 +1,286 @@
+"""Pre-warmed interpreter pool ("zygote") for launching games.
+
+A zygote is a long-lived Python process that has already imported pygame
+and arcade. It keeps a few forked workers waiting on a pipe; launching a
+game hands the harness arguments to an idle worker, which then only has
+to run the game module itself. A replacement worker is forked right after
+each launch so the pool stays full.
+
+The launcher talks to the zygote over its stdin/stdout with one JSON
+object per line::
+
+    -> {"id": 1, "argv": ["pygame_version", "snake_game"]}
+    <- {"event": "started", "id": 1, "pid": 1234}
+    <- {"event": "exit", "id": 1, "pid": 1234, "returncode": 0, "rusage": {...}}
+
+Forking is only available on POSIX systems.
+"""
+import argparse
+import collections
+import json
+import os
+import selectors
+import subprocess
+import sys
+import threading
+import time
+import types
+
+from perf import harness
+from perf.procstat import ProcessSampler, summarize
+
+RUSAGE_FIELDS = ("ru_utime", "ru_stime", "ru_maxrss", "ru_nvcsw", "ru_nivcsw")
+
+
+class Zygote:
+    """The server side: owns the idle workers and reaps finished games"""
+
+    def __init__(self, workers, fast_start=False):
+        self.workers = workers
+        self.fast_start = fast_start
+        self.idle = collections.deque()
+        self.running = {}
+        self.buffer = b""
+
+    def preload(self):
+        # The whole point of the zygote: pay for these imports once
+        import pygame
+        if self.fast_start:
+            # Has to be set before arcade is imported; the harness's own
+            # --fast-start comes too late in a worker, where it already is
+            os.environ["ARCADE_SOUND_BACKENDS"] = "silent"
+        import arcade
+
+    def spawn_worker(self):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(write_fd)
+            self.run_worker(read_fd)
+        os.close(read_fd)
+        self.idle.append((pid, write_fd))
+
+    def run_worker(self, read_fd):
+        """Body of a forked worker; never returns"""
+        status = 1
+        try:
+            # Drop the siblings' pipes so they see EOF when the zygote closes them
+            for _, fd in self.idle:
+                os.close(fd)
+
+            # stdout carries the zygote's events, so route game output to stderr
+            os.dup2(2, 1)
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = os.read(read_fd, 65536)
+                if not chunk:
+                    # The zygote shut down before handing us a game
+                    os._exit(0)
+                data += chunk
+
+            request = json.loads(data)
+            # Start-up is measured from the hand-off, not from the fork
+            harness.HARNESS_START = time.monotonic()
+            harness.main(request["argv"])
+            status = 0
+        finally:
+            os._exit(status)
+
+    def dispatch(self, request):
+        if not self.idle:
+            self.spawn_worker()
+        pid, write_fd = self.idle.popleft()
+        os.write(write_fd, json.dumps(request).encode() + b"\n")
+        os.close(write_fd)
+
+        self.running[pid] = request["id"]
+        self.emit({"event": "started", "id": request["id"], "pid": pid})
+
+        # Refill the pool now that the client already has its pid
+        self.spawn_worker()
+
+    def reap(self):
+        while True:
+            try:
+                pid, status, rusage = os.wait4(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            if pid in self.running:
+                self.emit({
+                    "event": "exit",
+                    "id": self.running.pop(pid),
+                    "pid": pid,
+                    "returncode": os.waitstatus_to_exitcode(status),
+                    "rusage": {name: getattr(rusage, name) for name in RUSAGE_FIELDS},
+                })
+            else:
+                # An idle worker died on its own; replace it
+                for index, (idle_pid, fd) in enumerate(self.idle):
+                    if idle_pid == pid:
+                        del self.idle[index]
+                        os.close(fd)
+                        self.spawn_worker()
+                        break
+
+    def emit(self, event):
+        sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+
+    def serve(self):
+        """Handle requests from stdin until it is closed"""
+        self.preload()
+        for _ in range(self.workers):
+            self.spawn_worker()
+        self.emit({"event": "ready", "pid": os.getpid()})
+
+        # Single threaded on purpose: forking a multi-threaded process is unsafe
+        selector = selectors.DefaultSelector()
+        selector.register(0, selectors.EVENT_READ)
+        while True:
+            if selector.select(timeout=0.05):
+                chunk = os.read(0, 65536)
+                if not chunk:
+                    break
+                self.buffer += chunk
+                while b"\n" in self.buffer:
+                    line, self.buffer = self.buffer.split(b"\n", 1)
+                    if line.strip():
+                        self.dispatch(json.loads(line))
+            self.reap()
+
+        # Closing the pipes tells idle workers to exit; running games keep going
+        while self.idle:
+            _, fd = self.idle.popleft()
+            os.close(fd)
+
+
+class ZygoteProcess:
+    """A game started by the zygote, as seen from the launcher"""
+
+    def __init__(self, request_id):
+        self.id = request_id
+        self.pid = None
+        self.returncode = None
+        self.rusage = None
+        self.started = threading.Event()
+        self.exited = threading.Event()
+
+    def wait(self, timeout=None):
+        self.exited.wait(timeout)
+        return self.returncode
+
+
+class ZygotePool:
+    """Client side: starts a zygote and launches games through it"""
+
+    def __init__(self, workers=2, headless=False, fast_start=False):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("the zygote pool needs os.fork(), which this platform lacks")
+
+        command = [sys.executable, "-m", "perf.zygote", "--workers", str(workers)]
+        if headless:
+            command.append("--headless")
+        if fast_start:
+            command.append("--fast-start")
+        self.process = subprocess.Popen(command, cwd=harness.ROOT_DIR, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, text=True)
+
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.pending = {}
+        self.ready = threading.Event()
+        self.reader = threading.Thread(target=self._read_events, daemon=True)
+        self.reader.start()
+
+    def _read_events(self):
+        for line in self.process.stdout:
+            event = json.loads(line)
+            if event["event"] == "ready":
+                self.ready.set()
+                continue
+
+            with self.lock:
+                process = self.pending.get(event["id"])
+            if process is None:
+                continue
+
+            if event["event"] == "started":
+                process.pid = event["pid"]
+                process.started.set()
+            elif event["event"] == "exit":
+                process.returncode = event["returncode"]
+                process.rusage = types.SimpleNamespace(**event["rusage"])
+                with self.lock:
+                    del self.pending[event["id"]]
+                process.started.set()
+                process.exited.set()
+
+        # The zygote is gone; nothing else will be reported
+        self.ready.set()
+        with self.lock:
+            orphans, self.pending = list(self.pending.values()), {}
+        for process in orphans:
+            process.returncode = -1
+            process.started.set()
+            process.exited.set()
+
+    def wait_ready(self, timeout=None):
+        """Block until the zygote has finished its imports and forked its workers"""
+        return self.ready.wait(timeout)
+
+    def launch(self, argv):
+        """Run the harness with `argv` in a ready worker; returns a ZygoteProcess"""
+        self.wait_ready()
+        with self.lock:
+            self.next_id += 1
+            process = ZygoteProcess(self.next_id)
+            self.pending[process.id] = process
+            self.process.stdin.write(json.dumps({"id": process.id, "argv": argv}) + "\n")
+            self.process.stdin.flush()
+        process.started.wait()
+        return process
+
+    def supervise(self, argv, interval=0.1):
+        """Same contract as perf.procstat.supervise, for a game run in the pool"""
+        start = time.perf_counter()
+        process = self.launch(argv)
+
+        sampler = ProcessSampler(process.pid, interval)
+        sampler.start()
+        process.wait()
+        sampler.stop()
+
+        wall_time = time.perf_counter() - start
+        return process.returncode, summarize(sampler.samples, process.rusage, wall_time)
+
+    def close(self):
+        """Stop the zygote; games that are still running are left alone"""
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve pre-warmed game workers to the launcher")
+    parser.add_argument("--workers", type=int, default=2, help="idle workers to keep ready")
+    parser.add_argument("--headless", action="store_true", help="preload the offscreen backends")
+    parser.add_argument("--fast-start", action="store_true",
+                        help="preload Arcade with the silent audio driver, like the harness's --fast-start")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        for library in harness.LIBRARIES:
+            harness.set_headless_environment(library)
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+    Zygote(args.workers, args.fast_start).serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
 import pygame
 import math
+import os
+import sys
+
+# Shared engine code lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.frame_profiler import frame_profiler
+from shared.text_cache import text_cache
 
 # Initialize Pygame
 pygame.init()
@@ -21,9 +28,6 @@ pygame.display.set_caption('Click the Circle to Win - Pygame')
 circle_x = SCREEN_WIDTH // 2
 circle_y = SCREEN_HEIGHT // 2
 
-# Font for the win message
-font = pygame.font.SysFont(None, 64)
-
 # Game state
 game_won = False
 clock = pygame.time.Clock()
@@ -46,6 +50,7 @@ while running:
                 game_won = True
 
     # Fill the screen with white
+    frame_profiler.phase("draw")
     screen.fill(BG_COLOR)
     
     # Draw the circle
@@ -53,7 +58,7 @@ while running:
     
     # If game is won, display the win message
     if game_won:
-        win_text = font.render("You Win!", True, TEXT_COLOR)
+        win_text = text_cache.render("You Win!", 64, TEXT_COLOR)
         text_rect = win_text.get_rect(center=(SCREEN_WIDTH//2, 100))
         screen.blit(win_text, text_rect)
 
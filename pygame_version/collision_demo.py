@@ -1,5 +1,35 @@
 import pygame
+import argparse
+import math
+import os
 import sys
+import time
+
+# Shared engine code lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.broad_phase import BROAD_PHASES
+from shared.collision_scene import BLOCK_LAYOUTS, random_sprites
+from shared.dirty_rects import DirtyRectRenderer
+from shared.fixed_timestep import FixedTimestep, interpolate
+from shared.frame_profiler import frame_profiler
+from shared.text_cache import text_cache
+
+# "dirty" only repaints and presents the regions that changed since the last frame
+parser = argparse.ArgumentParser(description="Pygame Collision Demo")
+parser.add_argument("--render", choices=("full", "dirty"), default="full",
+                    help="full: fill and flip the whole screen each frame; dirty: update only what changed")
+# More sprites and blocks turn the demo into a collision stress test
+parser.add_argument("--sprites", type=int, default=1, help="number of moving sprites")
+parser.add_argument("--blocks", type=int, default=1, help="number of stationary blocks")
+parser.add_argument("--block-layout", choices=list(BLOCK_LAYOUTS), default="grid",
+                    help="how more than one block is placed")
+parser.add_argument("--broad-phase", choices=list(BROAD_PHASES), default="brute",
+                    help="how candidate sprite/block pairs are found before the exact rect test")
+parser.add_argument("--seed", type=int, default=0, help="seed for placing the extra sprites and blocks")
+parser.add_argument("--physics", choices=("objects", "numpy"), default="objects",
+                    help="objects: update each sprite in Python; numpy: move, bounce and collide all sprites "
+                         "as array operations (needs NumPy, ignores --broad-phase)")
+args = parser.parse_args()
 
 # Initialize pygame
 pygame.init()
@@ -27,9 +57,12 @@ class MovingSprite:
         self.speed_x = speed_x
         self.speed_y = speed_y
         self.in_collision = False
+        # Position before the last update, for drawing in between updates
+        self.previous = self.rect.topleft
     
     def update(self):
         # Move the sprite
+        self.previous = self.rect.topleft
         self.rect.x += self.speed_x
         self.rect.y += self.speed_y
         
@@ -39,13 +72,20 @@ class MovingSprite:
         if self.rect.top < 0 or self.rect.bottom > SCREEN_HEIGHT:
             self.speed_y *= -1
     
+    def drawn_rect(self):
+        # Where the sprite is shown: `alpha` of the way from its previous to its current position
+        x = round(interpolate(self.previous[0], self.rect.x, alpha))
+        y = round(interpolate(self.previous[1], self.rect.y, alpha))
+        return pygame.Rect(x, y, self.rect.width, self.rect.height)
+    
     def draw(self):
         # Draw the sprite - use collision color if in collision
         color = self.collision_color if self.in_collision else self.default_color
-        pygame.draw.rect(screen, color, self.rect)
+        rect = self.drawn_rect()
+        pygame.draw.rect(screen, color, rect)
         
         # Add a small outline to make it more visible
-        pygame.draw.rect(screen, BLACK, self.rect, 2)
+        pygame.draw.rect(screen, BLACK, rect, 2)
 
 class StationaryBlock:
     def __init__(self, x, y, width, height, color):
@@ -57,30 +97,75 @@ class StationaryBlock:
         # Add a small outline to make it more visible
         pygame.draw.rect(screen, BLACK, self.rect, 2)
 
-# Create game objects
-moving_sprite = MovingSprite(50, 50, 30, 30, BLUE, 3, 2)
-stationary_block = StationaryBlock(SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 50, 100, 100, GREEN)
+# Create game objects: the original sprite first, then the extra ones at random.
+# More than one block replaces the center block with a layout shared with the Arcade demo.
+moving_sprites = [MovingSprite(50, 50, 30, 30, BLUE, 3, 2)]
+for x, y, size, speed_x, speed_y in random_sprites(args.sprites - 1, SCREEN_WIDTH, SCREEN_HEIGHT, args.seed):
+    moving_sprites.append(MovingSprite(x, y, size, size, BLUE, speed_x, speed_y))
+if args.blocks == 1:
+    stationary_blocks = [StationaryBlock(SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 50, 100, 100, GREEN)]
+else:
+    layout = BLOCK_LAYOUTS[args.block_layout](args.blocks, SCREEN_WIDTH, SCREEN_HEIGHT, args.seed)
+    stationary_blocks = [StationaryBlock(x, y, width, height, GREEN) for x, y, width, height in layout]
+block_rects = [block.rect for block in stationary_blocks]
+
+# Broad phase used to find the sprite/block pairs worth testing
+broad_phase = BROAD_PHASES[args.broad_phase]()
 
-# Game stats text
-font = pygame.font.Font(None, 24)
+# With NumPy physics the sprites' state lives in arrays; the objects are only used for drawing
+entity_store = None
+physics_time = 0.0
+if args.physics == "numpy":
+    from shared.entity_store import EntityStore
+    entity_store = EntityStore.from_sprites(moving_sprites)
 
 # Clock for controlling frame rate
 clock = pygame.time.Clock()
 FPS = 60
 
+# The sprites move once per 1/60 s step, however fast the frames are drawn
+timestep = FixedTimestep(1 / 60)
+alpha = 0.0
+
 def check_collision():
-    # Manual collision detection in Pygame
-    return moving_sprite.rect.colliderect(stationary_block.rect)
-
-def display_stats(fps, colliding):
-    # Display FPS and collision status
-    fps_text = font.render(f"FPS: {int(fps)}", True, WHITE)
-    collision_text = font.render(f"Collision: {'Yes' if colliding else 'No'}", True, WHITE)
-    library_text = font.render("Library: Pygame", True, WHITE)
-    
-    screen.blit(fps_text, (10, 10))
-    screen.blit(collision_text, (10, 40))
-    screen.blit(library_text, (10, 70))
+    # Let the broad phase pick candidate pairs, then test those with colliderect
+    colliding = broad_phase.collisions([sprite.rect for sprite in moving_sprites], block_rects)
+    for index, sprite in enumerate(moving_sprites):
+        sprite.in_collision = index in colliding
+    return bool(colliding)
+
+def display_stats(fps, colliding, renderer=None):
+    # Display FPS and collision status (cached until the values change)
+    # get_fps() reports infinity once frames take less than a millisecond
+    lines = (
+        f"FPS: {int(fps)}" if math.isfinite(fps) else "FPS: 1000+",
+        f"Collision: {'Yes' if colliding else 'No'}",
+        "Library: Pygame",
+        broad_phase_text,
+    )
+    for index, line in enumerate(lines):
+        text = text_cache.render(line, 24, WHITE)
+        position = (10, 10 + 30 * index)
+        if renderer is not None:
+            # Only remember where the text goes; the renderer draws it if it changed
+            renderer.track(f"stats{index}", text.get_rect(topleft=position), line)
+        else:
+            screen.blit(text, position)
+
+def draw_scene():
+    for block in stationary_blocks:
+        block.draw()
+    for sprite in moving_sprites:
+        sprite.draw()
+    display_stats(current_fps, collision)
+
+# Dirty-rect renderer, when enabled
+renderer = DirtyRectRenderer(screen, BLACK) if args.render == "dirty" else None
+
+# Broad phase numbers shown on screen, refreshed once a second
+broad_phase_text = f"Broad phase: {broad_phase.name}"
+frame_count = 0
+collision = False
 
 # Main game loop
 while True:
@@ -89,25 +174,59 @@ while True:
         if event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
+        elif event.type == pygame.VIDEOEXPOSE and renderer is not None:
+            # Whatever was on screen may be gone; repaint everything
+            renderer.invalidate()
             
-    # Update
-    moving_sprite.update()
-    
-    # Check collision
-    collision = check_collision()
-    moving_sprite.in_collision = collision
-    
-    # Draw
-    screen.fill(BLACK)
-    stationary_block.draw()
-    moving_sprite.draw()
-    
-    # Display stats
+    steps = timestep.advance()
+    if entity_store is not None:
+        # Update and check collision for all sprites at once, then copy the result back for drawing
+        start = time.perf_counter()
+        for _ in range(steps):
+            entity_store.update(SCREEN_WIDTH, SCREEN_HEIGHT)
+            frame_profiler.phase("collision")
+            collision = bool(entity_store.collide(block_rects).any())
+            frame_profiler.phase("update")
+        physics_time = time.perf_counter() - start
+        entity_store.copy_to_sprites(moving_sprites)
+    else:
+        for _ in range(steps):
+            # Update
+            for sprite in moving_sprites:
+                sprite.update()
+            
+            # Check collision
+            frame_profiler.phase("collision")
+            collision = check_collision()
+            frame_profiler.phase("update")
+    alpha = timestep.alpha
     current_fps = clock.get_fps()
-    display_stats(current_fps, collision)
     
-    # Update display
-    pygame.display.flip()
+    frame_count += 1
+    if frame_count % FPS == 1:
+        if entity_store is not None:
+            broad_phase_text = f"Physics: numpy, {physics_time * 1000:.2f} ms"
+        elif broad_phase.last:
+            last = broad_phase.last
+            broad_phase_text = (f"Broad phase: {broad_phase.name}, {last['candidates']} candidates, "
+                                f"{last['tests']} tests, {last['ms']:.2f} ms")
+    
+    frame_profiler.phase("draw")
+    if renderer is not None:
+        # Tell the renderer what is where, then repaint and present only the changes
+        for index, block in enumerate(stationary_blocks):
+            renderer.track(f"block{index}", block.rect)
+        for index, sprite in enumerate(moving_sprites):
+            renderer.track(f"sprite{index}", sprite.drawn_rect(), sprite.in_collision)
+        display_stats(current_fps, collision, renderer)
+        pygame.display.update(renderer.render(draw_scene))
+    else:
+        # Draw
+        screen.fill(BLACK)
+        draw_scene()
+        
+        # Update display
+        pygame.display.flip()
     
     # Cap the frame rate
-    clock.tick(FPS) 
\ No newline at end of file
+    clock.tick(FPS)
\ No newline at end of file
@@ -1,6 +1,21 @@
 import pygame
+import argparse
+import os
 import sys
 
+# Shared engine code lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.dirty_rects import DirtyRectRenderer
+from shared.fixed_timestep import FixedTimestep, interpolate
+from shared.frame_profiler import frame_profiler
+from shared.text_cache import text_cache
+
+# "dirty" only repaints and presents the regions that changed since the last frame
+parser = argparse.ArgumentParser(description="Move the Box - Pygame Version")
+parser.add_argument("--render", choices=("full", "dirty"), default="full",
+                    help="full: fill and flip the whole screen each frame; dirty: update only what changed")
+args = parser.parse_args()
+
 # Initialize pygame
 pygame.init()
 
@@ -24,6 +39,8 @@ clock = pygame.time.Clock()
 class GameState:
     def __init__(self):
         self.player_pos = [SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2]
+        # Player position before the last step, for drawing in between steps
+        self.previous_pos = list(self.player_pos)
         self.goal_pos = [3 * SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2]
         self.player_rect = pygame.Rect(self.player_pos[0], self.player_pos[1], PLAYER_SIZE, PLAYER_SIZE)
         self.goal_rect = pygame.Rect(self.goal_pos[0], self.goal_pos[1], GOAL_SIZE, GOAL_SIZE)
@@ -33,56 +50,95 @@ class GameState:
 # Create game state
 game = GameState()
 
-# Main game loop
-running = True
-while running:
-    # Process events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-    
+# The player moves once per 1/60 s step, however fast the frames are drawn
+timestep = FixedTimestep(1 / 60)
+
+def player_draw_rect():
+    # `alpha` of the way from the previous to the current position
+    alpha = timestep.alpha
+    x = round(interpolate(game.previous_pos[0], game.player_pos[0], alpha))
+    y = round(interpolate(game.previous_pos[1], game.player_pos[1], alpha))
+    return pygame.Rect(x, y, PLAYER_SIZE, PLAYER_SIZE)
+
+def step():
     # Handle player movement
-    if not game.game_won:
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]:
-            game.player_pos[0] -= game.player_speed
-        if keys[pygame.K_RIGHT]:
-            game.player_pos[0] += game.player_speed
-        if keys[pygame.K_UP]:
-            game.player_pos[1] -= game.player_speed
-        if keys[pygame.K_DOWN]:
-            game.player_pos[1] += game.player_speed
-        
-        # Keep player on screen
-        game.player_pos[0] = max(0, min(game.player_pos[0], SCREEN_WIDTH - PLAYER_SIZE))
-        game.player_pos[1] = max(0, min(game.player_pos[1], SCREEN_HEIGHT - PLAYER_SIZE))
-        
-        # Update player rectangle position
-        game.player_rect.x = game.player_pos[0]
-        game.player_rect.y = game.player_pos[1]
-        
-        # Check for collision with goal
-        if game.player_rect.colliderect(game.goal_rect):
-            game.game_won = True
+    keys = pygame.key.get_pressed()
+    game.previous_pos = list(game.player_pos)
+    if keys[pygame.K_LEFT]:
+        game.player_pos[0] -= game.player_speed
+    if keys[pygame.K_RIGHT]:
+        game.player_pos[0] += game.player_speed
+    if keys[pygame.K_UP]:
+        game.player_pos[1] -= game.player_speed
+    if keys[pygame.K_DOWN]:
+        game.player_pos[1] += game.player_speed
     
-    # Draw everything
-    screen.fill(BG_COLOR)
+    # Keep player on screen
+    game.player_pos[0] = max(0, min(game.player_pos[0], SCREEN_WIDTH - PLAYER_SIZE))
+    game.player_pos[1] = max(0, min(game.player_pos[1], SCREEN_HEIGHT - PLAYER_SIZE))
     
+    # Update player rectangle position
+    game.player_rect.x = game.player_pos[0]
+    game.player_rect.y = game.player_pos[1]
+    
+    # Check for collision with goal
+    if game.player_rect.colliderect(game.goal_rect):
+        game.game_won = True
+        # Nothing moves any more, so stop drawing in between
+        game.previous_pos = list(game.player_pos)
+
+def win_text_rect():
+    text = text_cache.render("You Win!", 72, TEXT_COLOR)
+    return text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+
+def draw_scene():
     # Draw goal
     pygame.draw.rect(screen, GOAL_COLOR, game.goal_rect)
     
     # Draw player
-    pygame.draw.rect(screen, PLAYER_COLOR, game.player_rect)
+    pygame.draw.rect(screen, PLAYER_COLOR, player_draw_rect())
     
     # Display win message if player reached goal
     if game.game_won:
-        font = pygame.font.Font(None, 72)
-        text = font.render("You Win!", True, TEXT_COLOR)
+        text = text_cache.render("You Win!", 72, TEXT_COLOR)
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(text, text_rect)
+
+# Dirty-rect renderer, when enabled
+renderer = DirtyRectRenderer(screen, BG_COLOR) if args.render == "dirty" else None
+
+# Main game loop
+running = True
+while running:
+    # Process events
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            running = False
+        elif event.type == pygame.VIDEOEXPOSE and renderer is not None:
+            # Whatever was on screen may be gone; repaint everything
+            renderer.invalidate()
+    
+    # Run the simulation steps that are due; the game stops once it is won
+    for _ in range(timestep.advance()):
+        if game.game_won:
+            break
+        step()
     
-    # Update display
-    pygame.display.flip()
+    frame_profiler.phase("draw")
+    if renderer is not None:
+        # Tell the renderer what is where, then repaint and present only the changes
+        renderer.track("goal", game.goal_rect)
+        renderer.track("player", player_draw_rect())
+        if game.game_won:
+            renderer.track("win_text", win_text_rect())
+        pygame.display.update(renderer.render(draw_scene))
+    else:
+        # Draw everything
+        screen.fill(BG_COLOR)
+        draw_scene()
+        
+        # Update display
+        pygame.display.flip()
     
     # Cap the frame rate
     clock.tick(FPS)
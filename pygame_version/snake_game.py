@@ -1,8 +1,16 @@
 import pygame
-import random
+import argparse
+import os
 import sys
 import time
 
+# The shared snake engine lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.fixed_timestep import FixedTimestep
+from shared.frame_profiler import frame_profiler
+from shared.snake_body import SnakeBody
+from shared.text_cache import text_cache
+
 # Initialize pygame
 pygame.init()
 
@@ -18,7 +26,9 @@ SCREEN_HEIGHT = 600
 GRID_SIZE = 20
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
+# Moves per second; the screen itself is redrawn at FPS
 SNAKE_SPEED = 10
+FPS = 60
 
 # Direction constants
 UP = (0, -1)
@@ -35,7 +45,7 @@ clock = pygame.time.Clock()
 def init_game():
     # Initial snake position (middle of screen)
     initial_position = (GRID_WIDTH // 2, GRID_HEIGHT // 2)
-    snake_body = [initial_position]
+    snake_body = SnakeBody(GRID_WIDTH, GRID_HEIGHT, initial_position)
     
     # Initial direction
     direction = RIGHT
@@ -49,21 +59,16 @@ def init_game():
     return snake_body, direction, food_position, score, False
 
 def generate_food(snake_body):
-    while True:
-        x = random.randint(0, GRID_WIDTH - 1)
-        y = random.randint(0, GRID_HEIGHT - 1)
-        food_position = (x, y)
-        
-        # Make sure food doesn't spawn on snake
-        if food_position not in snake_body:
-            return food_position
+    # Pick straight from the snake's free-cell index instead of retrying
+    # random positions; None means the snake fills the whole board
+    return snake_body.random_free_cell()
 
-def game_over_screen(score):
-    font = pygame.font.Font(None, 74)
-    game_over_text = font.render("Game Over", True, WHITE)
-    score_text = font.render(f"Score: {score}", True, WHITE)
-    restart_text = font.render("Press R to Restart", True, WHITE)
-    quit_text = font.render("Press Q to Quit", True, WHITE)
+def game_over_screen(score, board_full=False):
+    # Filling the board ends the game too, but as a win
+    game_over_text = text_cache.render("You Win!" if board_full else "Game Over", 74, WHITE)
+    score_text = text_cache.render(f"Score: {score}", 74, WHITE)
+    restart_text = text_cache.render("Press R to Restart", 74, WHITE)
+    quit_text = text_cache.render("Press Q to Quit", 74, WHITE)
     
     game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100))
     score_rect = score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
@@ -90,12 +95,102 @@ def game_over_screen(score):
                 elif event.key == pygame.K_q:
                     pygame.quit()
                     sys.exit()
-        clock.tick(SNAKE_SPEED)
+        clock.tick(FPS)
+
+def draw_cell(surface, cell, color, grid_size=GRID_SIZE):
+    rect = pygame.Rect(cell[0] * grid_size, cell[1] * grid_size, grid_size, grid_size)
+    pygame.draw.rect(surface, color, rect)
+    return rect
+
+def draw_score(surface, score):
+    # Only re-rendered when the score changes
+    score_text = text_cache.render(f"Score: {score}", 36, WHITE)
+    return surface.blit(score_text, (10, 10))
+
+def draw_full(surface, snake_body, food_position, score, grid_size=GRID_SIZE):
+    # Draw everything
+    surface.fill(BLACK)
+    
+    # Draw snake
+    for segment in snake_body:
+        draw_cell(surface, segment, GREEN, grid_size)
+    
+    # Draw food
+    if food_position is not None:
+        draw_cell(surface, food_position, RED, grid_size)
+    
+    # Draw score
+    return draw_score(surface, score)
+
+class IncrementalRenderer:
+    """Redraws only what changed since the previous tick.
+    
+    Between two ticks only the new head, the freed tail cell, the food and
+    the score change, so the cost of a tick no longer depends on the snake
+    length. draw() returns the touched rects for pygame.display.update().
+    """
+    
+    def __init__(self, surface, grid_size=GRID_SIZE):
+        self.surface = surface
+        self.grid_size = grid_size
+        self.score_rect = None
+        self.full_redraw = True
+    
+    def draw(self, snake_body, food_position, score, freed_tail=None):
+        if self.full_redraw:
+            # First tick, or something else (game over screen) drew over us
+            self.full_redraw = False
+            self.score_rect = draw_full(self.surface, snake_body, food_position, score, self.grid_size)
+            return [self.surface.get_rect()]
+        
+        rects = [draw_cell(self.surface, snake_body.head, GREEN, self.grid_size)]
+        
+        # The tail cell may already be taken again, e.g. when chasing the tail
+        if freed_tail is not None and freed_tail not in snake_body:
+            rects.append(draw_cell(self.surface, freed_tail, BLACK, self.grid_size))
+        
+        if food_position is not None:
+            rects.append(draw_cell(self.surface, food_position, RED, self.grid_size))
+        
+        rects.append(self.redraw_score_area(snake_body, food_position, score))
+        return rects
+    
+    def redraw_score_area(self, snake_body, food_position, score):
+        # Clear the old score and repaint the few cells underneath it
+        area = self.score_rect.copy()
+        self.surface.fill(BLACK, area)
+        
+        # Clip so cells only get painted inside the score area
+        grid = self.grid_size
+        self.surface.set_clip(area)
+        for y in range(area.top // grid, (area.bottom - 1) // grid + 1):
+            for x in range(area.left // grid, (area.right - 1) // grid + 1):
+                if (x, y) in snake_body:
+                    color = GREEN
+                elif (x, y) == food_position:
+                    color = RED
+                else:
+                    continue
+                draw_cell(self.surface, (x, y), color, grid)
+        self.surface.set_clip(None)
+        
+        self.score_rect = draw_score(self.surface, score)
+        return area.union(self.score_rect)
 
-def run_game():
+def run_game(render_mode="full"):
     # Initialize game state
     snake_body, direction, food_position, score, game_over = init_game()
     
+    # The incremental renderer only touches the cells that changed
+    renderer = IncrementalRenderer(screen) if render_mode == "incremental" else None
+    
+    # The snake moves SNAKE_SPEED times per second, whatever the frame rate
+    timestep = FixedTimestep(1 / SNAKE_SPEED)
+    # Direction of the last move; turning back onto it would bite the neck
+    moved_direction = direction
+    # Draw the first frame even if the snake hasn't moved yet
+    redraw = True
+    
     # Main game loop
     running = True
     while running:
@@ -105,67 +200,83 @@ def run_game():
                 running = False
             elif event.type == pygame.KEYDOWN:
                 # Change direction based on key press
-                if event.key == pygame.K_UP and direction != DOWN:
+                if event.key == pygame.K_UP and moved_direction != DOWN:
                     direction = UP
-                elif event.key == pygame.K_DOWN and direction != UP:
+                elif event.key == pygame.K_DOWN and moved_direction != UP:
                     direction = DOWN
-                elif event.key == pygame.K_LEFT and direction != RIGHT:
+                elif event.key == pygame.K_LEFT and moved_direction != RIGHT:
                     direction = LEFT
-                elif event.key == pygame.K_RIGHT and direction != LEFT:
+                elif event.key == pygame.K_RIGHT and moved_direction != LEFT:
                     direction = RIGHT
         
         if not game_over:
-            # Move snake
-            head_x, head_y = snake_body[0]
-            new_head = (head_x + direction[0], head_y + direction[1])
-            
-            # Check for collision with walls
-            if (new_head[0] < 0 or new_head[0] >= GRID_WIDTH or
-                new_head[1] < 0 or new_head[1] >= GRID_HEIGHT or
-                new_head in snake_body):
-                game_over = True
-            else:
+            # Several moves may be due after a slow frame, or none after a fast one
+            rects = []
+            steps = timestep.advance()
+            for _ in range(steps):
+                # Move snake
+                head_x, head_y = snake_body.head
+                new_head = (head_x + direction[0], head_y + direction[1])
+                moved_direction = direction
+                
+                # Check for collision with walls or the snake itself
+                freed_tail = None
+                if not snake_body.in_bounds(new_head) or new_head in snake_body:
+                    game_over = True
+                    break
+                
                 # Add new head to snake
-                snake_body.insert(0, new_head)
+                snake_body.push_head(new_head)
                 
                 # Check if snake ate food
                 if new_head == food_position:
                     # Generate new food and increase score
                     food_position = generate_food(snake_body)
                     score += 1
+                    
+                    # No room left for food: the board is full
+                    if food_position is None:
+                        game_over = True
                 else:
                     # Remove tail if no food was eaten
-                    snake_body.pop()
-            
-            # Draw everything
-            screen.fill(BLACK)
-            
-            # Draw snake
-            for segment in snake_body:
-                pygame.draw.rect(screen, GREEN, (segment[0] * GRID_SIZE, 
-                                                segment[1] * GRID_SIZE, 
-                                                GRID_SIZE, GRID_SIZE))
-            
-            # Draw food
-            pygame.draw.rect(screen, RED, (food_position[0] * GRID_SIZE,
-                                          food_position[1] * GRID_SIZE,
-                                          GRID_SIZE, GRID_SIZE))
-            
-            # Draw score
-            font = pygame.font.Font(None, 36)
-            score_text = font.render(f"Score: {score}", True, WHITE)
-            screen.blit(score_text, (10, 10))
+                    freed_tail = snake_body.pop_tail()
+                
+                if renderer is not None:
+                    frame_profiler.phase("draw")
+                    rects.extend(renderer.draw(snake_body, food_position, score, freed_tail))
+                    frame_profiler.phase("update")
+                if game_over:
+                    break
             
-            pygame.display.flip()
-            clock.tick(SNAKE_SPEED)
+            frame_profiler.phase("draw")
+            if renderer is not None:
+                # The grid only changes when the snake moves, so frames without a move draw nothing
+                if redraw and not rects:
+                    rects = renderer.draw(snake_body, food_position, score)
+                if rects:
+                    pygame.display.update(rects)
+            else:
+                draw_full(screen, snake_body, food_position, score)
+                pygame.display.flip()
+            redraw = False
+            clock.tick(FPS)
         else:
             # Show game over screen and get restart decision
-            if game_over_screen(score):
+            if game_over_screen(score, board_full=food_position is None):
                 snake_body, direction, food_position, score, game_over = init_game()
+                moved_direction = direction
+                timestep.reset()
+                redraw = True
+                if renderer is not None:
+                    renderer.full_redraw = True
     
     pygame.quit()
     sys.exit()
 
 # Start the game
 if __name__ == "__main__":
-    run_game() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Snake Game - Pygame Version")
+    parser.add_argument("--render", choices=("full", "incremental"), default="full",
+                        help="redraw the whole screen every tick, or only the cells that changed")
+    args = parser.parse_args()
+    run_game(args.render) 
\ No newline at end of file
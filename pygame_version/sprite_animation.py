@@ -1,6 +1,17 @@
 import pygame
+import argparse
+import os
+import random
 import sys
 
+# Shared engine code lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared.animation import AnimationClip, AnimationTimeline
+from shared.fixed_timestep import FixedTimestep, interpolate
+from shared.frame_cache import frame_cache
+from shared.frame_profiler import frame_profiler
+from shared.text_cache import text_cache
+
 # Initialize pygame
 pygame.init()
 
@@ -18,90 +29,133 @@ GRAY = (50, 50, 50)
 # Animation settings
 SPRITE_WIDTH = 64
 SPRITE_HEIGHT = 64
-ANIMATION_FRAMES = 8
-ANIMATION_SPEED = 5  # Frames per animation update
+FRAME_DURATION = 1 / 12  # Seconds each animation frame is shown
 FPS = 60
 
+# One color per animation frame (different colored squares for demonstration)
+PALETTE = (
+    (255, 0, 0),    # Red
+    (255, 127, 0),  # Orange
+    (255, 255, 0),  # Yellow
+    (0, 255, 0),    # Green
+    (0, 0, 255),    # Blue
+    (75, 0, 130),   # Indigo
+    (148, 0, 211),  # Violet
+    (255, 192, 203) # Pink
+)
+
+def build_frames(width, height, palette):
+    # Create a list of surfaces, one for each frame
+    frames = []
+    for index, color in enumerate(palette):
+        # Create a surface for this frame
+        frame = pygame.Surface((width, height), pygame.SRCALPHA)
+        
+        # Draw the main square body
+        pygame.draw.rect(frame, color, (0, 0, width, height))
+        
+        # Add some details to show it's different (eyes and mouth)
+        # Eyes
+        eye_color = (255, 255, 255)
+        pygame.draw.circle(frame, eye_color, (20, 20), 8)
+        pygame.draw.circle(frame, eye_color, (44, 20), 8)
+        
+        # Pupils (move slightly based on frame to show animation)
+        pupil_x_offset = (index % 3) - 1  # -1, 0, or 1
+        pupil_color = (0, 0, 0)
+        pygame.draw.circle(frame, pupil_color, (20 + pupil_x_offset, 20), 4)
+        pygame.draw.circle(frame, pupil_color, (44 + pupil_x_offset, 20), 4)
+        
+        # Mouth (changes with each frame)
+        mouth_height = 5 + (index % 4) * 2
+        pygame.draw.rect(frame, (0, 0, 0), (22, 40, 20, mouth_height))
+        
+        # Add the frame to our animation list
+        frames.append(frame)
+    return frames
+
 class AnimatedSprite:
-    def __init__(self, x, y, speed):
+    # A sprite is only its position and animation cursor; the frames are shared
+    __slots__ = ("x", "y", "speed", "previous_x", "current_frame", "frames")
+    
+    def __init__(self, x, y, speed, size=(SPRITE_WIDTH, SPRITE_HEIGHT), palette=PALETTE):
         # Position and movement
         self.x = x
         self.y = y
         self.speed = speed
+        # Position before the last update, for drawing in between updates
+        self.previous_x = x
         
-        # Animation state
+        # Animation state, set by the AnimationTimeline playing the sprite's clip
         self.current_frame = 0
-        self.frame_count = 0
-        self.frames = []
-        
-        # Create animation frames (different colored squares for demonstration)
-        colors = [
-            (255, 0, 0),    # Red
-            (255, 127, 0),  # Orange
-            (255, 255, 0),  # Yellow
-            (0, 255, 0),    # Green
-            (0, 0, 255),    # Blue
-            (75, 0, 130),   # Indigo
-            (148, 0, 211),  # Violet
-            (255, 192, 203) # Pink
-        ]
-        
-        # Create a list of surfaces for each frame
-        for color in colors:
-            # Create a surface for this frame
-            frame = pygame.Surface((SPRITE_WIDTH, SPRITE_HEIGHT), pygame.SRCALPHA)
-            
-            # Draw the main square body
-            pygame.draw.rect(frame, color, (0, 0, SPRITE_WIDTH, SPRITE_HEIGHT))
-            
-            # Add some details to show it's different (eyes and mouth)
-            # Eyes
-            eye_color = (255, 255, 255)
-            pygame.draw.circle(frame, eye_color, (20, 20), 8)
-            pygame.draw.circle(frame, eye_color, (44, 20), 8)
-            
-            # Pupils (move slightly based on frame to show animation)
-            pupil_x_offset = (self.current_frame % 3) - 1  # -1, 0, or 1
-            pupil_color = (0, 0, 0)
-            pygame.draw.circle(frame, pupil_color, (20 + pupil_x_offset, 20), 4)
-            pygame.draw.circle(frame, pupil_color, (44 + pupil_x_offset, 20), 4)
-            
-            # Mouth (changes with each frame)
-            mouth_height = 5 + (self.current_frame % 4) * 2
-            pygame.draw.rect(frame, (0, 0, 0), (22, 40, 20, mouth_height))
-            
-            # Add the frame to our animation list
-            self.frames.append(frame)
+        
+        # The frames are drawn once per size and palette, then shared by all sprites
+        self.frames = frame_cache.get(("animated_sprite", size, palette),
+                                      lambda: build_frames(size[0], size[1], palette))
     
     def update(self):
         # Move the sprite
+        self.previous_x = self.x
         self.x += self.speed
         
-        # Handle wrapping around the screen
+        # Handle wrapping around the screen (a jump, not something to draw in between)
         if self.x > SCREEN_WIDTH:
-            self.x = -SPRITE_WIDTH
-        
-        # Update animation frame
-        self.frame_count += 1
-        if self.frame_count >= ANIMATION_SPEED:
-            self.frame_count = 0
-            self.current_frame = (self.current_frame + 1) % ANIMATION_FRAMES
+            self.x = self.previous_x = -SPRITE_WIDTH
     
-    def draw(self, surface):
-        # Draw the current frame at the sprite's position
-        surface.blit(self.frames[self.current_frame], (self.x, self.y))
-        
+    def show_frame(self, index):
+        # Called by the timeline when the clip moves on to another frame
+        self.current_frame = index
+    
+    def blit_item(self, alpha=1.0):
+        # The current frame and where to draw it, `alpha` of the way from the previous to the current position
+        return self.frames[self.current_frame], (round(interpolate(self.previous_x, self.x, alpha)), self.y)
+    
+    def draw(self, surface, alpha=1.0):
+        # Draw the current frame
+        frame, position = self.blit_item(alpha)
+        surface.blit(frame, position)
+        self.draw_label(surface, position)
+    
+    def draw_label(self, surface, position):
         # Draw frame number for demonstration purposes
-        font = pygame.font.Font(None, 24)
-        frame_text = font.render(f"Frame: {self.current_frame + 1}/{ANIMATION_FRAMES}", True, BLACK)
-        surface.blit(frame_text, (self.x, self.y - 30))
+        frame_text = text_cache.render(f"Frame: {self.current_frame + 1}/{len(self.frames)}", 24, BLACK)
+        surface.blit(frame_text, (position[0], position[1] - 30))
+
+def blit_all(surface, items):
+    # One call for every sprite; pygame-ce's fblits skips building the list of changed rects
+    if hasattr(surface, "fblits"):
+        surface.fblits(items)
+    else:
+        surface.blits(items, doreturn=False)
 
 def main():
+    parser = argparse.ArgumentParser(description="Pygame Sprite Animation Demo")
+    parser.add_argument("--sprites", type=int, default=1, help="number of animated sprites")
+    parser.add_argument("--seed", type=int, default=0, help="seed for placing the extra sprites")
+    args = parser.parse_args()
+    
     clock = pygame.time.Clock()
     
     # Create animated sprite
     sprite = AnimatedSprite(50, SCREEN_HEIGHT // 2 - SPRITE_HEIGHT // 2, 2)
     
+    # Movement and animation advance once per 1/60 s step, whatever the frame rate
+    timestep = FixedTimestep(1 / FPS)
+    
+    # The frames change with game time, FRAME_DURATION seconds each
+    clip = AnimationClip.uniform(len(sprite.frames), FRAME_DURATION)
+    timeline = AnimationTimeline()
+    timeline.add(sprite, clip)
+    sprites = [sprite]
+    
+    # Extra sprites go anywhere above the ground, at their own speed and frame
+    rng = random.Random(args.seed)
+    for _ in range(args.sprites - 1):
+        extra = AnimatedSprite(rng.randrange(SCREEN_WIDTH), rng.randrange(70, SCREEN_HEIGHT - 40 - SPRITE_HEIGHT),
+                               rng.choice((1, 2, 3)))
+        timeline.add(extra, clip, start_frame=rng.randrange(len(clip)))
+        sprites.append(extra)
+    
     # Main game loop
     running = True
     while running:
@@ -110,27 +164,34 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
         
-        # Update sprite
-        sprite.update()
+        # Update sprite, once per step that is due
+        steps = timestep.advance()
+        for _ in range(steps):
+            for each in sprites:
+                each.update()
+        
+        # Animate by the game time those steps took
+        timeline.advance(steps * timestep.step)
         
         # Draw everything
+        frame_profiler.phase("draw")
         screen.fill(WHITE)
         
         # Draw ground
         pygame.draw.rect(screen, GRAY, (0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40))
         
-        # Draw sprite
-        sprite.draw(screen)
+        # Draw all sprites with one blits call, then the frame number of the first one
+        items = [each.blit_item(timestep.alpha) for each in sprites]
+        blit_all(screen, items)
+        sprite.draw_label(screen, items[0][1])
         
-        # Draw instructions and info
-        font = pygame.font.Font(None, 36)
-        title_text = font.render("Pygame Sprite Animation Demo", True, BLACK)
+        # Draw instructions and info (rendered once, then served from the cache)
+        title_text = text_cache.render("Pygame Sprite Animation Demo", 36, BLACK)
         screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 20))
         
-        info_font = pygame.font.Font(None, 24)
-        info_text1 = info_font.render("Pygame requires manual frame management", True, BLACK)
-        info_text2 = info_font.render("Each frame is a separate surface", True, BLACK)
-        info_text3 = info_font.render("Animation timing is handled with counter variables", True, BLACK)
+        info_text1 = text_cache.render("Pygame requires manual frame management", 24, BLACK)
+        info_text2 = text_cache.render("Each frame is a separate surface", 24, BLACK)
+        info_text3 = text_cache.render("Animation frames are picked by elapsed game time", 24, BLACK)
         
         screen.blit(info_text1, (20, SCREEN_HEIGHT - 100))
         screen.blit(info_text2, (20, SCREEN_HEIGHT - 75))
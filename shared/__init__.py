@@ -0,0 +1,5 @@
+"""Engine code shared by the Pygame and Arcade versions of the games.
+
+Nothing in here imports pygame or arcade at module level, so the same
+game logic can back both implementations (and run headless).
+"""
@@ -0,0 +1,123 @@
+"""Time-based sprite animation shared by the Pygame and Arcade games.
+
+The sprite animations used to count calls: the Pygame sprite moved to
+the next frame every ANIMATION_SPEED updates, the Arcade sprite on every
+update_animation() call whatever its delta_time. How fast a sprite
+animated depended on how often it was updated, and the two versions
+didn't animate at the same rate.
+
+An AnimationClip says instead how long each of its frames is shown, in
+seconds, and an AnimationTimeline turns elapsed time into the frame each
+sprite should show. The games advance the timeline by the time their
+FixedTimestep simulated, so dropped frames or an uncapped benchmark run
+don't change what is on screen at a given game time.
+
+Sprites that play the same clip from the same start time always show the
+same frame, so the timeline keeps them together in a track: the frame is
+looked up once per track and handed to the sprites only when it changes.
+A sprite only needs a show_frame(index) method.
+"""
+from bisect import bisect_right
+
+# Keeps e.g. five steps of 1/60 s from adding up to a hair less than 1/12 s
+TIME_TOLERANCE = 1e-9
+
+
+class AnimationClip:
+    """A sequence of frames, each shown for its own duration in seconds"""
+
+    def __init__(self, durations, loop=True):
+        self.durations = tuple(durations)
+        if not self.durations or min(self.durations) <= 0:
+            raise ValueError("a clip needs at least one frame, each with a positive duration")
+        self.loop = loop
+        # Time at which each frame ends, from the start of the clip
+        self.ends = []
+        end = 0.0
+        for duration in self.durations:
+            end += duration
+            self.ends.append(end)
+        self.length = end
+
+    @classmethod
+    def uniform(cls, frames, duration, loop=True):
+        """A clip of `frames` frames, all shown for `duration` seconds"""
+        return cls([duration] * frames, loop)
+
+    def __len__(self):
+        return len(self.durations)
+
+    def frame_at(self, time):
+        """Index of the frame shown `time` seconds into the clip"""
+        time += TIME_TOLERANCE
+        if self.loop:
+            time %= self.length
+        frame = bisect_right(self.ends, time)
+        # A clip that doesn't loop stays on its last frame
+        return min(frame, len(self.durations) - 1)
+
+    def frame_start(self, frame):
+        """Time into the clip at which `frame` starts showing"""
+        return self.ends[frame - 1] if frame > 0 else 0.0
+
+
+class AnimationTrack:
+    """The sprites that play one clip from the same start time"""
+
+    def __init__(self, clip, start):
+        self.clip = clip
+        self.start = start
+        self.sprites = []
+        self.frame = None
+
+
+class AnimationTimeline:
+    """Plays clips on sprites according to the time that has passed"""
+
+    def __init__(self):
+        self.time = 0.0
+        self.tracks = {}
+        self.track_of = {}
+        # Frame changes handed out to sprites, for stats()
+        self.frame_changes = 0
+
+    def add(self, sprite, clip, start_frame=0):
+        """Play `clip` on `sprite`, showing `start_frame` now; the sprite's frame is set right away"""
+        self.remove(sprite)
+        start = self.time - clip.frame_start(start_frame)
+        key = (clip, start)
+        track = self.tracks.get(key)
+        if track is None:
+            track = self.tracks[key] = AnimationTrack(clip, start)
+            track.frame = clip.frame_at(self.time - start)
+        track.sprites.append(sprite)
+        self.track_of[sprite] = track
+        sprite.show_frame(track.frame)
+
+    def remove(self, sprite):
+        """Stop animating `sprite`; it keeps the frame it shows"""
+        track = self.track_of.pop(sprite, None)
+        if track is None:
+            return
+        track.sprites.remove(sprite)
+        if not track.sprites:
+            del self.tracks[(track.clip, track.start)]
+
+    def advance(self, elapsed):
+        """Move the timeline `elapsed` seconds on and update the sprites whose frame changed"""
+        self.time += elapsed
+        for track in self.tracks.values():
+            frame = track.clip.frame_at(self.time - track.start)
+            if frame != track.frame:
+                track.frame = frame
+                for sprite in track.sprites:
+                    sprite.show_frame(frame)
+                self.frame_changes += len(track.sprites)
+
+    def stats(self):
+        return {
+            "time": self.time,
+            "tracks": len(self.tracks),
+            "sprites": len(self.track_of),
+            "frame_changes": self.frame_changes,
+        }
@@ -0,0 +1,324 @@
+"""Broad-phase collision detection between moving sprites and static blocks.
+
+Testing every sprite against every block is N*M rect tests per frame. A
+broad phase cheaply narrows that down to candidate pairs that *might*
+overlap; only those go through the exact (narrow-phase) colliderect test.
+
+All broad phases work on anything with pygame.Rect-style left/right/top/
+bottom attributes and report the same statistics, so they can be swapped
+from the command line and compared:
+
+    brute     every sprite against every block
+    hash      uniform grid; blocks are bucketed once, sprites look up their cells
+    sap       sweep and prune along x; the sprite order is kept between frames
+    quadtree  blocks are stored once in the quadtree leaves they overlap
+
+Blocks never move, so the grid and the quadtree are only rebuilt when the
+list of blocks changes.
+
+The counters live in CollisionStats, which collision code that isn't one
+of these broad phases (like Arcade's own collision checks) records into
+as well, so all of them can be reported side by side.
+"""
+import time
+
+# Every broad phase (and other collision stats) created in this process, so
+# tools can collect their numbers
+phases = []
+
+
+class CollisionStats:
+    """Per-frame collision counters and timings"""
+
+    name = None
+
+    def __init__(self, name=None):
+        if name is not None:
+            self.name = name
+        self.frames = 0
+        self.candidates = 0
+        self.hits = 0
+        self.total_time = 0.0
+        self.broad_time = 0.0
+        self.narrow_time = 0.0
+        self.last = {}
+        phases.append(self)
+
+    def record(self, candidates, hits, total_time, broad_time=None):
+        """Add one frame; `candidates` and `broad_time` are None when the method doesn't expose them"""
+        self.frames += 1
+        self.hits += hits
+        self.total_time += total_time
+        if candidates is None or self.candidates is None:
+            self.candidates = None
+        else:
+            self.candidates += candidates
+        if broad_time is None or self.broad_time is None:
+            self.broad_time = self.narrow_time = None
+        else:
+            self.broad_time += broad_time
+            self.narrow_time += total_time - broad_time
+        self.last = {
+            "candidates": candidates,
+            # Every candidate pair goes through the exact test
+            "tests": candidates,
+            "hits": hits,
+            "ms": total_time * 1000,
+        }
+
+    def stats(self):
+        frames = self.frames or 1
+
+        def per_frame(total, scale=1):
+            return None if total is None else total / frames * scale
+
+        return {
+            "broad_phase": self.name,
+            "frames": self.frames,
+            "candidates_per_frame": per_frame(self.candidates),
+            "tests_per_frame": per_frame(self.candidates),
+            "hits_per_frame": per_frame(self.hits),
+            "collision_ms": per_frame(self.total_time, 1000),
+            "broad_ms": per_frame(self.broad_time, 1000),
+            "narrow_ms": per_frame(self.narrow_time, 1000),
+        }
+
+
+class BroadPhase(CollisionStats):
+    """Base class of the broad phases: runs the narrow phase and records the stats"""
+
+    def candidate_pairs(self, sprites, blocks):
+        """Yield (sprite index, block index) pairs that may overlap"""
+        raise NotImplementedError
+
+    def collisions(self, sprites, blocks):
+        """Return the set of indices of sprites that overlap any block"""
+        start = time.perf_counter()
+        pairs = list(self.candidate_pairs(sprites, blocks))
+        middle = time.perf_counter()
+
+        colliding = set()
+        for sprite_index, block_index in pairs:
+            if sprites[sprite_index].colliderect(blocks[block_index]):
+                colliding.add(sprite_index)
+        end = time.perf_counter()
+
+        self.record(len(pairs), len(colliding), end - start, middle - start)
+        return colliding
+
+
+class BruteForce(BroadPhase):
+    """No broad phase at all: N*M candidates"""
+
+    name = "brute"
+
+    def candidate_pairs(self, sprites, blocks):
+        block_indices = range(len(blocks))
+        for sprite_index in range(len(sprites)):
+            for block_index in block_indices:
+                yield sprite_index, block_index
+
+
+class SpatialHash(BroadPhase):
+    """Uniform grid of `cell_size` pixel cells holding the blocks"""
+
+    name = "hash"
+
+    def __init__(self, cell_size=64):
+        super().__init__()
+        self.cell_size = cell_size
+        self.cells = {}
+        self.blocks_key = None
+
+    def cell_range(self, rect):
+        size = self.cell_size
+        return (
+            range(rect.left // size, (rect.right - 1) // size + 1),
+            range(rect.top // size, (rect.bottom - 1) // size + 1),
+        )
+
+    def build(self, blocks):
+        self.cells = {}
+        for index, rect in enumerate(blocks):
+            columns, rows = self.cell_range(rect)
+            for x in columns:
+                for y in rows:
+                    self.cells.setdefault((x, y), []).append(index)
+        self.blocks_key = (id(blocks), len(blocks))
+
+    def candidate_pairs(self, sprites, blocks):
+        if self.blocks_key != (id(blocks), len(blocks)):
+            self.build(blocks)
+
+        cells = self.cells
+        for sprite_index, rect in enumerate(sprites):
+            columns, rows = self.cell_range(rect)
+            if len(columns) == 1 and len(rows) == 1:
+                # The common case: a sprite inside one cell can't see a block twice
+                for block_index in cells.get((columns[0], rows[0]), ()):
+                    yield sprite_index, block_index
+                continue
+
+            seen = set()
+            for x in columns:
+                for y in rows:
+                    for block_index in cells.get((x, y), ()):
+                        if block_index not in seen:
+                            seen.add(block_index)
+                            yield sprite_index, block_index
+
+
+class SweepAndPrune(BroadPhase):
+    """Sweep the sprites along x against the blocks sorted by left edge"""
+
+    name = "sap"
+
+    def __init__(self):
+        super().__init__()
+        # Kept in last frame's order, so re-sorting only has to fix up the
+        # few sprites that overtook each other (Timsort is ~linear on that)
+        self.sprite_order = []
+        self.block_order = []
+        self.blocks_key = None
+
+    def candidate_pairs(self, sprites, blocks):
+        if self.blocks_key != (id(blocks), len(blocks)):
+            self.block_order = sorted(range(len(blocks)), key=lambda index: blocks[index].left)
+            self.blocks_key = (id(blocks), len(blocks))
+        if len(self.sprite_order) != len(sprites):
+            self.sprite_order = list(range(len(sprites)))
+        self.sprite_order.sort(key=lambda index: sprites[index].left)
+        if not sprites:
+            return
+
+        block_order = self.block_order
+        block_count = len(block_order)
+        # Sprite lefts only grow during the sweep, their rights don't; so blocks
+        # are let in by the widest possible sprite and then checked exactly
+        reach = max(rect.width for rect in sprites)
+        next_block = 0
+        active = []
+        for sprite_index in self.sprite_order:
+            rect = sprites[sprite_index]
+            left = rect.left
+            right = rect.right
+            while next_block < block_count and blocks[block_order[next_block]].left < left + reach:
+                active.append(block_order[next_block])
+                next_block += 1
+
+            # Drop the blocks the sweep has passed for good
+            active = [index for index in active if blocks[index].right > left]
+            for block_index in active:
+                if blocks[block_index].left < right:
+                    yield sprite_index, block_index
+
+
+class QuadTree(BroadPhase):
+    """Blocks stored in a quadtree; each sprite queries the nodes it overlaps"""
+
+    name = "quadtree"
+
+    def __init__(self, capacity=8, max_depth=6):
+        super().__init__()
+        self.capacity = capacity
+        self.max_depth = max_depth
+        self.root = None
+        self.blocks_key = None
+
+    def build(self, blocks):
+        if blocks:
+            left = min(rect.left for rect in blocks)
+            top = min(rect.top for rect in blocks)
+            right = max(rect.right for rect in blocks)
+            bottom = max(rect.bottom for rect in blocks)
+        else:
+            left = top = right = bottom = 0
+        self.root = QuadNode(left, top, right, bottom, 0)
+        for index, rect in enumerate(blocks):
+            self.root.insert(index, rect, blocks, self.capacity, self.max_depth)
+        self.blocks_key = (id(blocks), len(blocks))
+
+    def candidate_pairs(self, sprites, blocks):
+        if self.blocks_key != (id(blocks), len(blocks)):
+            self.build(blocks)
+
+        root = self.root
+        for sprite_index, rect in enumerate(sprites):
+            # Sprites outside the blocks' bounding box can't hit anything
+            if root.overlaps(rect):
+                for block_index in root.query(rect, blocks):
+                    yield sprite_index, block_index
+
+
+class QuadNode:
+    """One quadtree node; blocks live in the leaves they overlap"""
+
+    def __init__(self, left, top, right, bottom, depth):
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+        self.depth = depth
+        self.items = []
+        self.children = None
+
+    def overlaps(self, rect):
+        # Closed on the outer edges so blocks on the root's border still land in a leaf
+        return (rect.left <= self.right and self.left <= rect.right
+                and rect.top <= self.bottom and self.top <= rect.bottom)
+
+    def split(self):
+        center_x = (self.left + self.right) // 2
+        center_y = (self.top + self.bottom) // 2
+        depth = self.depth + 1
+        self.children = [
+            QuadNode(self.left, self.top, center_x, center_y, depth),
+            QuadNode(center_x, self.top, self.right, center_y, depth),
+            QuadNode(self.left, center_y, center_x, self.bottom, depth),
+            QuadNode(center_x, center_y, self.right, self.bottom, depth),
+        ]
+
+    def insert(self, index, rect, blocks, capacity, max_depth):
+        if self.children is not None:
+            # A block crossing a split line goes into every child it touches
+            for child in self.children:
+                if child.overlaps(rect):
+                    child.insert(index, rect, blocks, capacity, max_depth)
+            return
+
+        self.items.append(index)
+        if len(self.items) > capacity and self.depth < max_depth:
+            self.split()
+            items, self.items = self.items, []
+            for item in items:
+                self.insert(item, blocks[item], blocks, capacity, max_depth)
+
+    def query(self, rect, blocks):
+        # Iterative, so deep trees don't cost a Python call per level
+        leaves = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                if node.items:
+                    leaves.append(node.items)
+                continue
+            for child in node.children:
+                # Strict, like colliderect: touching a leaf's edge can't produce a hit
+                if (rect.left < child.right and child.left < rect.right
+                        and rect.top < child.bottom and child.top < rect.bottom):
+                    stack.append(child)
+
+        if len(leaves) == 1:
+            return leaves[0]
+        # A block that spans several of these leaves must only be reported once
+        return {index for items in leaves for index in items}
+
+
+# Command line name -> class
+BROAD_PHASES = {
+    BruteForce.name: BruteForce,
+    SpatialHash.name: SpatialHash,
+    SweepAndPrune.name: SweepAndPrune,
+    QuadTree.name: QuadTree,
+}
@@ -0,0 +1,69 @@
+"""Scene layout for the scaled-up collision demos.
+
+Both collision demos build their extra sprites and blocks from these
+functions, so `--sprites N --blocks M --seed S` describes the same scene
+in the Pygame and the Arcade version and their timings can be compared.
+
+Everything is in Pygame screen coordinates: (x, y) is the top-left
+corner and y grows downwards. The Arcade demo flips y when it creates
+its sprites.
+"""
+import math
+import random
+
+SPRITE_SPEEDS = (-3, -2, -1, 1, 2, 3)
+
+
+def random_sprites(count, screen_width, screen_height, seed=0):
+    """(x, y, size, speed_x, speed_y) for `count` small square sprites"""
+    rng = random.Random(seed)
+    sprites = []
+    for _ in range(count):
+        size = rng.randint(4, 16)
+        sprites.append((
+            rng.randrange(screen_width - size), rng.randrange(screen_height - size), size,
+            rng.choice(SPRITE_SPEEDS), rng.choice(SPRITE_SPEEDS),
+        ))
+    return sprites
+
+
+def random_blocks(count, screen_width, screen_height, seed=0):
+    """(x, y, width, height) for `count` blocks of random size and place"""
+    # A separate stream from the sprites, so changing one count keeps the other layout
+    rng = random.Random(f"blocks-{seed}")
+    blocks = []
+    for _ in range(count):
+        width, height = rng.randint(10, 60), rng.randint(10, 60)
+        blocks.append((rng.randrange(screen_width - width), rng.randrange(screen_height - height), width, height))
+    return blocks
+
+
+def grid_blocks(count, screen_width, screen_height, seed=0):
+    """(x, y, width, height) for `count` equal blocks on an even grid over the screen
+
+    `seed` is unused; it keeps the signature the same as random_blocks().
+    """
+    if count <= 0:
+        return []
+    columns = max(1, round(math.sqrt(count * screen_width / screen_height)))
+    rows = math.ceil(count / columns)
+    cell_width = screen_width / columns
+    cell_height = screen_height / rows
+    # Each block takes half its cell's width and height, centered in the cell
+    width = max(1, int(cell_width / 2))
+    height = max(1, int(cell_height / 2))
+
+    blocks = []
+    for index in range(count):
+        row, column = divmod(index, columns)
+        x = int(column * cell_width + (cell_width - width) / 2)
+        y = int(row * cell_height + (cell_height - height) / 2)
+        blocks.append((x, y, width, height))
+    return blocks
+
+
+# Command line name -> layout function
+BLOCK_LAYOUTS = {
+    "grid": grid_blocks,
+    "random": random_blocks,
+}
@@ -0,0 +1,98 @@
+"""Dirty-rectangle rendering for the Pygame games.
+
+Filling and flipping the whole window every frame costs the same whether
+one small box moved or everything did. The renderer here instead keeps
+the screen rect (and optionally some state, like a color or a text
+value) of everything that can change between frames. Each frame, only
+the places where something moved, appeared, disappeared or changed are
+cleared and redrawn, and only those rects are handed to
+pygame.display.update().
+
+The scene is redrawn with a clip rect set to each dirty region, so the
+game keeps a single draw function and objects that overlap a dirty region
+(e.g. a static block the player passes over) are repainted correctly.
+That costs one scene pass per region, so once there are more than
+`max_rects` regions, or they cover more than `max_fraction` of the
+screen, the frame is repainted and presented in full instead.
+
+pygame is imported lazily, like in shared.text_cache.
+"""
+
+
+class DirtyRectRenderer:
+    """Redraws only the parts of the screen where tracked objects changed"""
+
+    def __init__(self, surface, background, max_rects=32, max_fraction=0.5):
+        self.surface = surface
+        self.background = background
+        self.max_rects = max_rects
+        self.max_fraction = max_fraction
+        self.previous = {}
+        self.current = {}
+        # Nothing is on screen yet, so the first frame is drawn in full
+        self.full_redraw = True
+        self.frames = 0
+        self.dirty_area = 0
+
+    def track(self, name, rect, state=None):
+        """Register where `name` is drawn this frame; `state` is anything else that changes its look"""
+        import pygame
+
+        self.current[name] = (pygame.Rect(rect), state)
+
+    def dirty_rects(self):
+        """Compare this frame with the previous one and return the regions to repaint"""
+        import pygame
+
+        if self.full_redraw:
+            self.full_redraw = False
+            rects = [self.surface.get_rect()]
+        else:
+            rects = []
+            for name in self.previous.keys() | self.current.keys():
+                old = self.previous.get(name)
+                new = self.current.get(name)
+                if old == new:
+                    continue
+                old_rect = old[0] if old else None
+                new_rect = new[0] if new else None
+                if old_rect and new_rect and old_rect.colliderect(new_rect):
+                    # A small move: one rect covering both positions
+                    rects.append(old_rect.union(new_rect))
+                else:
+                    rects.extend(rect for rect in (old_rect, new_rect) if rect)
+
+            screen_rect = self.surface.get_rect()
+            rects = [rect.clip(screen_rect) for rect in rects]
+            rects = [rect for rect in rects if rect.width and rect.height]
+
+            # Past this point one full repaint is cheaper than many partial ones
+            area = sum(rect.width * rect.height for rect in rects)
+            if len(rects) > self.max_rects or area > self.max_fraction * screen_rect.width * screen_rect.height:
+                rects = [screen_rect]
+
+        self.previous, self.current = self.current, {}
+        self.frames += 1
+        self.dirty_area += sum(rect.width * rect.height for rect in rects)
+        return rects
+
+    def render(self, draw_scene):
+        """Repaint the dirty regions with `draw_scene()` and return them for display.update()"""
+        rects = self.dirty_rects()
+        for rect in rects:
+            self.surface.set_clip(rect)
+            self.surface.fill(self.background, rect)
+            draw_scene()
+        self.surface.set_clip(None)
+        return rects
+
+    def invalidate(self):
+        """Repaint the whole screen on the next frame, e.g. after the window was exposed"""
+        self.full_redraw = True
+
+    def stats(self):
+        screen_area = self.surface.get_width() * self.surface.get_height()
+        return {
+            "frames": self.frames,
+            "mean_dirty_fraction": self.dirty_area / (self.frames * screen_area) if self.frames else 0.0,
+        }
@@ -0,0 +1,174 @@
+"""Struct-of-arrays store for the moving sprites of the collision demo.
+
+MovingSprite.update() moves one Python object at a time and decides per
+object whether to bounce. The store keeps the positions, sizes and
+velocities of all sprites in contiguous NumPy arrays instead, so a frame
+of movement, edge bouncing and overlap testing against the stationary
+blocks is a handful of array operations, whatever the sprite count.
+
+The rules are exactly those of MovingSprite.update() and
+pygame.Rect.colliderect(): move first, then reverse a velocity if the
+sprite is past an edge, and count two rects as overlapping only if they
+share some area (touching edges don't collide).
+
+Unlike the other shared modules this one needs NumPy; the games only
+import it when the NumPy physics is selected.
+"""
+import numpy as np
+
+# Up to this many blocks, each block is tested against all boxes in turn
+BLOCK_LOOP_MAX = 8
+# Past that, a summed-area table of the blocks answers "does this box cover
+# any block pixel" in four lookups per box, as long as the table is no
+# bigger than this many cells...
+COVERAGE_MAX_CELLS = 1 << 24
+# ...otherwise boxes are tested in chunks against all blocks at once; this
+# bounds the size of the box x block boolean matrix built per chunk
+OVERLAP_CHUNK_ELEMENTS = 1 << 22
+
+
+class EntityStore:
+    """Positions, sizes and velocities of many axis-aligned boxes"""
+
+    def __init__(self, x, y, width, height, speed_x, speed_y):
+        # pygame.Rect stores 32-bit ints too, and half the width means half the memory traffic
+        self.x = np.array(x, dtype=np.int32)
+        self.y = np.array(y, dtype=np.int32)
+        self.width = np.array(width, dtype=np.int32)
+        self.height = np.array(height, dtype=np.int32)
+        self.speed_x = np.array(speed_x, dtype=np.int32)
+        self.speed_y = np.array(speed_y, dtype=np.int32)
+        self.colliding = np.zeros(len(self.x), dtype=bool)
+        # Positions before the last update, for drawing in between updates
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+        # Scratch space, so a frame doesn't allocate fresh arrays
+        self.right = np.empty_like(self.x)
+        self.bottom = np.empty_like(self.y)
+        self.overlap = np.empty(len(self.x), dtype=bool)
+        self.test = np.empty(len(self.x), dtype=bool)
+        # Summed-area table of the blocks, rebuilt only when the blocks change
+        self.coverage_key = None
+        self.coverage = None
+        self.coverage_origin = (0, 0)
+
+    @classmethod
+    def from_sprites(cls, sprites):
+        """Copy the state of objects with a pygame.Rect `rect` and speed_x/speed_y"""
+        return cls(
+            [sprite.rect.x for sprite in sprites],
+            [sprite.rect.y for sprite in sprites],
+            [sprite.rect.width for sprite in sprites],
+            [sprite.rect.height for sprite in sprites],
+            [sprite.speed_x for sprite in sprites],
+            [sprite.speed_y for sprite in sprites],
+        )
+
+    def __len__(self):
+        return len(self.x)
+
+    def update(self, screen_width, screen_height):
+        """Move every box by its velocity and bounce the ones past a screen edge"""
+        np.copyto(self.previous_x, self.x)
+        np.copyto(self.previous_y, self.y)
+        self.x += self.speed_x
+        self.y += self.speed_y
+
+        # Same test as MovingSprite.update(), done for all boxes at once
+        np.add(self.x, self.width, out=self.right)
+        np.add(self.y, self.height, out=self.bottom)
+        self.speed_x[(self.x < 0) | (self.right > screen_width)] *= -1
+        self.speed_y[(self.y < 0) | (self.bottom > screen_height)] *= -1
+
+    def collide(self, block_rects):
+        """Flag the boxes that overlap any of `block_rects`; returns the flag array"""
+        self.colliding[:] = False
+        if not block_rects or not len(self):
+            return self.colliding
+
+        np.add(self.x, self.width, out=self.right)
+        np.add(self.y, self.height, out=self.bottom)
+        blocks = [(rect.left, rect.top, rect.right, rect.bottom) for rect in block_rects]
+        if len(blocks) <= BLOCK_LOOP_MAX:
+            self._collide_per_block(blocks)
+        elif self._build_coverage(blocks):
+            self._collide_coverage()
+        else:
+            self._collide_chunked(blocks)
+        return self.colliding
+
+    def _collide_per_block(self, blocks):
+        overlap, test = self.overlap, self.test
+        for block_left, block_top, block_right, block_bottom in blocks:
+            np.less(self.x, block_right, out=overlap)
+            np.less(block_left, self.right, out=test)
+            overlap &= test
+            np.less(self.y, block_bottom, out=test)
+            overlap &= test
+            np.less(block_top, self.bottom, out=test)
+            overlap &= test
+            self.colliding |= overlap
+
+    def _build_coverage(self, blocks):
+        """Make the summed-area table for `blocks`; False if it would be too big"""
+        key = tuple(blocks)
+        if key == self.coverage_key:
+            return self.coverage is not None
+
+        self.coverage_key = key
+        self.coverage = None
+        left = min(block[0] for block in blocks)
+        top = min(block[1] for block in blocks)
+        width = max(block[2] for block in blocks) - left
+        height = max(block[3] for block in blocks) - top
+        if width <= 0 or height <= 0 or (width + 1) * (height + 1) > COVERAGE_MAX_CELLS:
+            return False
+
+        # 1 for every pixel covered by at least one block
+        mask = np.zeros((height, width), dtype=np.int32)
+        for block_left, block_top, block_right, block_bottom in blocks:
+            mask[max(block_top - top, 0):block_bottom - top, max(block_left - left, 0):block_right - left] = 1
+
+        # coverage[y, x] = number of covered pixels above and left of (x, y)
+        self.coverage = np.zeros((height + 1, width + 1), dtype=np.int32)
+        self.coverage[1:, 1:] = mask.cumsum(axis=0).cumsum(axis=1)
+        self.coverage_origin = (left, top)
+        return True
+
+    def _collide_coverage(self):
+        # With integer coordinates, two rects share some area exactly when they
+        # share a pixel, so a box collides if it covers any block pixel
+        left, top = self.coverage_origin
+        height, width = self.coverage.shape
+        x0 = np.clip(self.x - left, 0, width - 1)
+        x1 = np.clip(self.right - left, 0, width - 1)
+        y0 = np.clip(self.y - top, 0, height - 1)
+        y1 = np.clip(self.bottom - top, 0, height - 1)
+        table = self.coverage
+        covered = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+        np.greater(covered, 0, out=self.colliding)
+
+    def _collide_chunked(self, blocks):
+        block_left, block_top, block_right, block_bottom = np.array(blocks, dtype=np.int32).T
+
+        # The boolean matrices stay small however many boxes there are
+        chunk = max(1, OVERLAP_CHUNK_ELEMENTS // len(blocks))
+        for start in range(0, len(self), chunk):
+            end = start + chunk
+            overlap = (
+                (self.x[start:end, None] < block_right) & (block_left < self.right[start:end, None])
+                & (self.y[start:end, None] < block_bottom) & (block_top < self.bottom[start:end, None])
+            )
+            self.colliding[start:end] = overlap.any(axis=1)
+
+    def copy_to_sprites(self, sprites):
+        """Write positions (current and previous), velocities and collision flags back to the sprite objects"""
+        rows = zip(self.x.tolist(), self.y.tolist(), self.previous_x.tolist(), self.previous_y.tolist(),
+                   self.speed_x.tolist(), self.speed_y.tolist(), self.colliding.tolist())
+        for sprite, (x, y, previous_x, previous_y, speed_x, speed_y, colliding) in zip(sprites, rows):
+            sprite.rect.x = x
+            sprite.rect.y = y
+            sprite.previous = (previous_x, previous_y)
+            sprite.speed_x = speed_x
+            sprite.speed_y = speed_y
+            sprite.in_collision = colliding
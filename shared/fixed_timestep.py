@@ -0,0 +1,76 @@
+"""Fixed-timestep game clock shared by the Pygame and Arcade games.
+
+The games used to advance their simulation once per rendered frame, so
+the game itself ran slower whenever a frame was slow and faster on an
+uncapped headless run. Instead, each frame hands the time that really
+passed to a FixedTimestep, which answers how many simulation steps of
+exactly `step` seconds are due. The simulation then advances the same
+way at 30, 60 or 240 FPS.
+
+What is left over is less than one step; `alpha` says how far into the
+next step the frame is, so a game can draw moving objects in between
+their previous and current position (interpolate()) instead of letting
+them stutter when the render rate isn't a multiple of the step rate.
+
+When the benchmark harness runs a game uncapped it sets the
+GAME_FRAME_TIME environment variable, and every frame then counts as
+that many seconds however long it really took. The game runs as fast as
+the machine allows but the simulation stays the same, frame by frame,
+as on a capped run.
+"""
+import os
+import time
+
+# Seconds per rendered frame forced by the harness, see above
+FRAME_TIME_ENV = "GAME_FRAME_TIME"
+
+
+class FixedTimestep:
+    """Turns elapsed wall-clock time into a whole number of fixed simulation steps"""
+
+    def __init__(self, step=1 / 60, max_frame_time=0.25):
+        self.step = step
+        # A frame that took longer than this (a breakpoint, a dragged window)
+        # is cut short instead of triggering a burst of catch-up steps
+        self.max_frame_time = max_frame_time
+        frame_time = os.environ.get(FRAME_TIME_ENV)
+        self.frame_time = float(frame_time) if frame_time else None
+        self.accumulator = 0.0
+        self.steps = 0
+        self.last_time = None
+
+    def advance(self, elapsed=None):
+        """Add one frame's worth of time and return how many steps to simulate
+
+        `elapsed` is the frame time in seconds (e.g. Arcade's delta_time);
+        without it, the time since the previous call is measured here.
+        """
+        now = time.perf_counter()
+        if self.frame_time is not None:
+            elapsed = self.frame_time
+        elif elapsed is None:
+            elapsed = 0.0 if self.last_time is None else now - self.last_time
+        self.last_time = now
+
+        self.accumulator += min(elapsed, self.max_frame_time)
+        # The small tolerance keeps e.g. six frames of 1/60 s from adding up
+        # to a hair less than one step of 1/10 s
+        steps = int(self.accumulator / self.step + 1e-9)
+        self.accumulator = max(0.0, self.accumulator - steps * self.step)
+        self.steps += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """How far the frame is between the last step and the next one, from 0 to 1"""
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self):
+        """Forget the time left over, e.g. after a pause or a restart"""
+        self.accumulator = 0.0
+        self.last_time = None
+
+
+def interpolate(previous, current, alpha):
+    """Value `alpha` of the way from `previous` to `current`"""
+    return previous + (current - previous) * alpha
@@ -0,0 +1,46 @@
+"""Shared animation frames for the Pygame sprites.
+
+Every sprite of the same kind animates through the same pictures, but an
+AnimatedSprite used to draw its own copy of every frame when it was
+created: eight 64x64 RGBA surfaces, 128 KiB per sprite. The cache builds
+the frame set of each key, e.g. (size, palette), once, and every sprite
+with that key keeps a reference to the same tuple of surfaces instead.
+A sprite is then only its position and its animation cursor.
+
+The cache doesn't import pygame itself; the build function passed to
+get() does the drawing.
+"""
+
+
+class FrameCache:
+    """Frame sets by key, built on first use and shared afterwards"""
+
+    def __init__(self):
+        self.frame_sets = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        """Return the frames for `key`, calling `build()` for them the first time"""
+        frames = self.frame_sets.get(key)
+        if frames is None:
+            self.misses += 1
+            frames = self.frame_sets[key] = tuple(build())
+        else:
+            self.hits += 1
+        return frames
+
+    def clear(self):
+        self.frame_sets.clear()
+
+    def stats(self):
+        return {
+            "frame_sets": len(self.frame_sets),
+            "frames": sum(len(frames) for frames in self.frame_sets.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# One cache for the whole process, like shared.text_cache.text_cache
+frame_cache = FrameCache()
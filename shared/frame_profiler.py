@@ -0,0 +1,116 @@
+"""Per-phase frame timing shared by the Pygame and Arcade games.
+
+The frame time alone doesn't say why a frame was slow. The profiler
+splits every frame into phases - event handling, update, collision,
+draw, frame capture and present - and records how long each one took, so a spike can be
+traced to the phase that caused it.
+
+Code marks where a phase begins with phase(name); the time until the next
+mark is charged to that phase, and a phase entered several times in one
+frame (collision inside every simulation step, say) adds up. end_frame()
+closes the frame. The benchmark harness marks the phases around the
+library calls it patches (event polling, Clock.tick and presenting the
+frame on the Pygame side, its own loop on the Arcade side); the games
+only mark what the harness can't see, like the start of drawing or the
+collision checks inside an update.
+
+Everything goes into preallocated arrays used as ring buffers: the last
+`capacity` frames with their phase totals, and their individual phase
+segments for the trace. Nothing is allocated per frame, and the profiler
+does nothing at all until it is enabled.
+
+perf.phase_report turns the recorded frames into per-phase percentiles
+and a Chrome trace.
+"""
+import time
+from array import array
+
+PHASES = ("events", "update", "collision", "draw", "capture", "present")
+
+# Segments kept per frame of capacity; a frame with more only loses
+# segments from the trace, never from the phase totals
+SEGMENTS_PER_FRAME = 16
+
+
+class FrameProfiler:
+    """Phase timings of the last `capacity` frames"""
+
+    def __init__(self, capacity=3600, phases=PHASES):
+        self.enabled = False
+        self.capacity = capacity
+        self.phases = phases
+        self.phase_index = {name: index for index, name in enumerate(phases)}
+        self.origin = time.perf_counter()
+
+        # Frame n lives in slot n % capacity
+        self.frame_start = array("d", bytes(8 * capacity))
+        self.frame_end = array("d", bytes(8 * capacity))
+        self.durations = array("d", bytes(8 * capacity * len(phases)))
+        self.frames = 0
+
+        self.segment_capacity = capacity * SEGMENTS_PER_FRAME
+        self.segment_phase = array("B", bytes(self.segment_capacity))
+        self.segment_start = array("d", bytes(8 * self.segment_capacity))
+        self.segment_end = array("d", bytes(8 * self.segment_capacity))
+        self.segments = 0
+
+        # Phase being timed and when it began; None between frames
+        self.current = None
+        self.current_start = 0.0
+        self.in_frame = False
+
+    def enable(self):
+        self.enabled = True
+
+    def phase(self, name):
+        """Charge the time from now until the next mark to phase `name`"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if not self.in_frame:
+            # The first mark after end_frame() starts the next frame
+            self.in_frame = True
+            slot = self.frames % self.capacity
+            self.frame_start[slot] = now
+            row = slot * len(self.phases)
+            for index in range(row, row + len(self.phases)):
+                self.durations[index] = 0.0
+        else:
+            self._close_phase(now)
+        self.current = self.phase_index[name]
+        self.current_start = now
+
+    def end_frame(self):
+        """Close the phase being timed and the frame"""
+        if not self.enabled or not self.in_frame:
+            return
+        now = time.perf_counter()
+        self._close_phase(now)
+        self.frame_end[self.frames % self.capacity] = now
+        self.frames += 1
+        self.current = None
+        self.in_frame = False
+
+    def _close_phase(self, now):
+        slot = self.frames % self.capacity
+        self.durations[slot * len(self.phases) + self.current] += now - self.current_start
+        segment = self.segments % self.segment_capacity
+        self.segment_phase[segment] = self.current
+        self.segment_start[segment] = self.current_start
+        self.segment_end[segment] = now
+        self.segments += 1
+
+    def kept_frames(self):
+        """Numbers of the frames still in the ring buffer, oldest first"""
+        return range(max(0, self.frames - self.capacity), self.frames)
+
+    def frame_phases(self, frame):
+        """(frame time, {phase: seconds}) of a kept frame"""
+        slot = frame % self.capacity
+        row = slot * len(self.phases)
+        phases = {name: self.durations[row + index] for index, name in enumerate(self.phases)}
+        return self.frame_end[slot] - self.frame_start[slot], phases
+
+
+# One profiler for the whole process, like shared.frame_cache.frame_cache
+frame_profiler = FrameProfiler()
@@ -0,0 +1,102 @@
+"""Retained HUD text for the Arcade games.
+
+arcade.draw_text() lays the string out again on every call. The HUD
+instead creates one pyglet label per piece of text up front, only touches
+a label when its content, position or visibility actually changes, and
+draws all of them with a single batch.
+
+With ``legacy=True`` the same HUD falls back to one arcade.draw_text()
+call per label, so a demo can measure both approaches with the same code.
+The time spent in draw() is recorded either way.
+
+arcade and pyglet are imported lazily, like pygame in shared.text_cache.
+"""
+import time
+
+# Same default fonts as arcade.draw_text()
+DEFAULT_FONT = ("calibri", "arial")
+
+# Every HUD created in this process, so tools can collect their timings
+huds = []
+
+
+class Hud:
+    """A set of named text labels drawn as one batch"""
+
+    def __init__(self, legacy=False):
+        import pyglet
+
+        self.legacy = legacy
+        self.batch = pyglet.graphics.Batch()
+        self.labels = {}
+        self.updates = 0
+        self.frames = 0
+        self.draw_time = 0.0
+        huds.append(self)
+
+    def add(self, name, text, x, y, color, font_size, anchor_x="left", anchor_y="baseline", visible=True):
+        """Create a label; this is the only time its text is laid out from scratch"""
+        import pyglet
+
+        self.labels[name] = pyglet.text.Label(
+            text,
+            font_name=DEFAULT_FONT,
+            font_size=font_size,
+            color=tuple(color[:3]) + (color[3] if len(color) == 4 else 255,),
+            x=x,
+            y=y,
+            anchor_x=anchor_x,
+            anchor_y=anchor_y,
+            batch=self.batch,
+        )
+        self.labels[name].visible = visible
+
+    def set_text(self, name, text):
+        label = self.labels[name]
+        if label.text != text:
+            label.text = text
+            self.updates += 1
+
+    def set_position(self, name, x, y):
+        label = self.labels[name]
+        if label.position != (x, y):
+            label.position = (x, y)
+            self.updates += 1
+
+    def set_visible(self, name, visible):
+        label = self.labels[name]
+        if label.visible != visible:
+            label.visible = visible
+            self.updates += 1
+
+    def draw(self):
+        start = time.perf_counter()
+        if self.legacy:
+            self._draw_immediate()
+        else:
+            import arcade
+            with arcade.get_window().ctx.pyglet_rendering():
+                self.batch.draw()
+        self.draw_time += time.perf_counter() - start
+        self.frames += 1
+
+    def _draw_immediate(self):
+        # The pre-HUD way: lay out and upload every string every frame
+        import arcade
+
+        for label in self.labels.values():
+            if not label.visible:
+                continue
+            arcade.draw_text(
+                label.text, label.x, label.y, label.color, label.font_size,
+                anchor_x=label.anchor_x, anchor_y=label.anchor_y,
+            )
+
+    def stats(self):
+        return {
+            "legacy": self.legacy,
+            "labels": len(self.labels),
+            "updates": self.updates,
+            "frames": self.frames,
+            "mean_draw_ms": self.draw_time / self.frames * 1000 if self.frames else 0.0,
+        }
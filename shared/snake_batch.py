@@ -0,0 +1,190 @@
+"""Many headless snake games stepped at once, for bots and training.
+
+SnakeBody moves one snake at a time and the games wrap it in a window.
+SnakeBatch keeps the state of `count` independent games in NumPy arrays
+instead and advances all of them with one step() call, without pygame
+or arcade.
+
+The rules are those of the two games:
+
+- a move into the opposite of the current direction is ignored
+- running into any segment of the snake, the tail included, ends the game
+- eating grows the snake by one and places new food on a random free cell
+- filling the whole board ends the game (won)
+- `wrap=False` ends the game at the walls, like the Pygame version;
+  `wrap=True` wraps around the edges, like the Arcade version
+
+The body is not stored as a list of segments. Every cell remembers the
+move number at which a head last entered it, and a game's cell is part
+of the snake while `moves - entered < length`. Moving the head is then a
+single write per game and the tail drops off by itself, whatever the
+snake's length.
+
+Cells are numbered `y * width + x`, with y growing downwards like the
+Pygame grid. Unlike the other shared modules this one needs NumPy.
+"""
+import numpy as np
+
+# Directions, also the actions step() takes
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
+
+# (dx, dy) for each direction
+OFFSETS = np.array([(0, -1), (1, 0), (0, 1), (-1, 0)], dtype=np.int32)
+
+# "Entered" time of a cell no snake has visited; far enough in the past to
+# never count as part of the body
+EMPTY = np.iinfo(np.int32).min // 2
+
+# Random guesses per game before the food is placed by listing the free cells
+FOOD_TRIES = 8
+
+
+class SnakeBatch:
+    """`count` independent snake games on a `width` x `height` grid"""
+
+    def __init__(self, count, width=40, height=30, wrap=False, reset_on_death=True, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.wrap = wrap
+        # Start a finished game over in the same step, or leave it finished
+        self.reset_on_death = reset_on_death
+        self.rng = np.random.default_rng(seed)
+
+        self.entered = np.full((count, self.cells), EMPTY, dtype=np.int32)
+        self.head_x = np.empty(count, dtype=np.int32)
+        self.head_y = np.empty(count, dtype=np.int32)
+        self.direction = np.empty(count, dtype=np.int32)
+        self.length = np.empty(count, dtype=np.int32)
+        self.moves = np.empty(count, dtype=np.int32)
+        self.score = np.empty(count, dtype=np.int32)
+        # Food cell, or -1 once the board is full
+        self.food = np.empty(count, dtype=np.int32)
+        self.alive = np.empty(count, dtype=bool)
+        self.games = np.arange(count)
+
+        # Totals over all games, for stats()
+        self.steps = 0
+        self.episodes = 0
+        self.finished_score = 0
+        self.reset()
+
+    def __len__(self):
+        return self.count
+
+    def reset(self, games=None):
+        """Start the given games (all by default) over: a one-cell snake in the middle, heading right"""
+        games = self.games if games is None else np.asarray(games)
+        x, y = self.width // 2, self.height // 2
+        self.entered[games] = EMPTY
+        self.entered[games, y * self.width + x] = 0
+        self.head_x[games] = x
+        self.head_y[games] = y
+        self.direction[games] = RIGHT
+        self.length[games] = 1
+        self.moves[games] = 0
+        self.score[games] = 0
+        self.alive[games] = True
+        self._place_food(games)
+
+    def occupied(self, games, cells):
+        """Whether each of `cells` is part of the snake of the matching game"""
+        return self.moves[games] - self.entered[games, cells] < self.length[games]
+
+    def _place_food(self, games):
+        # Guessing is uniform over the free cells and almost always quick...
+        food = self.rng.integers(0, self.cells, len(games), dtype=np.int32)
+        for _ in range(FOOD_TRIES):
+            taken = self.occupied(games, food)
+            if not taken.any():
+                break
+            food[taken] = self.rng.integers(0, self.cells, int(taken.sum()), dtype=np.int32)
+        else:
+            # ...but on a nearly full board, list the free cells of the games still guessing
+            for index in np.flatnonzero(self.occupied(games, food)):
+                game = games[index]
+                free = np.flatnonzero(self.moves[game] - self.entered[game] >= self.length[game])
+                food[index] = self.rng.choice(free) if len(free) else -1
+        self.food[games] = food
+
+    def step(self, actions=None):
+        """Move every running game one cell; returns (rewards, done) arrays
+
+        `actions` holds a direction per game (UP, RIGHT, DOWN or LEFT);
+        None keeps every game's direction. The reward is 1 for eating and
+        -1 for dying. `done` flags the games that ended in this step; with
+        reset_on_death they have already been started over.
+        """
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int32)
+            # Turning back onto the neck is ignored, like in the games
+            turn = actions != (self.direction + 2) % 4
+            np.copyto(self.direction, actions, where=turn)
+
+        offsets = OFFSETS[self.direction]
+        x = self.head_x + offsets[:, 0]
+        y = self.head_y + offsets[:, 1]
+        if self.wrap:
+            x %= self.width
+            y %= self.height
+            crashed = np.zeros(self.count, dtype=bool)
+        else:
+            crashed = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+            # Keep the index valid; these games don't move anyway
+            np.clip(x, 0, self.width - 1, out=x)
+            np.clip(y, 0, self.height - 1, out=y)
+        cell = y * self.width + x
+
+        # The tail only moves on after the head, so running into it counts too
+        entered = self.entered[self.games, cell]
+        crashed |= self.moves - entered < self.length
+        moving = self.alive & ~crashed
+
+        # Games that crashed or were already over keep their state
+        self.entered[self.games, cell] = np.where(moving, self.moves + 1, entered)
+        self.moves += moving
+        np.copyto(self.head_x, x, where=moving)
+        np.copyto(self.head_y, y, where=moving)
+
+        ate = moving & (cell == self.food)
+        self.length += ate
+        self.score += ate
+        if ate.any():
+            self._place_food(self.games[ate])
+        won = ate & (self.food == -1)
+
+        died = self.alive & crashed
+        done = died | won
+        rewards = ate.astype(np.float32) - died
+        self.steps += int(self.alive.sum())
+
+        if done.any():
+            finished = self.games[done]
+            self.episodes += len(finished)
+            self.finished_score += int(self.score[finished].sum())
+            if self.reset_on_death:
+                self.reset(finished)
+            else:
+                self.alive[finished] = False
+        return rewards, done
+
+    def heads(self):
+        """(count, 2) array of the head cells as (x, y)"""
+        return np.stack([self.head_x, self.head_y], axis=1)
+
+    def occupancy(self):
+        """(count, height, width) boolean array of the cells each snake covers"""
+        body = (self.moves[:, None] - self.entered) < self.length[:, None]
+        return body.reshape(self.count, self.height, self.width)
+
+    def stats(self):
+        return {
+            "games": self.count,
+            "steps": self.steps,
+            "episodes": self.episodes,
+            "mean_score": self.finished_score / self.episodes if self.episodes else 0.0,
+        }
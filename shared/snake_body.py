@@ -0,0 +1,107 @@
+"""Snake body with constant-time move, grow, self-collision and food placement"""
+import random
+from array import array
+from collections import deque
+
+
+class SnakeBody:
+    """Snake segments in order (head first) plus a grid occupancy map.
+
+    The deque keeps the order of the segments so the head and tail can be
+    added and removed in O(1). The occupancy map counts the segments on
+    each grid cell, so "is this cell part of the snake?" is a single
+    lookup instead of a scan over the whole body.
+
+    A free-cell index is kept alongside: `free_cells` is a permutation of
+    all cell indices whose first `free_count` entries are the empty cells,
+    and `free_position` maps a cell back to its slot. Cells are swapped
+    across the boundary as the snake moves, so picking a random empty
+    cell for the food is a single random index.
+    """
+
+    def __init__(self, width, height, start):
+        self.width = width
+        self.height = height
+        self.segments = deque()
+        # One counter per cell; a count above 1 means the snake overlaps itself
+        self.occupancy = bytearray(width * height)
+        self.free_cells = array("i", range(width * height))
+        self.free_position = array("i", range(width * height))
+        self.free_count = width * height
+        self.push_head(start)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __contains__(self, cell):
+        return self.in_bounds(cell) and self.occupancy[self.index(cell)] > 0
+
+    @property
+    def head(self):
+        return self.segments[0]
+
+    @property
+    def tail(self):
+        return self.segments[-1]
+
+    def index(self, cell):
+        return cell[1] * self.width + cell[0]
+
+    def in_bounds(self, cell):
+        return 0 <= cell[0] < self.width and 0 <= cell[1] < self.height
+
+    def wrap(self, cell):
+        """Wrap a cell that left the grid around to the opposite edge"""
+        return cell[0] % self.width, cell[1] % self.height
+
+    def _swap_free(self, index, slot):
+        """Move cell `index` to position `slot` of the free-cell permutation"""
+        other = self.free_cells[slot]
+        old_slot = self.free_position[index]
+        self.free_cells[slot], self.free_cells[old_slot] = index, other
+        self.free_position[index], self.free_position[other] = slot, old_slot
+
+    def push_head(self, cell):
+        """Add a new head segment; the cell must be inside the grid"""
+        self.segments.appendleft(cell)
+        index = self.index(cell)
+        self.occupancy[index] += 1
+        if self.occupancy[index] == 1:
+            # The cell just became occupied: move it past the free boundary
+            self.free_count -= 1
+            self._swap_free(index, self.free_count)
+
+    def pop_tail(self):
+        """Remove and return the tail segment"""
+        cell = self.segments.pop()
+        index = self.index(cell)
+        self.occupancy[index] -= 1
+        if self.occupancy[index] == 0:
+            self._swap_free(index, self.free_count)
+            self.free_count += 1
+        return cell
+
+    def step(self, cell, grow=False):
+        """Move the head to `cell`; returns the freed tail cell unless growing"""
+        self.push_head(cell)
+        if not grow:
+            return self.pop_tail()
+        return None
+
+    def is_full(self):
+        """True once the snake covers every cell of the grid"""
+        return self.free_count == 0
+
+    def random_free_cell(self, rng=random):
+        """A uniformly chosen empty cell, or None if the board is full"""
+        if self.free_count == 0:
+            return None
+        index = self.free_cells[rng.randrange(self.free_count)]
+        return index % self.width, index // self.width
+
+    def hits_itself(self):
+        """True if the head shares its cell with another segment"""
+        return self.occupancy[self.index(self.head)] > 1
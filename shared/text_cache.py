@@ -0,0 +1,68 @@
+"""Font registry and LRU cache of rendered text surfaces for the Pygame games.
+
+Rendering text is one of the more expensive things a Pygame frame does,
+and most HUD text is the same from one frame to the next. Fonts are
+loaded once per (name, size) and rendered surfaces are cached by
+(font, size, text, color, antialias), so a static label is rendered once
+and a counter only when its value changes.
+
+pygame is imported lazily so this module can be imported before the game
+has initialized it.
+"""
+from collections import OrderedDict
+
+
+class TextCache:
+    """LRU-bounded cache of rendered text surfaces"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, size, name=None):
+        """Return the font for (name, size), loading it on first use"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            import pygame
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text, size, color, antialias=True, font_name=None):
+        """Same as Font.render(), but reuses the surface of an earlier call"""
+        key = (font_name, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(size, font_name).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "entries": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        """Drop everything, e.g. after pygame.quit() invalidated the fonts"""
+        self.fonts.clear()
+        self.surfaces.clear()
+
+
+# The cache shared by everything running in this process
+text_cache = TextCache()